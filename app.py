@@ -1,45 +1,552 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, g, request, jsonify, send_file, send_from_directory, stream_with_context
 from flask_cors import CORS
-from newsapi import fetch_news
+from werkzeug.http import http_date, parse_date, parse_etags, quote_etag
+from newsapi import (fetch_news, search_news, get_news_categories, upstream_limiter, upstream_circuit, response_cache,
+                     set_prefetched_queries, BACKGROUND_QUOTA, is_last_page, iter_news_pages, NewsPageError, build_politics_query,
+                     DEFAULT_PAGE_SIZE, DEFAULT_MAX_PAGES, CACHE_TTLS)
+from prefetch import PrefetchScheduler, LeaderLock
+from encoding import install_json_provider, compress_response, choose_encoding, dumps
+from logs import get_logger
+from metrics import timed, render_metrics, request_seconds, news_results, PROMETHEUS_CONTENT_TYPE
+from ranking import article_ranker
+from snapshots import SnapshotStore
+from thumbs import thumbnails, rewrite_image, verify_url, THUMB_WIDTHS, THUMB_DEFAULT_WIDTH, THUMB_MAX_AGE
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import hashlib
+import json
+import math
 import os
-from datetime import datetime
+import re
+import threading
+import time
+from datetime import datetime, timezone
 
 app = Flask(__name__)
 CORS(app)  
+install_json_provider(app)
 
 # Configuration
-DEBUG_MODE = True
+DEBUG_MODE = os.getenv("DEBUG_MODE", "false").lower() in ("1", "true", "yes")
+SERVER_HOST = os.getenv("HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("PORT", "5000"))
 ALLOWED_FILE_EXTENSIONS = ['.html', '.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg']
 VALID_NEWS_CATEGORIES = ["", "business", "entertainment", "general", "health", "science", "sports", "technology", "politics"]
+SEARCH_MODES = ["upstream", "hybrid", "local"]
+DEFAULT_SEARCH_MODE = os.getenv("SEARCH_MODE", "upstream")
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "8"))
+BATCH_MAX_ITEMS = 16
+CURSOR_PAGE_SIZE = 20
+STREAM_FORMATS = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+SORT_MODES = ["published", "relevance"]
+ARTICLE_FIELDS = ["source", "author", "title", "description", "url", "urlToImage", "publishedAt", "content",
+                  "duplicate_count", "other_sources"]
+STATIC_MAX_AGE = 3600                 # un-fingerprinted static files
+STATIC_IMMUTABLE_MAX_AGE = 31536000   # fingerprinted (?v=<hash>) static files
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() in ("1", "true", "yes")
+PREFETCH_INTERVAL = int(os.getenv("PREFETCH_INTERVAL", "90"))
+PREFETCH_JITTER = float(os.getenv("PREFETCH_JITTER", "0.1"))
+PREFETCH_BUDGET_PER_MINUTE = int(os.getenv("PREFETCH_BUDGET_PER_MINUTE", "30"))
+PREFETCH_LOCK_PATH = os.getenv(
+    "PREFETCH_LOCK_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "prefetch.lock")
+)
+PREFETCH_LANGUAGES = [language.strip() for language in os.getenv("PREFETCH_LANGUAGES", "en").split(",")
+                      if len(language.strip()) == 2]
+SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "true").lower() in ("1", "true", "yes")
+SNAPSHOT_DIR = os.getenv(
+    "SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "snapshots")
+)
+SNAPSHOT_MAX_AGE = int(os.getenv("SNAPSHOT_MAX_AGE", "300"))
+SNAPSHOT_KEEP_DAYS = int(os.getenv("SNAPSHOT_KEEP_DAYS", "7"))
+SNAPSHOT_PARAMS = ("category", "language", "thumb")  # requests with anything else take the full path
+SNAPSHOT_THUMB_WIDTHS = (THUMB_DEFAULT_WIDTH,)  # ?thumb= widths snapshotted too (the one the UI asks for)
+
+# Worker pool for /api/news/batch fan-out (bounded so a batch can't flood NewsAPI)
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="news-batch")
+
+# Leveled logging, written to stdout by a background thread (LOG_LEVEL)
+logger = get_logger("app")
 
-# Helper function to log messages with timestamp
 def log_message(message):
-    """Simple logging function for debugging"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] {message}")
+    """Log an informational message"""
+    logger.info(message)
+
+def log_debug(message):
+    """Log per-request details (shown with LOG_LEVEL=DEBUG)"""
+    logger.debug(message)
+
+# Hot queries kept fresh in the background (default headlines + every category)
+def get_prefetch_keys():
+    """Get the queries the prefetch scheduler keeps warm (English ones keep their plain names)"""
+    keys = {}
+    for language in PREFETCH_LANGUAGES or ["en"]:
+        suffix = "" if language == "en" else f":{language}"
+        for category in VALID_NEWS_CATEGORIES:
+            keys[(category or "all") + suffix] = {"category": category, "language": language}
+    return keys
+
+def plan_prefetch(keys, interval):
+    """
+    Fit the prefetch keys and interval to the prefetch share of the daily quota
+
+    Keeps the first keys (English headlines first) when the share can't
+    refresh every key once a day, and stretches the interval so a full day
+    of rounds stays within it. Returns (keys, interval).
+    """
+    if not upstream_limiter.daily_quota:
+        return keys, interval
+    budget = BACKGROUND_QUOTA  # the prefetching worker gets all of it
+    if not budget:
+        log_message("Prefetch has no share of the daily quota; no keys are prefetched")
+        return {}, interval
+    # Rounds can run early by the jitter, so plan for the shortest interval
+    refreshes_per_day = budget * max(0.1, 1 - PREFETCH_JITTER)
+    if len(keys) > refreshes_per_day:
+        keys = dict(list(keys.items())[:max(1, int(refreshes_per_day))])
+        log_message(f"Prefetching only {len(keys)} keys to stay within the daily quota")
+    needed = math.ceil(86400 * len(keys) / refreshes_per_day)
+    if needed > interval:
+        log_message(f"Prefetch interval raised from {interval}s to {needed}s to stay within the daily quota")
+        interval = needed
+    return keys, interval
+
+prefetch_keys, prefetch_interval = plan_prefetch(get_prefetch_keys(), PREFETCH_INTERVAL)
+
+# Snapshots: each fresh prefetch result is also written to disk, precompressed,
+# as today's /api/news response for its view (see snapshots.py). They stay
+# usable until the next refresh is due, however long the interval has become.
+snapshot_store = SnapshotStore(SNAPSHOT_DIR, max(SNAPSHOT_MAX_AGE, int(prefetch_interval * (1 + PREFETCH_JITTER))),
+                               SNAPSHOT_KEEP_DAYS, log=log_message)
+
+def write_snapshot(name, kwargs, result):
+    """Store a refreshed prefetch result as today's snapshots of its view (plain and with thumbnails)"""
+    if (result.get("metadata") or {}).get("cache") in ("stale", "store"):
+        return
+    category = kwargs.get("category", "")
+    language = kwargs.get("language", "en")
+    etag, last_modified, _ = build_news_validators(dict(result))
+    for thumb in (None,) + SNAPSHOT_THUMB_WIDTHS:
+        payload = build_news_payload(dict(result), category, language, thumb=thumb)
+        payload["metadata"]["sort"] = "published"
+        snapshot_store.write(language, category or "all", dumps(payload), etag, last_modified,
+                             variant=f"w{thumb}" if thumb else "")
+
+prefetch_scheduler = PrefetchScheduler(
+    lambda **kwargs: fetch_news(background=True, **kwargs),
+    prefetch_keys,
+    interval=prefetch_interval,
+    jitter=PREFETCH_JITTER,
+    budget_per_minute=PREFETCH_BUDGET_PER_MINUTE,
+    log=log_message,
+    on_result=write_snapshot if SNAPSHOT_ENABLED else None,
+    can_refresh=upstream_limiter.background_available
+)
+
+# With several server workers only the one holding this lock runs the scheduler
+prefetch_leader = LeaderLock(PREFETCH_LOCK_PATH)
+_prefetch_standby = None
 
 # Helper function to validate file extensions
 def is_allowed_file(filename):
     """Check if file extension is allowed for security"""
     return any(filename.lower().endswith(ext) for ext in ALLOWED_FILE_EXTENSIONS)
 
-# Helper function to clean articles
-def clean_articles(articles):
-    """Remove articles with missing or removed content"""
-    cleaned = []
+# Helper functions shared by the Flask routes and the ASGI entry point (asgi.py)
+def parse_news_params(args):
+    """Read and validate news query parameters from a request args mapping"""
+    category = args.get("category", "").lower()
+    query = args.get("q", "")
+    language = args.get("language", "en")
+    from_date = args.get("from")
+    to_date = args.get("to")
+    
+    log_debug(f"News request - Category: '{category}', Query: '{query}', Language: '{language}'")
+    
+    # Validate category
+    if category and category not in VALID_NEWS_CATEGORIES:
+        log_message(f"Invalid category '{category}', using 'general' instead")
+        category = "general"
+    
+    # Validate language (basic check)
+    if len(language) != 2:
+        log_message(f"Invalid language code '{language}', using 'en' instead")
+        language = "en"
+    
+    return category, query, language, from_date, to_date
+
+def parse_fields(args):
+    """Read the ?fields=title,url,... projection (None means every field)"""
+    fields = [field.strip() for field in args.get("fields", "").split(",") if field.strip() in ARTICLE_FIELDS]
+    return fields or None
+
+def parse_thumb(args):
+    """Read ?thumb=<width>: serve urlToImage through /api/thumb at that width (None means as is)"""
+    try:
+        width = int(args.get("thumb", 0))
+    except ValueError:
+        return None
+    return width if width > 0 else None
+
+def parse_sort(args):
+    """Read ?sort=published|relevance (NewsAPI's newest-first order by default)"""
+    sort = args.get("sort", "published")
+    return sort if sort in SORT_MODES else "published"
+
+def sort_news(news_data, sort, category, query):
+    """Reorder fetched articles by relevance to the query (or category) when asked to"""
+    if sort != "relevance" or news_data.get("error") or not news_data.get("articles"):
+        return news_data
+    ranking_query = query or (build_politics_query() if category == "politics" else "")
+    with timed("rank"):
+        news_data["articles"] = article_ranker.rank(news_data["articles"], ranking_query, category)
+    news_data.setdefault("metadata", {})["sort"] = sort
+    return news_data
+
+def project_article(article, fields, thumb=None):
+    """Copy of an article with only the requested fields (and urlToImage as a thumbnail URL)"""
+    if thumb:
+        article = rewrite_image(article, thumb)
+    if not fields:
+        return article
+    return {field: article[field] for field in fields if field in article}
+
+def build_news_payload(news_data, category, language, fields=None, thumb=None):
+    """Clean fetched news and add response metadata"""
+    # Ensure we have articles key (fetch_news has already filtered them)
+    if 'articles' not in news_data:
+        news_data['articles'] = []
+    elif fields or thumb:
+        news_data['articles'] = [project_article(article, fields, thumb) for article in news_data['articles']]
+    
+    final_count = len(news_data['articles'])
+    
+    log_debug(f"Articles: {final_count} returned")
+    
+    # Add metadata (keeping what the fetch reported, e.g. cache: stale and fallback_reason)
+    news_data['metadata'] = dict(news_data.get('metadata') or {})
+    news_data['metadata'].update({
+        'total_results': final_count,
+        'category': category if category else 'all',
+        'language': language,
+        'timestamp': datetime.now().isoformat()
+    })
+    
+    return news_data
+
+# Stateless paging cursors: the query and next page number, so the server
+# keeps nothing between requests
+def encode_cursor(category, query, language, from_date, to_date, page, page_size):
+    """Encode the position after a page of results as an opaque cursor"""
+    state = {"c": category, "q": query, "l": language, "f": from_date, "t": to_date,
+             "p": page, "s": page_size}
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor):
+    """Decode a cursor from encode_cursor; raises ValueError if it is invalid"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        page = int(state["p"])
+        page_size = int(state["s"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+    if page < 1 or not 1 <= page_size <= 100:
+        raise ValueError("Invalid cursor: page out of range")
+    args = {"category": state.get("c") or "", "q": state.get("q") or "", "language": state.get("l") or "en",
+            "from": state.get("f"), "to": state.get("t")}
+    if any(value is not None and not isinstance(value, str) for value in args.values()):
+        raise ValueError("Invalid cursor: malformed parameters")
+    # Same checks as a first-page request, but a cursor that fails them is rejected
+    params = parse_news_params(args)
+    if params[0] != args["category"] or params[2] != args["language"]:
+        raise ValueError("Invalid cursor: unknown category or language")
+    return params + (page, page_size)
+
+# Streaming responses: one frame per article as soon as it passes filtering,
+# then a trailing metadata frame
+def format_stream_frame(stream_format, kind, data):
+    """Encode one frame ("article", "error" or "metadata") of a streamed response"""
+    if stream_format == "sse":
+        return b"event: " + kind.encode("ascii") + b"\ndata: " + dumps(data) + b"\n\n"
+    return dumps({"type": kind, kind: data}) + b"\n"
+
+def iter_news_stream(stream_format, category, query, language, from_date, to_date, search_mode, pages,
+                     fields=None, thumb=None):
+    """Yield the frames of a streamed /api/news response"""
+    started = time.perf_counter()
+    first_article_ms = None
+    count = 0
+    status = "ok"
+    try:
+        if query and not category and search_mode in ("hybrid", "local"):
+            news_data = search_news(query, language, from_date, to_date, mode=search_mode)
+            if news_data.get("error"):
+                raise NewsPageError(news_data)
+            articles = news_data["articles"]
+        else:
+            articles = iter_news_pages(category, query, language, from_date, to_date,
+                                       DEFAULT_PAGE_SIZE, max_pages=pages)
+
+        for article in articles:
+            if first_article_ms is None:
+                first_article_ms = round((time.perf_counter() - started) * 1000, 1)
+            count += 1
+            yield format_stream_frame(stream_format, "article", project_article(article, fields, thumb))
+
+    except NewsPageError as e:
+        status = e.result.get("status", "error")
+        yield format_stream_frame(stream_format, "error", {"error": e.result.get("error"), "status": status})
+    except Exception as e:
+        error_msg = f"Error streaming news: {str(e)}"
+        log_message(error_msg)
+        status = "error"
+        yield format_stream_frame(stream_format, "error", {"error": error_msg, "status": status})
+
+    log_debug(f"Articles: {count} streamed")
+    yield format_stream_frame(stream_format, "metadata", {
+        'status': status,
+        'total_results': count,
+        'category': category if category else 'all',
+        'language': language,
+        'first_article_ms': first_article_ms,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        'timestamp': datetime.now().isoformat()
+    })
+
+def stream_news_response(stream_format, args):
+    """Build a streamed (NDJSON or SSE) /api/news response"""
+    category, query, language, from_date, to_date = parse_news_params(args)
+    search_mode = args.get("search", DEFAULT_SEARCH_MODE)
+    try:
+        pages = min(max(1, int(args.get("pages", 1))), DEFAULT_MAX_PAGES)
+    except ValueError:
+        pages = 1
+
+    frames = iter_news_stream(stream_format, category, query, language, from_date, to_date, search_mode, pages,
+                              parse_fields(args), parse_thumb(args))
+    return Response(
+        stream_with_context(frames),
+        mimetype=STREAM_FORMATS[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Conditional responses: validators come from the articles themselves, so a
+# 304 can be sent without building or serializing the body
+def build_news_etag(articles, ordered=False):
+    """Content-based ETag from the article URLs and publish times (sorted unless the order matters)"""
+    digest = hashlib.sha1()
+    lines = [f"{a.get('url')}|{a.get('publishedAt')}" for a in articles]
+    for line in (lines if ordered else sorted(lines)):
+        digest.update(line.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+def get_last_modified(articles):
+    """Newest publishedAt of the articles as a UTC datetime, or None"""
+    newest = None
     for article in articles:
-        if article and article.get('title') and article.get('title') != '[Removed]':
-            # Also check for other common removed indicators
-            if article.get('description') != '[Removed]' and article.get('content') != '[Removed]':
-                cleaned.append(article)
-    return cleaned
+        try:
+            published = datetime.fromisoformat(article.get("publishedAt") or "")
+        except ValueError:
+            continue
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=timezone.utc)
+        if newest is None or published > newest:
+            newest = published
+    return newest.replace(microsecond=0) if newest else None
+
+def is_not_modified(etag, last_modified, if_none_match=None, if_modified_since=None):
+    """Check If-None-Match / If-Modified-Since header values against the validators"""
+    if if_none_match:
+        return parse_etags(if_none_match).contains_weak(etag)
+    since = parse_date(if_modified_since) if if_modified_since else None
+    if since and last_modified:
+        return last_modified <= since
+    return False
+
+def build_news_validators(news_data):
+    """
+    Get (etag, last_modified, cache_headers) for a successful news response
+
+    Cache-Control max-age is the time left before the backend cache entry
+    expires, so browsers and proxies revalidate when the server would.
+    """
+    articles = news_data.get("articles", [])
+    # A relevance ranking changes with time alone, so its order is part of the ETag
+    etag = build_news_etag(articles, ordered=news_data.get("metadata", {}).get("sort") == "relevance")
+    last_modified = get_last_modified(articles)
+    max_age = int(news_data.get("metadata", {}).get("expires_in") or 0)
+
+    headers = {
+        "ETag": quote_etag(etag, weak=True),
+        "Cache-Control": f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+    }
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    return etag, last_modified, headers
+
+def news_response(news_data, category, language, extra=None, metadata=None, fields=None, thumb=None):
+    """JSON response for fetched news, or an empty 304 if the client's copy is current"""
+    if news_data.get("error"):
+        payload = build_news_payload(news_data, category, language)
+        payload.update(extra or {})
+        response = jsonify(payload)
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
+    etag, last_modified, headers = build_news_validators(news_data)
+    if is_not_modified(etag, last_modified, request.headers.get("If-None-Match"),
+                       request.headers.get("If-Modified-Since")):
+        response = Response(status=304)
+    else:
+        payload = build_news_payload(news_data, category, language, fields, thumb)
+        payload["metadata"].update(metadata or {})
+        payload.update(extra or {})
+        with timed("serialize"):
+            response = jsonify(payload)
+
+    response.headers.update(headers)
+    return response
+
+def find_snapshot(args, accept_encoding=None):
+    """Today's snapshot for a plain category view (only category/language/thumb given), or None"""
+    if not SNAPSHOT_ENABLED or any(key not in SNAPSHOT_PARAMS for key in args):
+        return None
+    category = args.get("category", "").lower()
+    language = args.get("language", "en")
+    thumb = parse_thumb(args)
+    if category not in VALID_NEWS_CATEGORIES or not (len(language) == 2 and language.isalpha()):
+        return None
+    if "thumb" in args and thumb not in SNAPSHOT_THUMB_WIDTHS:
+        return None
+    return snapshot_store.find(language, category or "all", choose_encoding(accept_encoding),
+                               variant=f"w{thumb}" if thumb else "")
+
+def load_snapshot(category, language, thumb=None):
+    """Today's snapshot of a category view as a payload dict (for batch responses), or None"""
+    if not SNAPSHOT_ENABLED or not language.isalpha() or (thumb and thumb not in SNAPSHOT_THUMB_WIDTHS):
+        return None
+    snapshot = snapshot_store.find(language, category or "all", variant=f"w{thumb}" if thumb else "")
+    if not snapshot:
+        return None
+    try:
+        with open(snapshot["path"], encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    news_results.inc("ok", "snapshot")
+    return payload
+
+def build_snapshot_headers(snapshot):
+    """Validator and caching headers for a snapshot (fresh for at most the headlines cache TTL)"""
+    # Capped like a cached response; clients revalidate with ETag/Last-Modified after that
+    max_age = max(0, min(CACHE_TTLS["top-headlines"], int(prefetch_interval - snapshot["age"])))
+    headers = {
+        "ETag": quote_etag(snapshot["etag"], weak=True),
+        "Cache-Control": f"public, max-age={max_age}" if max_age > 0 else "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+    if snapshot["last_modified"]:
+        headers["Last-Modified"] = http_date(snapshot["last_modified"])
+    if snapshot["encoding"]:
+        headers["Content-Encoding"] = snapshot["encoding"]
+    return headers
+
+def snapshot_response(snapshot):
+    """Send a snapshot file as is (sendfile under a WSGI server that supports it), or a 304"""
+    news_results.inc("ok", "snapshot")
+    headers = build_snapshot_headers(snapshot)
+    if is_not_modified(snapshot["etag"], snapshot["last_modified"], request.headers.get("If-None-Match"),
+                       request.headers.get("If-Modified-Since")):
+        headers.pop("Content-Encoding", None)
+        response = Response(status=304)
+    else:
+        response = send_file(snapshot["path"], mimetype="application/json", etag=False, last_modified=None,
+                             conditional=False)
+        del response.headers["Content-Disposition"]
+    response.headers.update(headers)
+    return response
+
+# Static asset fingerprints: index.html links ?v=<content hash> URLs, which
+# can be cached forever because a changed file gets a new URL. Files are
+# looked up under app.root_path, so the working directory doesn't matter.
+_fingerprints = {}
+ASSET_LINK_RE = re.compile(r'(href|src)="((?:css|js|assets)/[^"?#]+)"')
+
+def get_asset_fingerprint(path):
+    """Short content hash of a static file (recomputed when its mtime changes)"""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _fingerprints.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "rb") as f:
+            cached = (mtime, hashlib.sha1(f.read()).hexdigest()[:12])
+        _fingerprints[path] = cached
+    return cached[1]
+
+def render_index():
+    """index.html with fingerprinted asset URLs"""
+    with open(os.path.join(app.root_path, "index.html"), encoding="utf-8") as f:
+        html = f.read()
+
+    def fingerprint(match):
+        version = get_asset_fingerprint(os.path.join(app.root_path, match.group(2)))
+        if version is None:
+            return match.group(0)
+        return f'{match.group(1)}="{match.group(2)}?v={version}"'
+
+    return ASSET_LINK_RE.sub(fingerprint, html)
+
+def send_static(directory, filename):
+    """send_from_directory with long-lived caching for fingerprinted URLs"""
+    directory = os.path.join(app.root_path, directory)
+    response = send_from_directory(directory, filename)
+    version = request.args.get("v")
+    if version and version == get_asset_fingerprint(os.path.join(directory, filename)):
+        response.headers["Cache-Control"] = f"public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        response.headers["Cache-Control"] = f"public, max-age={STATIC_MAX_AGE}"
+    return response
+
+def build_error_payload(error_msg):
+    """Build the error response body for a failed news request"""
+    return {
+        "error": error_msg,
+        "articles": [],
+        "status": "error",
+        "metadata": {
+            'total_results': 0,
+            'timestamp': datetime.now().isoformat()
+        }
+    }
+
+# Negotiated gzip/brotli compression for buffered responses
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def compress_body(response):
+    with timed("compress"):
+        response = compress_response(response, request.headers.get("Accept-Encoding"))
+    started = g.pop("request_started", None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        request_seconds.observe(time.perf_counter() - started, route)
+    return response
 
 # Frontend Routes
 @app.route("/")
 def home():
     """Serve the main HTML page"""
     try:
-        return send_from_directory('.', 'index.html')
+        response = app.make_response(render_index())
+        response.headers["Cache-Control"] = "no-cache"
+        response.add_etag()
+        return response.make_conditional(request)
     except Exception as e:
         log_message(f"Error serving home page: {str(e)}")
         return "Error loading home page", 500
@@ -48,7 +555,7 @@ def home():
 def css_files(filename):
     """Serve CSS files"""
     try:
-        return send_from_directory('css', filename)
+        return send_static('css', filename)
     except Exception as e:
         log_message(f"Error serving CSS file {filename}: {str(e)}")
         return "CSS file not found", 404
@@ -57,7 +564,7 @@ def css_files(filename):
 def js_files(filename):
     """Serve JavaScript files"""
     try:
-        return send_from_directory('js', filename)
+        return send_static('js', filename)
     except Exception as e:
         log_message(f"Error serving JS file {filename}: {str(e)}")
         return "JS file not found", 404
@@ -70,7 +577,7 @@ def static_files(filename):
             log_message(f"Blocked attempt to access file: {filename}")
             return "File type not allowed", 403
         
-        return send_from_directory('.', filename)
+        return send_static('.', filename)
     except Exception as e:
         log_message(f"Error serving static file {filename}: {str(e)}")
         return "File not found", 404
@@ -80,61 +587,162 @@ def static_files(filename):
 def get_news():
     """Main endpoint to fetch news articles"""
     try:
-        # Get parameters from request
-        category = request.args.get("category", "").lower()
-        query = request.args.get("q", "")
+        # Fast path: today's precompressed snapshot of a plain category view
+        snapshot = find_snapshot(request.args, request.headers.get("Accept-Encoding"))
+        if snapshot:
+            return snapshot_response(snapshot)
+
+        # Opt-in streaming: ?stream=ndjson or ?stream=sse (optionally &pages=N)
+        stream_format = request.args.get("stream")
+        if stream_format in STREAM_FORMATS:
+            return stream_news_response(stream_format, request.args)
+
+        # Cursor paging: ?page_size=N starts it, ?cursor=... continues it
+        cursor = request.args.get("cursor")
+        if cursor or request.args.get("page_size"):
+            return get_news_page(cursor)
+
+        category, query, language, from_date, to_date = parse_news_params(request.args)
+        search_mode = request.args.get("search", DEFAULT_SEARCH_MODE)
+        
+        # Fetch news from API (plain searches can use the local index)
+        if query and not category and search_mode in SEARCH_MODES:
+            news_data = search_news(query, language, from_date, to_date, mode=search_mode)
+        else:
+            news_data = fetch_news(category, query, language, from_date, to_date)
+        
+        sort = parse_sort(request.args)
+        news_data = sort_news(news_data, sort, category, query)
+        return news_response(news_data, category, language, metadata={"sort": sort},
+                             fields=parse_fields(request.args), thumb=parse_thumb(request.args))
+        
+    except Exception as e:
+        error_msg = f"Error fetching news: {str(e)}"
+        log_message(error_msg)
+        return jsonify(build_error_payload(error_msg)), 500
+
+def get_news_page(cursor):
+    """Serve one page of /api/news results with a cursor for the next one"""
+    if cursor:
+        try:
+            category, query, language, from_date, to_date, page, page_size = decode_cursor(cursor)
+        except ValueError as e:
+            log_message(str(e))
+            payload = build_error_payload(str(e))
+            payload["status"] = "validation_error"
+            return jsonify(payload), 400
+    else:
+        category, query, language, from_date, to_date = parse_news_params(request.args)
+        page = 1
+        try:
+            page_size = min(max(1, int(request.args.get("page_size", CURSOR_PAGE_SIZE))), 100)
+        except ValueError:
+            page_size = CURSOR_PAGE_SIZE
+
+    news_data = fetch_news(category, query, language, from_date, to_date, page_size, page=page)
+    has_more = not news_data.get("error") and not is_last_page(news_data, page, page_size)
+    sort = parse_sort(request.args)  # ranks within the page
+    news_data = sort_news(news_data, sort, category, query)
+
+    next_cursor = (
+        encode_cursor(category, query, language, from_date, to_date, page + 1, page_size) if has_more else None
+    )
+    return news_response(news_data, category, language, extra={"next_cursor": next_cursor},
+                         metadata={"page": page, "sort": sort}, fields=parse_fields(request.args),
+                         thumb=parse_thumb(request.args))
+
+@app.route("/api/news/batch")
+def get_news_batch():
+    """Fetch several categories and/or search queries in parallel in one request"""
+    try:
+        start_time = time.perf_counter()
         language = request.args.get("language", "en")
+        if len(language) != 2:
+            language = "en"
         from_date = request.args.get("from")
         to_date = request.args.get("to")
         
-        log_message(f"News request - Category: '{category}', Query: '{query}', Language: '{language}'")
+        # Collect requested items: ?categories=a,b&categories=c and/or ?q=x&q=y
+        items = []
+        for value in request.args.getlist("categories"):
+            for category in value.split(","):
+                category = category.strip().lower()
+                if category:
+                    items.append((category, "category", category))
+        for query in request.args.getlist("q"):
+            if query.strip():
+                items.append((f"q:{query.strip()}", "query", query.strip()))
         
-        # Validate category
-        if category and category not in VALID_NEWS_CATEGORIES:
-            log_message(f"Invalid category '{category}', using 'general' instead")
-            category = "general"
+        # Default to every category (the home page view)
+        if not items:
+            items = [(category, "category", category) for category in ["all"] + get_news_categories()]
         
-        # Validate language (basic check)
-        if len(language) != 2:
-            log_message(f"Invalid language code '{language}', using 'en' instead")
-            language = "en"
+        if len(items) > BATCH_MAX_ITEMS:
+            return jsonify(build_error_payload(f"Too many batch items (max {BATCH_MAX_ITEMS})")), 400
         
-        # Fetch news from API
-        news_data = fetch_news(category, query, language, from_date, to_date)
+        log_debug(f"Batch news request - {len(items)} items, Language: '{language}'")
         
-        # Ensure we have articles key
-        if 'articles' not in news_data:
-            news_data['articles'] = []
+        fields = parse_fields(request.args)
+        thumb = parse_thumb(request.args)
         
-        # Clean articles
-        original_count = len(news_data.get('articles', []))
-        news_data['articles'] = clean_articles(news_data.get('articles', []))
-        final_count = len(news_data['articles'])
+        def fetch_item(kind, value):
+            if kind == "query":
+                return build_news_payload(fetch_news("", value, language, from_date, to_date), "", language, fields,
+                                          thumb)
+            category = "" if value == "all" else value
+            # Plain category views come from today's prefetch snapshots when there are any
+            if not (from_date or to_date or fields):
+                snapshot = load_snapshot(category, language, thumb)
+                if snapshot is not None:
+                    return snapshot
+            return build_news_payload(fetch_news(category, "", language, from_date, to_date), category, language,
+                                      fields, thumb)
         
-        log_message(f"Articles: {original_count} fetched, {final_count} after cleaning")
+        # Submit everything first so the items are fetched concurrently
+        futures = {}
+        results = {}
+        for key, kind, value in items:
+            if kind == "category" and value != "all" and value not in VALID_NEWS_CATEGORIES:
+                results[key] = {
+                    "error": f"Invalid category '{value}'",
+                    "articles": [],
+                    "status": "validation_error"
+                }
+            elif key not in futures:
+                futures[key] = batch_executor.submit(fetch_item, kind, value)
         
-        # Add metadata
-        news_data['metadata'] = {
-            'total_results': final_count,
-            'category': category if category else 'all',
-            'language': language,
-            'timestamp': datetime.now().isoformat()
-        }
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                log_message(f"Batch item '{key}' failed: {str(e)}")
+                results[key] = build_error_payload(f"Error fetching news: {str(e)}")
         
-        return jsonify(news_data)
+        failed = [key for key, result in results.items() if result.get("error")]
+        if not failed:
+            status = "ok"
+        elif len(failed) < len(results):
+            status = "partial"
+        else:
+            status = "error"
         
-    except Exception as e:
-        error_msg = f"Error fetching news: {str(e)}"
-        log_message(error_msg)
         return jsonify({
-            "error": error_msg,
-            "articles": [],
-            "status": "error",
+            "status": status,
+            "results": results,
             "metadata": {
-                'total_results': 0,
-                'timestamp': datetime.now().isoformat()
+                "requested": len(results),
+                "succeeded": len(results) - len(failed),
+                "failed": failed,
+                "language": language,
+                "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 1),
+                "timestamp": datetime.now().isoformat()
             }
-        }), 500
+        })
+        
+    except Exception as e:
+        error_msg = f"Error fetching news batch: {str(e)}"
+        log_message(error_msg)
+        return jsonify(build_error_payload(error_msg)), 500
 
 @app.route("/api/categories")
 def get_categories():
@@ -191,7 +799,13 @@ def health_check():
             "service": "FetchPress API",
             "version": "1.1.0",
             "timestamp": datetime.now().isoformat(),
-            "uptime": "running"
+            "uptime": "running",
+            "quota": upstream_limiter.stats(),
+            "circuit": upstream_circuit.stats(),
+            "ranking": article_ranker.stats(),
+            "thumbnails": thumbnails.stats(),
+            "snapshots": snapshot_store.stats(),
+            "prefetch": prefetch_scheduler.status()
         })
     except Exception as e:
         return jsonify({
@@ -200,6 +814,40 @@ def health_check():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+@app.route("/api/thumb")
+def get_thumbnail():
+    """Resized, cached copy of an article image (URLs come from ?thumb= on the news endpoints)"""
+    url = request.args.get("url", "")
+    if not verify_url(url, request.args.get("sig", "")):
+        payload = build_error_payload("Invalid or unsigned thumbnail URL")
+        payload["status"] = "validation_error"
+        return jsonify(payload), 403
+    try:
+        width = int(request.args.get("w", THUMB_WIDTHS[0]))
+    except ValueError:
+        width = THUMB_WIDTHS[0]
+
+    result = thumbnails.get(url, width, accept_webp="image/webp" in request.headers.get("Accept", ""))
+    if result["status"] != "ok":
+        log_debug(f"Thumbnail of {url} failed: {result['error']}")
+        status_code = {"busy": 503, "timeout": 504}.get(result["status"], 502)
+        response = jsonify(build_error_payload(result["error"]))
+        response.status_code = status_code
+        if result["status"] == "busy":
+            response.headers["Retry-After"] = "1"
+        return response
+
+    response = Response(result["data"], mimetype=result["content_type"])
+    response.set_etag(result["etag"])
+    response.headers["Cache-Control"] = f"public, max-age={THUMB_MAX_AGE}, immutable"
+    response.vary.add("Accept")
+    return response.make_conditional(request)
+
+@app.route("/api/metrics")
+def metrics():
+    """Per-stage latency histograms and result counters in Prometheus text format"""
+    return Response(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+
 # Backward compatibility routes
 @app.route("/news")
 def get_news_old():
@@ -251,6 +899,50 @@ def check_environment():
         log_message(" NEWS_API_KEY configured")
         return True
 
+def start_background_services():
+    """Start background workers (prefetch scheduler)"""
+    global _prefetch_standby
+    if not PREFETCH_ENABLED or not os.getenv("NEWS_API_KEY") or prefetch_scheduler.is_running():
+        return
+
+    if prefetch_leader.try_acquire():
+        # Only this worker prefetches, so it gets the whole background budget
+        upstream_limiter.set_background_quota(BACKGROUND_QUOTA)
+        prefetch_scheduler.start()
+        set_prefetched_queries(prefetch_keys.values())
+        return
+
+    upstream_limiter.set_background_quota(0)
+
+    # Another worker runs the scheduler; check again later in case it exits.
+    # A shared (Redis) cache is kept warm for this worker too.
+    if response_cache.stats()["backend"] == "redis":
+        set_prefetched_queries(prefetch_keys.values())
+    log_message("Prefetch scheduler runs in another worker, standing by")
+    _prefetch_standby = threading.Timer(PREFETCH_INTERVAL, start_background_services)
+    _prefetch_standby.daemon = True
+    _prefetch_standby.start()
+
+def stop_background_services():
+    """Stop background workers (called on graceful shutdown)"""
+    if _prefetch_standby is not None:
+        _prefetch_standby.cancel()
+    prefetch_scheduler.stop()
+    prefetch_leader.release()
+    batch_executor.shutdown(wait=False, cancel_futures=True)
+
+def create_app():
+    """
+    Application factory for production WSGI servers
+
+    All settings come from the environment. Starts this worker's background
+    services and returns the Flask app, e.g.:
+        gunicorn -c gunicorn.conf.py "app:create_app()"
+    """
+    app.debug = DEBUG_MODE
+    start_background_services()
+    return app
+
 # Main execution
 if __name__ == "__main__":
     log_message("Starting FetchPress News Server...")
@@ -260,18 +952,22 @@ if __name__ == "__main__":
     env_ok = check_environment()
     
     # Start server
-    log_message(" Server starting...")
-    log_message(" Frontend available at: http://localhost:5000")
+    log_message(" Development server starting (use gunicorn for production, see README)...")
+    log_message(f" Frontend available at: http://{SERVER_HOST}:{SERVER_PORT}")
     
     if not env_ok:
         log_message("  Server will start but news fetching may not work without API key")
     
     log_message("-" * 50)
     
-    # Run Flask app
+    # With the reloader, only the child process that serves requests runs background work
+    if not DEBUG_MODE or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_background_services()
+    
+    # Run Flask app (the reloader only in debug mode)
     app.run(
         debug=DEBUG_MODE, 
-        port=5000, 
-        host='0.0.0.0',
-        use_reloader=True
+        port=SERVER_PORT, 
+        host=SERVER_HOST,
+        use_reloader=DEBUG_MODE
     )
\ No newline at end of file
@@ -0,0 +1,263 @@
+"""
+ASGI entry point for FetchPress
+
+/api/news (and the old /news route) run on the async fetch engine, so a
+worker can keep many NewsAPI requests in flight without blocking a thread on
+each one. /api/live is a Server-Sent Events feed that pushes new articles
+for the subscribed topics. Every other route is served by the Flask app
+through asgiref.
+
+Run with:
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+or, with several worker processes:
+    gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:application
+"""
+import asyncio
+import os
+import time
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import (app, parse_news_params, build_news_payload, build_error_payload, log_message, STREAM_FORMATS,
+                 VALID_NEWS_CATEGORIES, build_news_validators, is_not_modified, parse_fields, parse_sort, parse_thumb,
+                 project_article, sort_news, find_snapshot, build_snapshot_headers, start_background_services,
+                 stop_background_services, DEFAULT_SEARCH_MODE)
+from encoding import choose_encoding, compress, dumps, should_compress
+from live import TopicBroker, parse_topic
+from metrics import timed, request_seconds, news_results
+from newsapi import async_fetch_news, search_news, close_async_client
+
+NEWS_PATHS = ("/api/news", "/news")
+LIVE_PATH = "/api/live"
+LIVE_STATUS_PATH = "/api/live/status"
+LIVE_POLL_INTERVAL = int(os.getenv("LIVE_POLL_INTERVAL", "60"))
+LIVE_HEARTBEAT = 15
+LIVE_MAX_TOPICS = 16
+
+flask_application = WsgiToAsgi(app)
+
+live_broker = TopicBroker(async_fetch_news, interval=LIVE_POLL_INTERVAL, log=log_message)
+
+
+def encode_headers(headers):
+    """Convert a header dict to ASGI (name, value) byte pairs"""
+    return [(name.lower().encode("latin-1"), str(value).encode("latin-1")) for name, value in headers.items()]
+
+
+async def send_json(send, data, status=200, headers=None, accept_encoding=None):
+    """Send a JSON response (compressed when the client accepts it and it is large enough)"""
+    with timed("serialize"):
+        body = dumps(data)
+    headers = dict(headers or {})
+    encoding = choose_encoding(accept_encoding)
+    if encoding and should_compress("application/json", len(body)):
+        with timed("compress"):
+            body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+        headers["Vary"] = "Accept-Encoding"
+
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+            (b"access-control-allow-origin", b"*")
+        ] + encode_headers(headers)
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def send_not_modified(send, headers):
+    """Send an empty 304 response"""
+    await send({
+        "type": "http.response.start",
+        "status": 304,
+        "headers": [(b"access-control-allow-origin", b"*")] + encode_headers(headers)
+    })
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def send_snapshot(send, snapshot, request_headers):
+    """Send a precompressed snapshot file as is, or a 304"""
+    news_results.inc("ok", "snapshot")
+    headers = build_snapshot_headers(snapshot)
+    if is_not_modified(snapshot["etag"], snapshot["last_modified"],
+                       request_headers.get(b"if-none-match", b"").decode("latin-1"),
+                       request_headers.get(b"if-modified-since", b"").decode("latin-1")):
+        headers.pop("Content-Encoding", None)
+        return await send_not_modified(send, headers)
+
+    with open(snapshot["path"], "rb") as f:
+        body = f.read()
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+            (b"access-control-allow-origin", b"*")
+        ] + encode_headers(headers)
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def news_endpoint(scope, receive, send):
+    """Async version of the /api/news route"""
+    started = None
+    try:
+        args = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        if args.get("stream") in STREAM_FORMATS or args.get("cursor") or args.get("page_size"):
+            # Streamed and paged responses are produced by the Flask route (which times them)
+            return await flask_application(scope, receive, send)
+        started = time.perf_counter()
+
+        request_headers = dict(scope.get("headers", []))
+        accept_encoding = request_headers.get(b"accept-encoding", b"").decode("latin-1")
+        snapshot = find_snapshot(args, accept_encoding)
+        if snapshot:
+            return await send_snapshot(send, snapshot, request_headers)
+
+        category, query, language, from_date, to_date = parse_news_params(args)
+        search_mode = args.get("search", DEFAULT_SEARCH_MODE)
+
+        # Plain searches can use the local index (SQLite, so off the event loop)
+        if query and not category and search_mode in ("hybrid", "local"):
+            news_data = await asyncio.to_thread(search_news, query, language, from_date, to_date, mode=search_mode)
+        else:
+            news_data = await async_fetch_news(category, query, language, from_date, to_date)
+        sort = parse_sort(args)
+        news_data = sort_news(news_data, sort, category, query)
+        if news_data.get("error"):
+            return await send_json(send, build_news_payload(news_data, category, language),
+                                   headers={"Cache-Control": "no-store"}, accept_encoding=accept_encoding)
+
+        etag, last_modified, headers = build_news_validators(news_data)
+        if is_not_modified(etag, last_modified,
+                           request_headers.get(b"if-none-match", b"").decode("latin-1"),
+                           request_headers.get(b"if-modified-since", b"").decode("latin-1")):
+            return await send_not_modified(send, headers)
+
+        payload = build_news_payload(news_data, category, language, parse_fields(args), parse_thumb(args))
+        payload["metadata"]["sort"] = sort
+        await send_json(send, payload, headers=headers, accept_encoding=accept_encoding)
+
+    except Exception as e:
+        error_msg = f"Error fetching news: {str(e)}"
+        log_message(error_msg)
+        await send_json(send, build_error_payload(error_msg), status=500)
+
+    finally:
+        if started is not None:
+            request_seconds.observe(time.perf_counter() - started, scope["path"])
+
+
+def parse_live_topics(query_string):
+    """Read ?topics=a,b and repeated ?topic= / ?q= values into topic name -> fetch kwargs"""
+    names = []
+    for key, value in parse_qsl(query_string.decode("latin-1")):
+        if key == "topics":
+            names.extend(name for name in value.split(",") if name.strip())
+        elif key == "topic":
+            names.append(value)
+        elif key == "q" and value.strip():
+            names.append(f"q:{value.strip()}")
+
+    topics = {}
+    invalid = []
+    for name in names or ["all"]:
+        kwargs = parse_topic(name, VALID_NEWS_CATEGORIES)
+        if kwargs is None:
+            invalid.append(name)
+        else:
+            topics[f"q:{kwargs['q']}" if "q" in kwargs else (kwargs["category"] or "all")] = kwargs
+    return topics, invalid
+
+
+async def wait_for_disconnect(receive):
+    """Return once the client has gone away"""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def live_endpoint(scope, receive, send):
+    """Server-Sent Events feed of new articles for the requested topics"""
+    topics, invalid = parse_live_topics(scope.get("query_string", b""))
+    if invalid or len(topics) > LIVE_MAX_TOPICS:
+        error_msg = f"Invalid topics: {', '.join(invalid)}" if invalid else f"Too many topics (max {LIVE_MAX_TOPICS})"
+        payload = build_error_payload(error_msg)
+        payload["status"] = "validation_error"
+        return await send_json(send, payload, status=400)
+
+    thumb = parse_thumb(dict(parse_qsl(scope.get("query_string", b"").decode("latin-1"))))
+    subscription = live_broker.subscribe(topics)
+    disconnect = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+                (b"access-control-allow-origin", b"*")
+            ]
+        })
+        hello = b"event: subscribed\ndata: " + dumps({"topics": list(topics)}) + b"\n\n"
+        await send({"type": "http.response.body", "body": hello, "more_body": True})
+
+        while not disconnect.done():
+            next_event = asyncio.ensure_future(subscription.queue.get())
+            done, pending = await asyncio.wait({next_event, disconnect}, timeout=LIVE_HEARTBEAT,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if next_event in done:
+                event = next_event.result()
+                articles = [project_article(article, None, thumb) for article in event["articles"]]
+                data = dumps({"topic": event["topic"], "articles": articles})
+                frame = b"event: " + event["event"].encode("ascii") + b"\ndata: " + data + b"\n\n"
+            else:
+                next_event.cancel()
+                if disconnect.done():
+                    break
+                frame = b": keep-alive\n\n"
+            await send({"type": "http.response.body", "body": frame, "more_body": True})
+    except OSError:
+        pass  # client went away mid-send
+    finally:
+        disconnect.cancel()
+        live_broker.unsubscribe(subscription)
+
+
+async def lifespan(scope, receive, send):
+    """Handle server startup and shutdown events"""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            start_background_services()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await live_broker.stop()
+            await close_async_client()
+            stop_background_services()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI application"""
+    if scope["type"] == "lifespan":
+        return await lifespan(scope, receive, send)
+
+    if scope["type"] == "http" and scope["method"] == "GET" and scope["path"] in NEWS_PATHS:
+        return await news_endpoint(scope, receive, send)
+
+    if scope["type"] == "http" and scope["method"] == "GET" and scope["path"] == LIVE_PATH:
+        return await live_endpoint(scope, receive, send)
+
+    if scope["type"] == "http" and scope["method"] == "GET" and scope["path"] == LIVE_STATUS_PATH:
+        return await send_json(send, live_broker.stats())
+
+    return await flask_application(scope, receive, send)
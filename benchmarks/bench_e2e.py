@@ -0,0 +1,200 @@
+"""
+End-to-end benchmark of /api/news against the local NewsAPI stand-in
+
+Needs no network or API key, so it can run in CI. Each scenario starts a
+fresh server process (Flask's threaded server running app.py, or uvicorn
+with asgi:application), points it at a stand-in configured for that
+scenario, then sends a fixed number of requests from a pool of client
+threads and reports throughput, p50/p99 latency, response statuses and
+how many upstream calls the server made.
+
+Scenarios:
+  hot        categories only, nearly all served from the response cache
+  cold       distinct search queries, every one a cache miss (upstream path)
+  flaky      distinct queries, 20% of upstream calls fail with a 500
+  throttled  categories, 10% of upstream calls get a 429
+
+Usage: python benchmarks/bench_e2e.py [--server flask|uvicorn] [--requests 400] [--concurrency 8]
+       [--latency-ms 40] [--scenario hot ...] [--save results.json] [--compare baseline.json --tolerance 0.3]
+
+With --compare the run exits non-zero when throughput drops, p99 rises
+or upstream calls grow by more than the tolerance against a saved run.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+from newsapi_standin import start_standin
+
+CATEGORIES = ["business", "entertainment", "general", "health", "science", "sports", "technology", "politics"]
+QUERY_WORDS = ["climate", "election", "markets", "vaccine", "football", "rocket", "drought", "merger",
+               "tariff", "wildfire", "startup", "housing", "airline", "festival", "treaty", "satellite"]
+
+SCENARIOS = {
+    "hot": {"urls": "categories", "error_rate": 0.0, "rate_limit_rate": 0.0},
+    "cold": {"urls": "queries", "error_rate": 0.0, "rate_limit_rate": 0.0},
+    "flaky": {"urls": "queries", "error_rate": 0.2, "rate_limit_rate": 0.0},
+    "throttled": {"urls": "categories", "error_rate": 0.0, "rate_limit_rate": 0.1},
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def build_paths(kind, count):
+    """Request paths for a scenario: a category rotation or one distinct query per request"""
+    if kind == "categories":
+        return [f"/api/news?category={CATEGORIES[i % len(CATEGORIES)]}" for i in range(count)]
+    return [f"/api/news?q={QUERY_WORDS[i % len(QUERY_WORDS)]}+{i}&search=upstream" for i in range(count)]
+
+
+def start_server(server, port, base_url):
+    """Start the app in its own process (so it doesn't share the GIL with the clients)"""
+    env = dict(os.environ, NEWS_API_BASE_URL=base_url, NEWS_API_KEY="benchmark", HOST="127.0.0.1", PORT=str(port),
+               DEBUG_MODE="false", LOG_LEVEL="WARNING", NEWS_STORE_ENABLED="false", PREFETCH_ENABLED="false",
+               NEWS_API_RATE_PER_MINUTE="100000", NEWS_API_RATE_BURST="100000", NEWS_API_DAILY_QUOTA="0",
+               NEWS_CACHE_BACKEND="memory", WEB_CONCURRENCY="1")
+    if server == "uvicorn":
+        command = [sys.executable, "-m", "uvicorn", "asgi:application", "--port", str(port),
+                   "--no-access-log", "--log-level", "warning"]
+    else:
+        command = [sys.executable, "app.py"]
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    url = f"http://127.0.0.1:{port}/api/health"
+    for _ in range(100):
+        try:
+            requests.get(url, timeout=1)
+            return process
+        except requests.RequestException:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{server} server did not start")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_scenario(name, options):
+    """Run one scenario against a fresh server and stand-in; returns its results"""
+    settings = SCENARIOS[name]
+    standin, base_url = start_standin(latency=options.latency_ms / 1000, jitter=options.latency_ms / 4000,
+                                      error_rate=settings["error_rate"],
+                                      rate_limit_rate=settings["rate_limit_rate"], retry_after=1, seed=1)
+    port = free_port()
+    process = start_server(options.server, port, base_url)
+    base = f"http://127.0.0.1:{port}"
+    paths = build_paths(settings["urls"], options.requests)
+    local = threading.local()
+    statuses = {}
+
+    def send(path):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        session = local.session
+        started = time.perf_counter()
+        response = session.get(base + path, headers={"Accept-Encoding": "gzip"})
+        elapsed = time.perf_counter() - started
+        try:
+            status = response.json().get("status", "unknown")
+        except ValueError:
+            status = f"http_{response.status_code}"
+        return elapsed, status
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+            results = list(pool.map(send, paths))
+        duration = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        standin.shutdown()
+
+    latencies = sorted(elapsed for elapsed, _ in results)
+    for _, status in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    return {
+        "requests": len(results),
+        "throughput": round(len(results) / duration, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "upstream_calls": standin.request_count,
+        "responses": statuses
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regressions against a saved run, as messages"""
+    problems = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result["throughput"] < before["throughput"] * (1 - tolerance):
+            problems.append(f"{name}: throughput {result['throughput']} req/s < {before['throughput']} req/s")
+        if result["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+            problems.append(f"{name}: p99 {result['p99_ms']} ms > {before['p99_ms']} ms")
+        if result["upstream_calls"] > before["upstream_calls"] * (1 + tolerance):
+            problems.append(f"{name}: {result['upstream_calls']} upstream calls > {before['upstream_calls']}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end /api/news benchmark against the NewsAPI stand-in")
+    parser.add_argument("--server", choices=("flask", "uvicorn"), default="flask")
+    parser.add_argument("--requests", type=int, default=400, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    parser.add_argument("--latency-ms", type=float, default=40, help="stand-in latency per upstream call")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="run only these")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="fail on regressions against this saved JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed relative regression")
+    options = parser.parse_args()
+
+    settings = {"server": options.server, "requests": options.requests, "concurrency": options.concurrency,
+                "latency_ms": options.latency_ms}
+    print(" ".join(f"{key}={value}" for key, value in settings.items()))
+    print(f"{'scenario':<10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'upstream':>9}  responses")
+    results = {}
+    for name in options.scenario or list(SCENARIOS):
+        result = results[name] = run_scenario(name, options)
+        responses = ", ".join(f"{status}={count}" for status, count in sorted(result["responses"].items()))
+        print(f"{name:<10} {result['throughput']:8.1f} {result['p50_ms']:8.2f} {result['p99_ms']:8.2f} "
+              f"{result['upstream_calls']:9d}  {responses}")
+
+    if options.save:
+        with open(options.save, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "scenarios": results}, f, indent=2, sort_keys=True)
+
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("settings") != settings:
+            print(f"Baseline was run with {baseline.get('settings')}, not comparable")
+            sys.exit(2)
+        problems = compare(results, baseline["scenarios"], options.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare the old two-pass article filtering with the single-pass rule filter
+
+Usage: python benchmarks/bench_filters.py [articles]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filters import ArticleFilter
+
+
+def legacy_filter_valid_articles(articles):
+    """newsapi.filter_valid_articles before the single-pass filter"""
+    valid_articles = []
+    for article in articles:
+        if (article and
+            article.get('title') and
+            article.get('title') != '[Removed]' and
+            article.get('description') and
+            article.get('description') != '[Removed]' and
+            article.get('url') and
+            article.get('source')):
+            title_length = len(article.get('title', ''))
+            desc_length = len(article.get('description', ''))
+            if title_length > 10 and desc_length > 20:
+                valid_articles.append(article)
+    return valid_articles
+
+
+def legacy_clean_articles(articles):
+    """app.clean_articles before the single-pass filter"""
+    cleaned = []
+    for article in articles:
+        if article and article.get('title') and article.get('title') != '[Removed]':
+            if article.get('description') != '[Removed]' and article.get('content') != '[Removed]':
+                cleaned.append(article)
+    return cleaned
+
+
+def synthetic_articles(count, rng):
+    """Mostly valid articles with the kinds of junk NewsAPI returns mixed in"""
+    articles = []
+    for i in range(count):
+        article = {
+            "source": {"id": None, "name": f"Source {i % 40}"},
+            "author": "Reporter",
+            "title": f"Headline number {i} about an ongoing story",
+            "description": f"Description for story {i}, long enough to keep.",
+            "url": f"https://example.com/{i}",
+            "urlToImage": None,
+            "publishedAt": "2026-10-18T12:00:00Z",
+            "content": "Body text " * 20
+        }
+        roll = rng.random()
+        if roll < 0.05:
+            article["title"] = article["description"] = article["content"] = "[Removed]"
+        elif roll < 0.08:
+            article["description"] = None
+        elif roll < 0.10:
+            article["title"] = "Short"
+        elif roll < 0.11:
+            article = None
+        articles.append(article)
+    return articles
+
+
+def best_of(fn, runs=5):
+    """Best wall time of several runs"""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    articles = synthetic_articles(count, random.Random(7))
+
+    legacy_time, legacy = best_of(lambda: legacy_clean_articles(legacy_filter_valid_articles(articles)))
+    article_filter = ArticleFilter()
+    single_time, single = best_of(lambda: article_filter.filter(articles))
+
+    assert [a["url"] for a in legacy] == [a["url"] for a in single], "filters disagree"
+
+    print(f"{count} articles, {len(single)} kept")
+    print(f"two-pass (filter_valid_articles + clean_articles): {legacy_time * 1000:8.2f} ms")
+    print(f"single pass (ArticleFilter.filter):                {single_time * 1000:8.2f} ms")
+    print(f"speedup: {legacy_time / single_time:.2f}x")
+    print(f"rejections: {article_filter.stats()['rejected']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Memory held by cached articles: raw JSON dicts vs. compact Article objects
+
+Builds N articles the way they arrive from NewsAPI (decoded from JSON, so
+no strings are shared between them), then measures with tracemalloc how
+much memory the dict form and the Article form (models.py) hold, and how
+long converting between them takes. Run with --full-content to use long
+article bodies (stored compressed) instead of NewsAPI's truncated ones.
+
+Usage: python benchmarks/bench_models.py [articles] [--full-content]
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from newsapi_standin import make_articles
+
+from models import compact_articles, expand_articles
+
+TAGS = ["business", "health", "science", "sports", "technology", "politics", "world", "climate", "markets", "music"]
+
+
+def build_body(count, full_content):
+    """NewsAPI-shaped JSON body with count distinct articles"""
+    articles = []
+    per_tag = count // len(TAGS) + 1
+    for tag in TAGS:
+        for article in make_articles(per_tag, tag):
+            if not full_content:
+                # NewsAPI truncates content to 200 characters
+                article["content"] = article["content"][:200] + f"... [+{len(article['content']) * 6} chars]"
+            articles.append(article)
+    return json.dumps({"articles": articles[:count]})
+
+
+def measure(build):
+    """Bytes still held by what build() returns (temporaries are freed first)"""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, held
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 100000
+    full_content = "--full-content" in sys.argv
+
+    body = build_body(count, full_content)
+    raw, raw_bytes = measure(lambda: json.loads(body)["articles"])
+    # Compacted from their own decoded copy, so they share no strings with raw
+    compact, compact_bytes = measure(lambda: compact_articles(json.loads(body)["articles"]))
+
+    started = time.perf_counter()
+    compact_articles(raw)
+    compact_time = time.perf_counter() - started
+    started = time.perf_counter()
+    expanded = expand_articles(compact)
+    expand_time = time.perf_counter() - started
+    assert expanded == raw
+
+    print(f"{count} articles ({'full' if full_content else 'truncated'} content)")
+    print(f"  dicts (as decoded)   {raw_bytes / 1e6:8.1f} MB   {raw_bytes / count:7.0f} B/article")
+    print(f"  Article objects      {compact_bytes / 1e6:8.1f} MB   {compact_bytes / count:7.0f} B/article"
+          f"   ({compact_bytes / raw_bytes:.0%} of dicts)")
+    print(f"  dicts -> Articles    {compact_time * 1e6 / count:8.2f} us/article")
+    print(f"  Articles -> dicts    {expand_time * 1e6 / count:8.2f} us/article")
+
+
+if __name__ == "__main__":
+    main()
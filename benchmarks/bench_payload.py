@@ -0,0 +1,91 @@
+"""Bytes on the wire and serialization time for /api/news payloads
+
+Compares the standard-library JSON provider with orjson, uncompressed vs.
+gzip (and brotli when installed), and full articles vs. a list-view field
+projection. The first part times the encoders directly on a 100-article
+payload; the second measures whole requests through the Flask app with the
+response already in the backend cache.
+
+Usage: python benchmarks/bench_payload.py [requests]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from newsapi_standin import make_articles, start_standin
+
+server, base_url = start_standin()
+os.environ["NEWS_API_BASE_URL"] = base_url
+os.environ.setdefault("NEWS_API_KEY", "benchmark")
+os.environ["NEWS_STORE_ENABLED"] = "false"
+
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+import encoding
+import newsapi
+import app as news_app
+
+newsapi.log_debug = lambda message: None
+news_app.log_message = lambda message: None
+
+
+def best_of(fn, count):
+    """Best per-call time of fn in microseconds"""
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e6
+
+
+def encoders(count):
+    payload = {"status": "ok", "articles": make_articles(100, "market")}
+    std = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+    print("100-article payload")
+    print(f"  json.dumps (Flask default)  {best_of(lambda: json.dumps(payload, separators=(',', ':'), sort_keys=True), count):8.1f} us   {len(std):7d} bytes")
+    if encoding.orjson is not None:
+        print(f"  orjson.dumps                {best_of(lambda: encoding.orjson.dumps(payload), count):8.1f} us")
+    print(f"  gzip level {encoding.GZIP_LEVEL}                {best_of(lambda: encoding.compress(std, 'gzip'), count):8.1f} us   {len(encoding.compress(std, 'gzip')):7d} bytes")
+    if encoding.brotli is not None:
+        print(f"  brotli quality {encoding.BROTLI_QUALITY}            {best_of(lambda: encoding.compress(std, 'br'), count):8.1f} us   {len(encoding.compress(std, 'br')):7d} bytes")
+
+
+def requests_through_app(count):
+    client = news_app.app.test_client()
+    url = "/api/news?category=business"
+    client.get(url)  # fill the backend cache
+
+    cases = [
+        ("full, identity", url, {}),
+        ("full, gzip", url, {"Accept-Encoding": "gzip"}),
+        ("fields=list view, identity", url + "&fields=title,url,urlToImage,source,publishedAt", {}),
+        ("fields=list view, gzip", url + "&fields=title,url,urlToImage,source,publishedAt", {"Accept-Encoding": "gzip"}),
+    ]
+    if encoding.brotli is not None:
+        cases.insert(2, ("full, br", url, {"Accept-Encoding": "br"}))
+
+    for provider_name, provider in (("json", DefaultJSONProvider), ("orjson", encoding.OrjsonProvider)):
+        if provider is encoding.OrjsonProvider and not encoding.USE_ORJSON:
+            continue
+        news_app.app.json = provider(news_app.app)
+        print(f"GET /api/news through Flask ({provider_name} provider, cache hit)")
+        for label, path, headers in cases:
+            size = len(client.get(path, headers=headers).data)
+            per_request = best_of(lambda: client.get(path, headers=headers), count)
+            print(f"  {label:<28} {per_request:8.1f} us   {size:7d} bytes")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    encoders(count)
+    requests_through_app(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Latency of sort=relevance ranking over a candidate set
+
+Ranks N synthetic articles (mixed topics, as a search returns them) for a
+multi-word query and reports the time per ranking: the first ranking
+tokenizes every article, later ones reuse the cached features. Runs the
+NumPy engine when it is installed, and the pure-Python one for comparison.
+
+Usage: python benchmarks/bench_ranking.py [articles]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from newsapi_standin import make_articles
+
+import ranking
+from ranking import ArticleRanker
+
+TAGS = ["politics", "business", "climate", "sports", "technology"]
+QUERY = "election OR senate OR budget OR climate NOT football"
+ROUNDS = 20
+
+
+def build_articles(count):
+    per_tag = count // len(TAGS) + 1
+    articles = [article for tag in TAGS for article in make_articles(per_tag, tag)]
+    return articles[:count]
+
+
+def best_time(ranker, articles):
+    """Fastest of ROUNDS warm rankings, in seconds"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        ranker.rank(articles, QUERY)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    articles = build_articles(count)
+    engines = [("numpy", ranking.numpy)] if ranking.numpy is not None else []
+    engines.append(("python", None))
+
+    print(f"{count} candidates, query: {QUERY}")
+    orders = []
+    numpy_module = ranking.numpy
+    try:
+        for name, module in engines:
+            ranking.numpy = module
+            ranker = ArticleRanker()
+            started = time.perf_counter()
+            orders.append([article["url"] for article in ranker.rank(articles, QUERY, now=time.time())])
+            cold = time.perf_counter() - started
+            warm = best_time(ranker, articles)
+            print(f"  {name:<7} first {cold * 1000:8.2f} ms   cached features {warm * 1000:8.2f} ms")
+    finally:
+        ranking.numpy = numpy_module
+
+    if len(orders) == 2:
+        print(f"  same order: {orders[0] == orders[1]}")
+
+
+if __name__ == "__main__":
+    main()
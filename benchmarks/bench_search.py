@@ -0,0 +1,80 @@
+"""Measure local full-text search latency as the article store grows
+
+Usage: python benchmarks/bench_search.py [max_articles]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from store import ArticleStore
+
+WORDS = (
+    "election senate budget climate market stocks football league vaccine health "
+    "technology startup chip energy oil court ruling trade tariff war peace summit "
+    "hurricane storm wildfire research space rocket launch museum film music award "
+    "bank inflation jobs housing school university police transport airline strike"
+).split()
+QUERIES = ["election", "climate summit", "rocket launch", "bank inflation jobs", "football OR league OR award"]
+FILLER = [f"w{i}" for i in range(20000)]
+FILLER_WEIGHTS = [1.0 / (rank + 1) for rank in range(len(FILLER))]  # Zipf-like word frequencies
+
+
+def synthetic_articles(start, count, rng):
+    """Build synthetic articles with random vocabulary"""
+    articles = []
+    for i in range(start, start + count):
+        # A few topic words mixed into common filler text, like real articles
+        words = rng.choices(FILLER, weights=FILLER_WEIGHTS, k=40)
+        for position in rng.sample(range(40), 3):
+            words[position] = rng.choice(WORDS)
+        articles.append({
+            "source": {"id": None, "name": f"Source {i % 50}"},
+            "author": None,
+            "title": " ".join(words[:8]).capitalize(),
+            "description": " ".join(words[8:20]),
+            "url": f"https://example.com/article/{i}",
+            "urlToImage": None,
+            "publishedAt": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T12:00:00Z",
+            "content": " ".join(words)
+        })
+    return articles
+
+
+def main():
+    max_articles = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(42)
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    store = ArticleStore(path)
+
+    if not store.fts_enabled:
+        print("SQLite FTS5 is not available in this Python build")
+        return
+
+    size = 0
+    print(f"{'articles':>10} {'query':<28} {'matches':>8} {'mean ms':>9} {'p99 ms':>9}")
+    for target in (1000, 10000, 100000, 1000000):
+        if target > max_articles:
+            break
+        store.ingest(f"bench|{target}", synthetic_articles(size, target - size, rng), language="en",
+                     window=("2026-01-01", "2026-12-31"))
+        size = target
+
+        for query in QUERIES:
+            timings = []
+            for _ in range(50):
+                start = time.perf_counter()
+                matches = store.search(query, language="en", limit=50)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            mean = sum(timings) / len(timings) * 1000
+            print(f"{size:>10} {query:<28} {len(matches):>8} {mean:>9.3f} {timings[-1] * 1000:>9.3f}")
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Compare per-request latency of requests.get against the pooled session
+
+Usage: python benchmarks/bench_session.py [requests]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+import newsapi
+from newsapi_standin import start_standin
+
+
+def run(label, get, url, count):
+    """Time count sequential GET requests"""
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = get(url, params={"pageSize": 5}, timeout=(newsapi.CONNECT_TIMEOUT, newsapi.READ_TIMEOUT))
+        response.content
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    mean = sum(timings) / len(timings)
+    p50 = timings[len(timings) // 2]
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{label:<24} mean {mean * 1000:7.3f} ms   p50 {p50 * 1000:7.3f} ms   p99 {p99 * 1000:7.3f} ms")
+    return mean
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    server, base_url = start_standin()
+    url = f"{base_url}/top-headlines"
+
+    print(f"{count} requests against local stand-in at {base_url}")
+    unpooled = run("requests.get (new conn)", requests.get, url, count)
+    pooled = run("pooled session", newsapi.get_session().get, url, count)
+    print(f"saved per request: {(unpooled - pooled) * 1000:.3f} ms ({(1 - pooled / unpooled) * 100:.1f}%)")
+    print("note: no TLS locally; against newsapi.org the handshake saving is much larger")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
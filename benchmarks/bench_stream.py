@@ -0,0 +1,76 @@
+"""Time to first byte / first article of streamed vs. buffered /api/news responses
+
+Runs the Flask app on a local port against the NewsAPI stand-in and compares
+the buffered JSON response with ?stream=ndjson and ?stream=sse over 1 and 5
+result pages. Every request uses a new query so nothing comes from the cache.
+
+Usage: python benchmarks/bench_stream.py [requests]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from newsapi_standin import start_standin
+
+server, base_url = start_standin()
+os.environ["NEWS_API_BASE_URL"] = base_url
+os.environ.setdefault("NEWS_API_KEY", "benchmark")
+os.environ["NEWS_STORE_ENABLED"] = "false"
+os.environ["NEWS_API_RATE_PER_MINUTE"] = "1000000"
+os.environ["NEWS_API_RATE_BURST"] = "1000000"
+os.environ["NEWS_API_DAILY_QUOTA"] = "0"
+
+import logging
+
+import requests
+from werkzeug.serving import make_server
+
+import newsapi
+import app as news_app
+
+# Keep per-request logging out of the timings
+newsapi.log_debug = lambda message: None
+news_app.log_message = lambda message: None
+
+
+def timed_get(url, marker):
+    """GET url; returns (ttfb, time to first article, total) in seconds"""
+    start = time.perf_counter()
+    response = requests.get(url, stream=True)
+    first_byte = first_article = None
+    for chunk in response.iter_content(chunk_size=None):
+        now = time.perf_counter()
+        if first_byte is None:
+            first_byte = now
+        if first_article is None and marker in chunk:
+            first_article = now
+    end = time.perf_counter()
+    return first_byte - start, (first_article or end) - start, end - start
+
+
+def run(label, base, marker, count):
+    results = [timed_get(f"{base}&q=market{label.replace(' ', '')}{i}", marker) for i in range(count)]
+    ttfb, first, total = (sorted(column)[len(column) // 2] for column in zip(*results))
+    print(f"{label:<22} ttfb {ttfb * 1000:7.2f} ms   first article {first * 1000:7.2f} ms   total {total * 1000:7.2f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    http_server = make_server("127.0.0.1", 0, news_app.app, threaded=True)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{http_server.server_port}/api/news?language=en"
+
+    print(f"median of {count} requests per mode (stand-in at {base_url})")
+    run("json", base, b'"title"', count)
+    run("ndjson 1 page", base + "&stream=ndjson", b'"article"', count)
+    run("sse 1 page", base + "&stream=sse", b"event: article", count)
+    run("ndjson 5 pages", base + "&stream=ndjson&pages=5", b'"article"', count)
+    http_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""/api/thumb: bytes and latency of thumbnails vs. hotlinked originals
+
+Serves a few large generated photos from a local "publisher" server with
+added latency, then requests each through /api/thumb (Flask test client)
+twice: the first request downloads, stores and resizes the image, the
+second is served from the on-disk cache. The JPEG pass then renders from
+the stored master copies without downloading again. Needs Pillow.
+
+Usage: python benchmarks/bench_thumbs.py [images] [--latency-ms 150]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PIL import Image
+
+WORK_DIR = tempfile.mkdtemp(prefix="bench-thumbs-")
+os.environ.update(THUMB_CACHE_DIR=os.path.join(WORK_DIR, "cache"), NEWS_API_KEY="benchmark", LOG_LEVEL="WARNING",
+                  NEWS_STORE_ENABLED="false", PREFETCH_ENABLED="false")
+
+from app import app
+from thumbs import thumbnail_url, thumbnails
+
+
+class PublisherHandler(SimpleHTTPRequestHandler):
+    """Static file server standing in for a slow publisher CDN"""
+
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_photos(directory, count):
+    """Noisy photo-sized JPEGs (noise keeps them realistically large)"""
+    rng = random.Random(1)
+    names = []
+    for index in range(count):
+        noise = Image.effect_noise((1000, 667), 60).convert("RGB").resize((3000, 2000))
+        tint = Image.new("RGB", noise.size, (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        name = f"photo-{index}.jpg"
+        Image.blend(noise, tint, 0.5).save(os.path.join(directory, name), quality=90)
+        names.append(name)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Thumbnail proxy benchmark")
+    parser.add_argument("images", nargs="?", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=150, help="publisher response delay")
+    options = parser.parse_args()
+
+    images_dir = os.path.join(WORK_DIR, "images")
+    os.makedirs(images_dir)
+    names = make_photos(images_dir, options.images)
+    PublisherHandler.latency = options.latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(PublisherHandler, directory=images_dir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    client = app.test_client()
+    original_bytes = sum(os.path.getsize(os.path.join(images_dir, name)) for name in names)
+    print(f"{len(names)} images, {original_bytes / len(names) / 1024:.0f} KiB each on average, "
+          f"publisher latency {options.latency_ms:.0f} ms")
+    for accept in ("image/webp", "image/jpeg"):
+        for label in ("first request", "cached"):
+            sizes = []
+            started = time.perf_counter()
+            for name in names:
+                response = client.get(thumbnail_url(f"{base}/{name}", 400), headers={"Accept": accept})
+                assert response.status_code == 200, response.get_json()
+                sizes.append(len(response.data))
+            elapsed = (time.perf_counter() - started) / len(names)
+            print(f"  {accept.split('/')[1]:<5} {label:<14} {elapsed * 1000:8.1f} ms/image   "
+                  f"{sum(sizes) / len(sizes) / 1024:6.1f} KiB ({sum(sizes) / original_bytes:.1%} of the originals)")
+    print(thumbnails.stats())
+    server.shutdown()
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Load test: requests/sec of /api/news with 1, 2 and 4 server worker processes
+
+Starts the server (gunicorn with "app:create_app()" when installed, otherwise
+uvicorn with asgi:application) against the NewsAPI stand-in, warms the cache,
+then hits a rotation of category URLs from several client processes. Each
+worker count is run with the in-process cache and, when fakeredis is
+installed, with the Redis cache backend on a local fakeredis server, and
+the number of upstream (stand-in) calls is reported for each run.
+
+Usage: python benchmarks/bench_workers.py [seconds] [client processes]
+"""
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests
+
+from newsapi_standin import start_standin
+
+try:
+    import fakeredis
+    import redis
+except ImportError:  # only the in-process cache is benchmarked
+    fakeredis = None
+
+CATEGORIES = ["business", "entertainment", "general", "health", "science", "sports", "technology"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_redis():
+    """Start a fakeredis server speaking the Redis protocol; returns (server, url)"""
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"redis://127.0.0.1:{server.server_address[1]}/0"
+
+
+def start_server(workers, port, base_url, cache_backend="memory", redis_url=""):
+    """Start the app with the given number of worker processes"""
+    env = dict(os.environ, NEWS_API_BASE_URL=base_url, NEWS_API_KEY=os.getenv("NEWS_API_KEY", "benchmark"),
+               NEWS_STORE_ENABLED="false", PREFETCH_ENABLED="false", WEB_CONCURRENCY=str(workers),
+               NEWS_API_RATE_PER_MINUTE="100000", NEWS_API_RATE_BURST="100000", NEWS_API_DAILY_QUOTA="0",
+               NEWS_CACHE_BACKEND=cache_backend, NEWS_CACHE_REDIS_URL=redis_url)
+    if shutil.which("gunicorn"):
+        command = ["gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}",
+                   "--access-logfile", "", "app:create_app()"]
+        server = "gunicorn"
+    else:
+        command = [sys.executable, "-m", "uvicorn", "asgi:application", "--port", str(port),
+                   "--workers", str(workers), "--no-access-log", "--log-level", "warning"]
+        server = "uvicorn"
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    url = f"http://127.0.0.1:{port}/api/health"
+    for _ in range(100):
+        try:
+            requests.get(url, timeout=1)
+            return process, server
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def client(args):
+    """Send requests for duration seconds; returns the number completed"""
+    base, duration, offset = args
+    session = requests.Session()
+    done = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        category = CATEGORIES[(done + offset) % len(CATEGORIES)]
+        session.get(f"{base}/api/news?category={category}").content
+        done += 1
+    return done
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    standin, base_url = start_standin()
+    print(f"{clients} client processes, {duration:.0f}s per run, {multiprocessing.cpu_count()} CPUs")
+
+    backends = [("memory", "")]
+    if fakeredis is not None:
+        redis_server, redis_url = start_redis()
+        backends.append(("redis", redis_url))
+
+    with multiprocessing.Pool(clients) as pool:
+        for cache_backend, redis_url in backends:
+            for workers in (1, 2, 4):
+                if redis_url:
+                    redis.Redis.from_url(redis_url).flushall()
+                port = free_port()
+                process, server = start_server(workers, port, base_url, cache_backend, redis_url)
+                base = f"http://127.0.0.1:{port}"
+                upstream_before = standin.request_count
+                try:
+                    # Warm the cache before measuring
+                    pool.map(client, [(base, 1.0, i) for i in range(clients)])
+                    completed = sum(pool.map(client, [(base, duration, i) for i in range(clients)]))
+                finally:
+                    process.terminate()
+                    process.wait(timeout=30)
+                print(f"{server} cache={cache_backend:<6} workers={workers}: {completed / duration:8.1f} req/s   "
+                      f"upstream calls: {standin.request_count - upstream_before}")
+
+
+if __name__ == "__main__":
+    main()
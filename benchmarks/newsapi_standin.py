@@ -0,0 +1,195 @@
+"""
+Local stand-in for the NewsAPI HTTP endpoints used by the benchmarks
+
+Answers /v2/top-headlines and /v2/everything with synthetic articles, or
+replays recorded responses from a directory. Latency, server errors and
+429s can be injected to see how the app behaves when NewsAPI is slow or
+failing. Recorded responses are plain NewsAPI JSON bodies named
+<endpoint>-<category or first query word>.json, falling back to
+<endpoint>.json, e.g. saved with:
+    curl "https://newsapi.org/v2/top-headlines?category=business&apiKey=..." > replay/top-headlines-business.json
+
+Usage: python benchmarks/newsapi_standin.py [--port 8099] [--latency-ms 80] [--jitter-ms 40]
+       [--error-rate 0.05] [--rate-limit-rate 0.01] [--retry-after 1] [--replay DIR] [--seed 1]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+WORDS = (
+    "election senate budget climate market stocks football league vaccine health technology startup "
+    "chip energy oil court ruling trade tariff summit hurricane storm wildfire research space rocket "
+    "launch museum film music award bank inflation jobs housing school university police transport "
+    "airline strike minister protest border treaty drought harvest festival merger lawsuit satellite"
+).split()
+
+# Results available per query (pages beyond this come back empty)
+TOTAL_RESULTS = 500
+
+ENDPOINTS = ("top-headlines", "everything")
+
+
+def story_words(tag, index, count):
+    """Deterministic pseudo-random words so every synthetic story reads differently"""
+    return " ".join(WORDS[(index * 7 + position * (index % 11 + 3) + len(tag)) % len(WORDS)] for position in range(count))
+
+
+def make_articles(count, tag="news", start=0):
+    """Build a list of synthetic NewsAPI articles (numbered from start)"""
+    now = datetime.utcnow()
+    return [
+        {
+            "source": {"id": None, "name": f"Source {i % 12}"},
+            "author": f"Reporter {i % 30}",
+            "title": f"{tag.capitalize()} {i}: {story_words(tag, i, 6)}",
+            "description": f"Synthetic {tag} story about {story_words(tag, i * 13 + 5, 12)}.",
+            "url": f"https://example.com/{tag}/{i}",
+            "urlToImage": f"https://example.com/{tag}/{i}.jpg",
+            "publishedAt": (now - timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "content": f"Body of {tag} story {i}. " * 20
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def load_replay(directory):
+    """Read recorded responses: file name without .json -> parsed body"""
+    recorded = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                recorded[name[:-5]] = json.load(f)
+    return recorded
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answer /v2/top-headlines and /v2/everything with synthetic or recorded articles"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        endpoint = parsed.path.rstrip("/").rsplit("/", 1)[-1]
+        with server.lock:
+            server.request_count += 1
+            roll = server.random.random()
+            delay = max(0.0, server.latency + server.random.uniform(-server.jitter, server.jitter))
+
+        if delay:
+            time.sleep(delay)
+
+        if endpoint not in ENDPOINTS:
+            return self.send_json(404, {"status": "error", "code": "notFound", "message": "Unknown endpoint"})
+        if not params.get("apiKey"):
+            return self.send_json(401, {"status": "error", "code": "apiKeyMissing",
+                                        "message": "Your API key is missing."})
+
+        # Injected failures: 429s first, then server errors
+        if roll < server.rate_limit_rate:
+            with server.lock:
+                server.rate_limited_count += 1
+            return self.send_json(429, {"status": "error", "code": "rateLimited",
+                                        "message": "You have made too many requests recently."},
+                                  {"Retry-After": str(server.retry_after)})
+        if roll < server.rate_limit_rate + server.error_rate:
+            with server.lock:
+                server.error_count += 1
+            return self.send_json(500, {"status": "error", "code": "unexpectedError",
+                                        "message": "Injected server error."})
+
+        page_size = int(params.get("pageSize", ["20"])[0])
+        page = int(params.get("page", ["1"])[0])
+        words = params.get("category", params.get("q", ["news"]))[0].split() or ["news"]
+        tag = re.sub(r"[^a-z0-9]+", "", words[0].lower()) or "news"
+        start = (page - 1) * page_size
+
+        recorded = server.recorded.get(f"{endpoint}-{tag}") or server.recorded.get(endpoint)
+        if recorded is not None:
+            articles = recorded.get("articles", [])
+            return self.send_json(200, {"status": "ok", "totalResults": len(articles),
+                                        "articles": articles[start:start + page_size]})
+
+        count = max(0, min(page_size, TOTAL_RESULTS - start))
+        self.send_json(200, {
+            "status": "ok",
+            "totalResults": TOTAL_RESULTS,
+            "articles": make_articles(count, tag, start)
+        })
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_standin(port=0, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, retry_after=1,
+                  replay_dir=None, seed=None):
+    """
+    Start the stand-in server in a background thread; returns (server, base_url)
+
+    latency and jitter are in seconds; error_rate and rate_limit_rate are the
+    shares of requests answered with a 500 or a 429 (with Retry-After:
+    retry_after). server.request_count, error_count and rate_limited_count
+    count what it has answered.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.random = random.Random(seed)
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.rate_limit_rate = rate_limit_rate
+    server.retry_after = retry_after
+    server.recorded = load_replay(replay_dir) if replay_dir else {}
+    server.request_count = 0
+    server.error_count = 0
+    server.rate_limited_count = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_port}/v2"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local NewsAPI stand-in")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random +/- spread of the delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--replay", help="directory of recorded NewsAPI responses")
+    parser.add_argument("--seed", type=int, help="seed for injected latency and failures")
+    args = parser.parse_args()
+
+    server, base_url = start_standin(args.port, args.latency_ms / 1000, args.jitter_ms / 1000, args.error_rate,
+                                     args.rate_limit_rate, args.retry_after, args.replay, args.seed)
+    print(f"NewsAPI stand-in listening at {base_url}"
+          + (f" (replaying {len(server.recorded)} recorded responses)" if server.recorded else ""))
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
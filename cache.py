@@ -0,0 +1,508 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+
+from models import compact_response, expand_response
+
+try:
+    import msgpack
+except ImportError:  # values are stored as compressed JSON instead
+    msgpack = None
+
+try:
+    import redis
+except ImportError:  # only the in-process backend is available
+    redis = None
+
+# First byte of a stored value: how the rest of it is encoded
+MSGPACK_FORMAT = b"m"
+JSON_FORMAT = b"j"
+
+
+def estimate_size(value):
+    """Rough size of a cached response in bytes (its JSON encoding)"""
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def encode_value(value):
+    """Serialize a cached response compactly (zlib-compressed msgpack, or JSON)"""
+    if msgpack is not None:
+        return MSGPACK_FORMAT + zlib.compress(msgpack.packb(value, use_bin_type=True, default=str))
+    return JSON_FORMAT + zlib.compress(json.dumps(value, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def decode_value(data):
+    """Reverse encode_value"""
+    if data[:1] == MSGPACK_FORMAT:
+        if msgpack is None:
+            raise ValueError("cached value needs msgpack, which is not installed")
+        return msgpack.unpackb(zlib.decompress(data[1:]), raw=False)
+    return json.loads(zlib.decompress(data[1:]))
+
+
+class ResponseCache:
+    """Thread-safe in-process cache with per-entry TTL and LRU eviction
+
+    Entries are evicted least-recently-used first whenever the cache holds
+    more than max_entries items or more than max_bytes of JSON payload.
+    Expired entries are kept for stale_ttl more seconds so they can still be
+    served (via get_stale) while a fresh copy is being fetched. With compact
+    set, articles are held as compact Article objects (models.py) and turned
+    back into dicts on every read: less memory for a little CPU per hit.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024, stale_ttl=0, compact=False):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.compact = compact
+        self._entries = OrderedDict()  # key -> (expires_at, stale_until, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key, now):
+        """Get the entry for key, dropping it if past its stale window (lock held)"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] <= now:
+            del self._entries[key]
+            self._bytes -= entry[2]
+            self.expirations += 1
+            return None
+        return entry
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            now = time.monotonic()
+            entry = self._lookup(key, now)
+            if entry is None or entry[0] <= now:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[3]
+        return expand_response(value) if self.compact else value
+
+    def get_stale(self, key):
+        """Return the cached value for key even if expired (within stale_ttl)"""
+        with self._lock:
+            entry = self._lookup(key, time.monotonic())
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            value = entry[3]
+        return expand_response(value) if self.compact else value
+
+    def ttl_remaining(self, key):
+        """Seconds until the entry for key stops being fresh (0 if missing or expired)"""
+        with self._lock:
+            now = time.monotonic()
+            entry = self._lookup(key, now)
+            return max(0.0, entry[0] - now) if entry is not None else 0.0
+
+    def set(self, key, value, ttl):
+        """Store value under key for ttl seconds"""
+        if ttl <= 0:
+            return
+
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if self.compact:
+            value = compact_response(value)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+            expires_at = time.monotonic() + ttl
+            self._entries[key] = (expires_at, expires_at + self.stale_ttl, size, value)
+            self._bytes += size
+            self._evict()
+
+    def acquire_lock(self, key, timeout):
+        """Refresh lock for key; in one process SingleFlight already does this job"""
+        return True
+
+    def release_lock(self, key, token):
+        pass
+
+    def _evict(self):
+        """Drop least recently used entries until within limits (lock held)"""
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry[2]
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Get cache counters and current usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "compact": self.compact,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "stale_ttl": self.stale_ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class RedisCache:
+    """Response cache shared by all workers through a Redis-protocol server
+
+    Same interface as ResponseCache. Values are stored compressed (see
+    encode_value) together with their fresh-until time, and expire from the
+    server stale_ttl seconds later so get_stale can still serve them.
+    acquire_lock/release_lock give a per-key lock (SET NX PX with a random
+    token) so only one worker refreshes a key at a time. Server errors are
+    counted and treated as cache misses, never as request failures. After an
+    error the server is skipped for backoff seconds (doubling up to
+    max_backoff while it keeps failing), so an unreachable Redis costs one
+    socket timeout per backoff period instead of several per request.
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", prefix="fetchpress:", stale_ttl=0, client=None,
+                 backoff=1.0, max_backoff=30.0):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("The redis package is required for the Redis cache backend")
+            client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self.client = client
+        self.url = url
+        self.prefix = prefix
+        self.stale_ttl = stale_ttl
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._failures = 0
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.errors = 0
+        self.skipped = 0
+        self.bytes_written = 0
+
+    def _key(self, key, kind="value"):
+        return f"{self.prefix}{kind}:" + json.dumps(list(key) if isinstance(key, tuple) else key,
+                                                    separators=(",", ":"))
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _available(self):
+        """Check whether to call the server (False while backing off after errors)"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._down_until:
+                self.skipped += 1
+                return False
+            if self._failures:
+                # This call probes the server; the others keep skipping it meanwhile
+                self._down_until = now + self._backoff_delay()
+            return True
+
+    def _backoff_delay(self):
+        """Seconds to skip the server after the current run of failures (lock held)"""
+        return min(self.max_backoff, self.backoff * 2 ** max(0, self._failures - 1))
+
+    def _failed(self):
+        """Count a server error and start (or extend) backing off"""
+        with self._lock:
+            self.errors += 1
+            self._failures += 1
+            self._down_until = time.monotonic() + self._backoff_delay()
+
+    def _succeeded(self):
+        if self._failures:
+            with self._lock:
+                self._failures = 0
+                self._down_until = 0.0
+
+    def _load(self, key):
+        """Get (fresh_until, value) for key, or None"""
+        if not self._available():
+            return None
+        try:
+            data = self.client.get(self._key(key))
+        except Exception:
+            self._failed()
+            return None
+        self._succeeded()
+        if data is None:
+            return None
+        try:
+            fresh_until, value = decode_value(data)
+        except (ValueError, TypeError, zlib.error):
+            self._count("errors")
+            return None
+        return fresh_until, value
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self._load(key)
+        if entry is None or entry[0] <= time.time():
+            self._count("misses")
+            return None
+        self._count("hits")
+        return entry[1]
+
+    def get_stale(self, key):
+        """Return the cached value for key even if expired (within stale_ttl)"""
+        entry = self._load(key)
+        if entry is None:
+            return None
+        self._count("stale_hits")
+        return entry[1]
+
+    def ttl_remaining(self, key):
+        """Seconds until the entry for key stops being fresh (0 if missing or expired)"""
+        entry = self._load(key)
+        return max(0.0, entry[0] - time.time()) if entry is not None else 0.0
+
+    def set(self, key, value, ttl):
+        """Store value under key for ttl seconds (plus the stale window)"""
+        if ttl <= 0:
+            return
+        if not self._available():
+            return
+        data = encode_value([time.time() + ttl, value])
+        try:
+            self.client.set(self._key(key), data, px=int((ttl + self.stale_ttl) * 1000))
+        except Exception:
+            self._failed()
+            return
+        self._succeeded()
+        self._count("bytes_written", len(data))
+
+    def acquire_lock(self, key, timeout):
+        """
+        Try to take the refresh lock for key for up to timeout seconds
+
+        Returns:
+            str: token to pass to release_lock, or None if another worker holds it
+        """
+        token = uuid.uuid4().hex
+        if not self._available():
+            return token  # server unreachable: don't block the refresh
+        try:
+            acquired = self.client.set(self._key(key, "lock"), token, nx=True, px=int(timeout * 1000))
+        except Exception:
+            self._failed()
+            return token
+        self._succeeded()
+        return token if acquired else None
+
+    def release_lock(self, key, token):
+        """Release the refresh lock if this token still holds it"""
+        if not self._available():
+            return  # the lock expires on its own
+        lock_key = self._key(key, "lock")
+        try:
+            with self.client.pipeline() as pipe:
+                pipe.watch(lock_key)
+                current = pipe.get(lock_key)
+                if current is not None and current.decode("ascii") == token:
+                    pipe.multi()
+                    pipe.delete(lock_key)
+                    pipe.execute()
+                else:
+                    pipe.unwatch()
+        except Exception:
+            self._failed()  # the lock expires on its own
+            return
+        self._succeeded()
+
+    def clear(self):
+        """Remove all entries under this cache's prefix (counters are kept)"""
+        try:
+            for name in self.client.scan_iter(match=f"{self.prefix}*"):
+                self.client.delete(name)
+        except Exception:
+            self._failed()
+
+    def __len__(self):
+        try:
+            return sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}value:*"))
+        except Exception:
+            return 0
+
+    def stats(self):
+        """Get this worker's cache counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "redis",
+                "url": self.url.rsplit("@", 1)[-1],  # without credentials
+                "stale_ttl": self.stale_ttl,
+                "encoding": "msgpack+zlib" if msgpack is not None else "json+zlib",
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "errors": self.errors,
+                "skipped": self.skipped,
+                "backing_off_for": round(max(0.0, self._down_until - time.monotonic()), 1),
+                "bytes_written": self.bytes_written,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def create_cache(backend="memory", redis_url=None, max_entries=256, max_bytes=32 * 1024 * 1024, stale_ttl=0,
+                 compact=False):
+    """Create the response cache for a backend name ("memory" or "redis")"""
+    if backend == "redis":
+        return RedisCache(redis_url or "redis://localhost:6379/0", stale_ttl=stale_ttl)
+    if backend != "memory":
+        raise ValueError(f"Unknown cache backend: {backend}")
+    return ResponseCache(max_entries=max_entries, max_bytes=max_bytes, stale_ttl=stale_ttl, compact=compact)
+
+
+class _Call:
+    """An in-flight call that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution
+
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait for it and receive the same result, or the same
+    exception if it failed.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.executions = 0
+        self.collapsed = 0
+
+    def do(self, key, fn):
+        """Run fn once per key at a time; returns (result, shared)"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.collapsed += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+    def stats(self):
+        """Get single-flight counters"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self.executions,
+                "collapsed": self.collapsed
+            }
+
+
+class AsyncSingleFlight:
+    """asyncio version of SingleFlight for coroutines on one event loop"""
+
+    def __init__(self):
+        self._calls = {}
+
+        # Counters
+        self.executions = 0
+        self.collapsed = 0
+
+    async def do(self, key, fn):
+        """
+        Await fn() once per key at a time; returns (result, shared)
+
+        fn() runs as its own task that every caller awaits through
+        asyncio.shield, so a cancelled caller (the first one included)
+        stops waiting without cancelling the call for the others.
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.collapsed += 1
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        self.executions += 1
+        task.add_done_callback(lambda done: self._finish(key, done))
+        result = await asyncio.shield(task)
+        return result, False
+
+    def _finish(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # mark as retrieved when nobody is waiting any more
+
+    def stats(self):
+        """Get single-flight counters"""
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "collapsed": self.collapsed
+        }
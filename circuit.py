@@ -0,0 +1,150 @@
+import random
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def backoff_delay(attempt, base=1.0, cap=8.0):
+    """Retry delay for a 0-based attempt: exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Fail fast while an upstream service is failing or too slow
+
+    Outcomes of the calls in the last window seconds are kept. A call is bad
+    if it failed or took longer than slow_call_seconds. Once at least
+    min_calls were made in the window and the share of bad ones reaches
+    failure_rate, the circuit opens: allow_request() refuses calls for
+    open_seconds. After that the circuit is half-open and lets
+    half_open_probes calls through; a good probe closes it again, a bad one
+    opens it for another open_seconds. A probe that was reserved but never
+    reported (release_probe() not called either) is given up after
+    probe_timeout seconds, so the circuit can't stay half-open for good.
+    """
+
+    def __init__(self, failure_rate=0.5, min_calls=5, window=60, slow_call_seconds=5.0, open_seconds=30,
+                 half_open_probes=1, probe_timeout=30):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.probe_timeout = probe_timeout
+
+        self._state = CLOSED
+        self._outcomes = deque()  # (finished_at, bad)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_expires = 0.0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.opened = 0
+        self.rejected = 0
+
+    def _update_state(self, now):
+        """Move from open to half-open once open_seconds have passed, expire lost probes (lock held)"""
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+        elif self._state == HALF_OPEN and self._probes and now >= self._probe_expires:
+            self._probes = 0
+
+    def _open(self, now):
+        self._state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self.opened += 1
+
+    @property
+    def state(self):
+        with self._lock:
+            self._update_state(time.monotonic())
+            return self._state
+
+    def can_request(self):
+        """Check whether allow_request() would let a call through, without reserving a probe"""
+        with self._lock:
+            self._update_state(time.monotonic())
+            return self._state == CLOSED or (self._state == HALF_OPEN and self._probes < self.half_open_probes)
+
+    def allow_request(self):
+        """Check whether a call may go upstream now (reserves a probe when half-open)"""
+        with self._lock:
+            now = time.monotonic()
+            self._update_state(now)
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                self._probe_expires = now + self.probe_timeout
+                return True
+            self.rejected += 1
+            return False
+
+    def release_probe(self):
+        """Give back a probe reserved by allow_request() for a call that wasn't made"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def allows_retry(self):
+        """Retries are only worth it while the circuit is closed"""
+        return self.state == CLOSED
+
+    def retry_after(self):
+        """Seconds until the open circuit lets a probe through"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def record(self, failed, duration):
+        """Record the outcome of an upstream call; returns True if that opened the circuit"""
+        bad = failed or duration >= self.slow_call_seconds
+        with self._lock:
+            now = time.monotonic()
+            self._update_state(now)
+
+            if self._state == HALF_OPEN:
+                if bad:
+                    self._open(now)
+                    return True
+                self._state = CLOSED
+                return False
+            if self._state == OPEN:
+                return False  # a call that started before the circuit opened
+
+            self._outcomes.append((now, bad))
+            while self._outcomes and self._outcomes[0][0] <= now - self.window:
+                self._outcomes.popleft()
+            if len(self._outcomes) >= self.min_calls:
+                bad_calls = sum(1 for _, outcome in self._outcomes if outcome)
+                if bad_calls / len(self._outcomes) >= self.failure_rate:
+                    self._open(now)
+                    return True
+            return False
+
+    def stats(self):
+        """Get the circuit state and counters"""
+        with self._lock:
+            now = time.monotonic()
+            self._update_state(now)
+            recent = [outcome for finished_at, outcome in self._outcomes if finished_at > now - self.window]
+            return {
+                "state": self._state,
+                "recent_calls": len(recent),
+                "recent_failure_rate": round(sum(recent) / len(recent), 3) if recent else 0.0,
+                "failure_rate_threshold": self.failure_rate,
+                "slow_call_seconds": self.slow_call_seconds,
+                "retry_after": round(max(0.0, self.open_seconds - (now - self._opened_at)), 1)
+                if self._state == OPEN else 0.0,
+                "opened": self.opened,
+                "rejected": self.rejected
+            }
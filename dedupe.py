@@ -0,0 +1,187 @@
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+# MinHash / LSH parameters: 32 hashes split into 8 bands of 4 rows puts the
+# 50% match probability at roughly 0.6 Jaccard similarity of the shingle sets
+NUM_HASHES = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_HASHES // BANDS
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.5
+SIGNATURE_CACHE_SIZE = 20000
+
+# Each MinHash "permutation" XORs the 32-bit shingle hashes with a fixed
+# mask (cheap in pure Python, and the same in every process)
+_HASH_MASKS = [zlib.crc32(f"minhash-{i}".encode("ascii")) for i in range(NUM_HASHES)]
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text):
+    """Get hashed word 3-grams of a text"""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + SHINGLE_SIZE]).encode("utf-8"))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash_signature(text):
+    """Compute the MinHash signature of a text"""
+    hashed = shingles(text)
+    if not hashed:
+        return None
+    return tuple(min(value ^ mask for value in hashed) for mask in _HASH_MASKS)
+
+
+def estimate_similarity(signature_a, signature_b):
+    """Estimate Jaccard similarity from two MinHash signatures"""
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / NUM_HASHES
+
+
+def article_text(article):
+    """Text used to compare articles"""
+    return f"{article.get('title') or ''} {article.get('description') or ''}"
+
+
+class _DisjointSet:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # Keep the earliest article as the root (the cluster representative)
+            if root_a < root_b:
+                self.parent[root_b] = root_a
+            else:
+                self.parent[root_a] = root_b
+
+
+class StoryClusterer:
+    """
+    Groups near-duplicate articles (the same wire story from many outlets)
+
+    Candidate pairs come from LSH banding of MinHash signatures, so the cost
+    grows roughly linearly with the number of articles. Signatures are cached
+    per URL so repeat fetches of the same articles don't recompute them.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, cache_size=SIGNATURE_CACHE_SIZE):
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self._signatures = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.signature_hits = 0
+        self.signature_misses = 0
+        self.duplicates_removed = 0
+
+    def signature(self, article):
+        """Get the (cached) MinHash signature of an article"""
+        url = article.get("url")
+        text = article_text(article)
+        with self._lock:
+            cached = self._signatures.get(url) if url else None
+            if cached is not None and cached[0] == text:
+                self._signatures.move_to_end(url)
+                self.signature_hits += 1
+                return cached[1]
+
+        signature = minhash_signature(text)
+        with self._lock:
+            self.signature_misses += 1
+            if url:
+                self._signatures[url] = (text, signature)
+                while len(self._signatures) > self.cache_size:
+                    self._signatures.popitem(last=False)
+        return signature
+
+    def cluster(self, articles):
+        """
+        Group articles into clusters of near-duplicates
+
+        Returns:
+            list: clusters (lists of articles), each in input order
+        """
+        signatures = [self.signature(article) for article in articles]
+        groups = _DisjointSet(len(articles))
+
+        buckets = {}
+        for index, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            for band in range(BANDS):
+                key = (band, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+                bucket = buckets.setdefault(key, [])
+                joined = False
+                for other in bucket:
+                    if groups.find(other) == groups.find(index):
+                        joined = True
+                        break
+                    if estimate_similarity(signature, signatures[other]) >= self.threshold:
+                        groups.union(other, index)
+                        joined = True
+                        break
+                # Articles already in a cluster from this bucket don't need to be compared again
+                if not joined:
+                    bucket.append(index)
+
+        clusters = {}
+        for index, article in enumerate(articles):
+            clusters.setdefault(groups.find(index), []).append(article)
+        return list(clusters.values())
+
+    def dedupe(self, articles):
+        """
+        Keep one representative per cluster of near-duplicate articles
+
+        The first (newest, as NewsAPI sorts) article of each cluster is kept,
+        shallow-copied with duplicate_count and other_sources added.
+        """
+        if len(articles) < 2:
+            return list(articles)
+
+        results = []
+        removed = 0
+        for cluster in self.cluster(articles):
+            representative = cluster[0]
+            if len(cluster) > 1:
+                other_sources = []
+                for article in cluster[1:]:
+                    name = (article.get("source") or {}).get("name")
+                    if name and name not in other_sources:
+                        other_sources.append(name)
+                representative = dict(representative)
+                representative["duplicate_count"] = len(cluster) - 1
+                representative["other_sources"] = other_sources
+                removed += len(cluster) - 1
+            results.append(representative)
+
+        with self._lock:
+            self.duplicates_removed += removed
+        return results
+
+    def stats(self):
+        """Get clustering counters"""
+        with self._lock:
+            return {
+                "cached_signatures": len(self._signatures),
+                "signature_hits": self.signature_hits,
+                "signature_misses": self.signature_misses,
+                "duplicates_removed": self.duplicates_removed
+            }
+
+
+story_clusterer = StoryClusterer()
@@ -0,0 +1,109 @@
+import gzip
+import json
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # standard library json is used instead
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # only gzip is offered
+    brotli = None
+
+# Responses smaller than this are sent uncompressed (not worth the CPU or
+# the extra header bytes)
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "text/")
+
+JSON_ENCODER = os.getenv("JSON_ENCODER", "auto").lower()  # auto, orjson or json
+USE_ORJSON = orjson is not None and JSON_ENCODER in ("auto", "orjson")
+
+
+def dumps(obj):
+    """Serialize to compact JSON bytes (orjson when available)"""
+    if USE_ORJSON:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # types orjson doesn't know, let json have a go
+    return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes responses with orjson"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj) + b"\n", mimetype=self.mimetype)
+
+
+def install_json_provider(app):
+    """Use orjson for the app's JSON responses when it is available"""
+    if USE_ORJSON:
+        app.json = OrjsonProvider(app)
+    return app.json
+
+
+def choose_encoding(accept_encoding):
+    """Pick br or gzip from an Accept-Encoding header value, or None"""
+    offered = {}
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        offered[name.strip()] = quality
+
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def compress(data, encoding):
+    """Compress bytes with the given content coding"""
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def should_compress(content_type, size):
+    """Check whether a response body is worth compressing"""
+    return size >= COMPRESS_MIN_SIZE and (content_type or "").startswith(COMPRESSIBLE_TYPES)
+
+
+def compress_response(response, accept_encoding):
+    """Compress a buffered Flask response in place if the client accepts it"""
+    if (response.direct_passthrough or response.is_streamed or response.status_code < 200
+            or response.status_code in (204, 304) or "Content-Encoding" in response.headers):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None or not should_compress(response.mimetype, len(data)):
+        return response
+
+    # The compressed bytes differ per coding, so a strong validator becomes weak
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+    response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,102 @@
+import threading
+
+REMOVED_MARKER = "[Removed]"
+
+# Declarative article quality rules, applied in this order. Each rule names
+# the article fields it checks.
+DEFAULT_RULES = [
+    {"name": "missing_field", "type": "required", "fields": ["title", "description", "url", "source"]},
+    {"name": "removed", "type": "not_equal", "fields": ["title", "description", "content"], "value": REMOVED_MARKER},
+    {"name": "short_title", "type": "min_length", "fields": ["title"], "value": 11},
+    {"name": "short_description", "type": "min_length", "fields": ["description"], "value": 21},
+]
+RULE_TYPES = ("required", "not_equal", "min_length")
+
+
+def rejection_reason(article, rules):
+    """
+    Name of the first rule an article fails, or None if it passes them all
+
+    Rules are checked in order against the one article, so a list of
+    articles is filtered in a single pass.
+    """
+    if not article:
+        return "empty"
+    get = article.get
+    for rule in rules:
+        kind = rule["type"]
+        if kind == "required":
+            for field in rule["fields"]:
+                if not get(field):
+                    return rule["name"]
+        elif kind == "not_equal":
+            value = rule["value"]
+            for field in rule["fields"]:
+                if get(field) == value:
+                    return rule["name"]
+        elif kind == "min_length":
+            # Missing values are the "required" rule's job, only check present ones
+            value = rule["value"]
+            for field in rule["fields"]:
+                text = get(field)
+                if text and len(text) < value:
+                    return rule["name"]
+        else:
+            raise ValueError(f"Unknown filter rule type: {kind}")
+    return None
+
+
+class ArticleFilter:
+    """Single-pass article quality filter with per-rule rejection counters"""
+
+    def __init__(self, rules=None):
+        self.rules = list(rules or DEFAULT_RULES)
+        for rule in self.rules:
+            if rule["type"] not in RULE_TYPES:
+                raise ValueError(f"Unknown filter rule type: {rule['type']}")
+        self._lock = threading.Lock()
+        self.rejections = {"empty": 0}
+        self.rejections.update({rule["name"]: 0 for rule in self.rules})
+        self.accepted = 0
+
+    def _merge(self, counts, accepted):
+        """Add one batch's counters to the totals"""
+        with self._lock:
+            self.accepted += accepted
+            for reason, count in counts.items():
+                self.rejections[reason] = self.rejections.get(reason, 0) + count
+
+    def iter_valid(self, articles):
+        """Yield articles that pass every rule (lazily, for streaming callers)"""
+        counts = {}
+        accepted = 0
+        try:
+            for article in articles or ():
+                reason = rejection_reason(article, self.rules)
+                if reason is None:
+                    accepted += 1
+                    yield article
+                else:
+                    counts[reason] = counts.get(reason, 0) + 1
+        finally:
+            self._merge(counts, accepted)
+
+    def filter(self, articles):
+        """Get the list of articles that pass every rule"""
+        return list(self.iter_valid(articles))
+
+    def stats(self):
+        """Get accepted and per-rule rejection counts"""
+        with self._lock:
+            return {
+                "accepted": self.accepted,
+                "rejected": dict(self.rejections)
+            }
+
+
+article_filter = ArticleFilter()
+
+
+def iter_valid_articles(articles):
+    """Yield valid articles using the shared filter"""
+    return article_filter.iter_valid(articles)
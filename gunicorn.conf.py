@@ -0,0 +1,36 @@
+"""
+gunicorn settings for FetchPress, all overridable from the environment
+
+    gunicorn -c gunicorn.conf.py "app:create_app()"
+    gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:application
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}")
+
+# Worker processes and threads per worker (threads only apply to gthread)
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(4, multiprocessing.cpu_count() * 2))))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+# Each worker reads this to take its share of the NewsAPI rate limit and quota
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Slow upstream calls are bounded by the NewsAPI read timeout, not by this
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers now and then so memory can't creep up forever
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+
+
+def worker_exit(server, worker):
+    """Stop this worker's background threads on shutdown"""
+    import app
+    app.stop_background_services()
@@ -10,6 +10,18 @@ document.addEventListener("DOMContentLoaded", () => {
   let currentCategory = '';
   let currentQuery = '';
 
+  // Category results prefetched in one /api/news/batch request
+  const PREFETCH_MAX_AGE_MS = 2 * 60 * 1000;
+  let prefetchedCategories = {};
+  let prefetchedAt = 0;
+
+  // Live feed of new articles for the current view (/api/live, ASGI server only)
+  let liveFeed = null;
+
+  // Card images are served resized and cached by /api/thumb (the API rewrites
+  // urlToImage when asked with ?thumb=); high-DPI screens get the 2x width
+  const THUMB_WIDTH = 400;
+
   // Store saved articles in browser storage.
   let savedArticles = JSON.parse(localStorage.getItem('savedArticles')) || [];
 
@@ -250,6 +262,8 @@ document.addEventListener("DOMContentLoaded", () => {
       return;
     }
 
+    stopLiveFeed();
+
     // Update current view state
     currentCategory = 'saved';
     currentQuery = '';
@@ -345,8 +359,91 @@ document.addEventListener("DOMContentLoaded", () => {
     `;
   }
 
+  // Fetch every navbar category in a single request and keep the results
+  async function prefetchCategories() {
+    const categories = Array.from(document.querySelectorAll('.nav-btn'))
+      .map(btn => btn.dataset.category || 'all');
+
+    const response = await fetch(`/api/news/batch?categories=${encodeURIComponent(categories.join(','))}&thumb=${THUMB_WIDTH}`);
+    const data = await response.json();
+
+    if (!data.results) {
+      throw new Error(data.error || 'No results found in batch response');
+    }
+
+    prefetchedCategories = data.results;
+    prefetchedAt = Date.now();
+    console.log('Prefetched categories:', Object.keys(prefetchedCategories));
+  }
+
+  // Get prefetched articles for a category, if still fresh
+  function getPrefetchedArticles(category) {
+    if (Date.now() - prefetchedAt > PREFETCH_MAX_AGE_MS) return null;
+
+    const result = prefetchedCategories[category || 'all'];
+    if (!result || result.error || !result.articles) return null;
+    return result.articles;
+  }
+
+  // Load the home page: prefetch all categories, then show the default one
+  async function loadInitialNews() {
+    showLoadingSpinner();
+    try {
+      await prefetchCategories();
+    } catch (error) {
+      console.error('Error prefetching categories:', error);
+    }
+    getNewsArticles();
+  }
+
+  // Stop listening for live articles
+  function stopLiveFeed() {
+    if (liveFeed) {
+      liveFeed.close();
+      liveFeed = null;
+    }
+  }
+
+  // Listen for new articles on a topic and add them to the top of the grid
+  function followLiveFeed(topic) {
+    stopLiveFeed();
+    if (!window.EventSource) return;
+
+    const feed = new EventSource(`/api/live?topics=${encodeURIComponent(topic)}&thumb=${THUMB_WIDTH}`);
+    feed.addEventListener('articles', (e) => {
+      const data = JSON.parse(e.data);
+      const shownUrls = new Set(Array.from(newsContainer.querySelectorAll('.read-more-btn')).map(a => a.href));
+
+      data.articles
+        .filter(article => !shownUrls.has(article.url))
+        .reverse()
+        .forEach(article => newsContainer.prepend(createArticleCard(article, 0, false)));
+      updateSaveButtonAppearance();
+      console.log(`Live feed: ${data.articles.length} new articles for ${data.topic}`);
+    });
+    feed.onerror = () => {
+      // Not available (e.g. Flask dev server): give up instead of retrying
+      if (feed.readyState === EventSource.CLOSED && liveFeed === feed) {
+        liveFeed = null;
+      }
+    };
+    liveFeed = feed;
+  }
+
   // Fetch news from the API
   async function getNewsArticles(category = '', query = '') {
+    followLiveFeed(query ? `q:${query}` : (category || 'all'));
+
+    // Use prefetched results for plain category views
+    if (!query) {
+      const prefetched = getPrefetchedArticles(category);
+      if (prefetched) {
+        displayNewsArticles(prefetched);
+        hideLoadingSpinner();
+        return;
+      }
+    }
+
     showLoadingSpinner();
 
     try {
@@ -356,30 +453,26 @@ document.addEventListener("DOMContentLoaded", () => {
 
       if (category) urlParams.append('category', category);
       if (query) urlParams.append('q', query);
+      // Category views are plain requests the server answers from its daily
+      // snapshots (cacheable, precompressed); searches are streamed
+      if (query) urlParams.append('stream', 'ndjson');
+      urlParams.append('thumb', THUMB_WIDTH);
 
-      if (urlParams.toString()) {
-        apiUrl += `?${urlParams.toString()}`;
-      }
+      apiUrl += `?${urlParams.toString()}`;
 
       console.log('Fetching news from:', apiUrl);
 
-      // Make the API request
       const response = await fetch(apiUrl);
-      const data = await response.json();
-
-      console.log('API Response:', data);
-
-      // Check for errors in the response
-      if (data.error) {
-        throw new Error(data.error);
-      }
-      if (!data.articles) {
-        throw new Error('No articles found in response');
+      if (query) {
+        // Render cards as they arrive
+        const metadata = await streamNewsArticles(response);
+        console.log('Stream metadata:', metadata);
+      } else {
+        const data = await response.json();
+        if (data.error) throw new Error(data.error);
+        displayNewsArticles(data.articles);
       }
 
-      // Display the articles
-      displayNewsArticles(data.articles);
-
     } catch (error) {
       console.error('Error fetching news:', error);
       showErrorMessage(`Failed to fetch news: ${error.message}`);
@@ -388,6 +481,55 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
 
+  // Read an NDJSON /api/news response, adding a card per article line
+  async function streamNewsArticles(response) {
+    newsContainer.innerHTML = '';
+    let count = 0;
+    let metadata = null;
+
+    const handleLine = (line) => {
+      if (!line.trim()) return;
+      const frame = JSON.parse(line);
+
+      if (frame.type === 'article') {
+        if (count === 0) hideLoadingSpinner();
+        newsContainer.appendChild(createArticleCard(frame.article, count, false));
+        count++;
+      } else if (frame.type === 'error') {
+        throw new Error(frame.error.error || 'Error fetching news');
+      } else if (frame.type === 'metadata') {
+        metadata = frame.metadata;
+      }
+    };
+
+    if (response.body && response.body.getReader) {
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.forEach(handleLine);
+      }
+      handleLine(buffer + decoder.decode());
+    } else {
+      // No streaming support: parse the whole body at once
+      (await response.text()).split('\n').forEach(handleLine);
+    }
+
+    if (count === 0) {
+      displayNewsArticles([]);
+    } else {
+      updateSaveButtonAppearance();
+    }
+    return metadata;
+  }
+
   // Create a single article card element
   function createArticleCard(article, index, isSavedView = false) {
     const card = document.createElement('div');
@@ -454,11 +596,18 @@ document.addEventListener("DOMContentLoaded", () => {
     return card;
   }
 
+  // srcset attribute offering the 2x thumbnail for /api/thumb images
+  function thumbnailSrcset(imageUrl) {
+    if (!imageUrl.startsWith('/api/thumb?')) return '';
+    const retinaUrl = imageUrl.replace(`w=${THUMB_WIDTH}`, `w=${THUMB_WIDTH * 2}`);
+    return `srcset="${imageUrl} 1x, ${retinaUrl} 2x"`;
+  }
+
   // HTML template for regular articles
   function createRegularArticleHTML(imageUrl, title, source, isSaved, description, publishedAt, hasValidUrl, url) {
     return `
       <div class="relative overflow-hidden">
-        <img src="${imageUrl}" alt="${title}" class="w-full h-48 object-cover transition-transform duration-300 hover:scale-105" 
+        <img src="${imageUrl}" ${thumbnailSrcset(imageUrl)} alt="${title}" loading="lazy" decoding="async" class="w-full h-48 object-cover transition-transform duration-300 hover:scale-105" 
              onerror="this.src='data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNDAwIiBoZWlnaHQ9IjIwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KICA8cmVjdCB3aWR0aD0iNDAwIiBoZWlnaHQ9IjIwMCIgZmlsbD0iIzM3NDE1MSIvPgogIDx0ZXh0IHg9IjUwJSIgeT0iNTAlIiBmb250LWZhbWlseT0iQXJpYWwsIHNhbnMtc2VyaWYiIGZvbnQtc2l6ZT0iMThweCIgZmlsbD0iIzYwYTVmYSIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZHk9Ii4zZW0iPkZldGNoUHJlc3MgTmV3czwvdGV4dD4KICA8L3N2Zz4K'"
         <div class="absolute top-2 right-2 bg-blue-600 text-white px-2 py-1 rounded-full text-xs font-semibold shadow-lg">
           ${source}
@@ -492,7 +641,7 @@ document.addEventListener("DOMContentLoaded", () => {
   function createSavedArticleHTML(imageUrl, title, source, savedAt, description, publishedAt, hasValidUrl, url) {
     return `
       <div class="relative overflow-hidden">
-        <img src="${imageUrl}" alt="${title}" class="w-full h-48 object-cover transition-transform duration-300 hover:scale-105" 
+        <img src="${imageUrl}" ${thumbnailSrcset(imageUrl)} alt="${title}" loading="lazy" decoding="async" class="w-full h-48 object-cover transition-transform duration-300 hover:scale-105" 
              onerror="this.src='https://via.placeholder.com/400x200/1e293b/60a5fa?text=FetchPress+News'" />
         <div class="absolute top-2 right-2 bg-blue-600 text-white px-2 py-1 rounded-full text-xs font-semibold shadow-lg">
           ${source}
@@ -627,7 +776,7 @@ document.addEventListener("DOMContentLoaded", () => {
     setupSavedArticlesButton();
 
     // Load initial news
-    getNewsArticles();
+    loadInitialNews();
   }
 
   // Make functions available globally for HTML onclick handlers
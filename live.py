@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+
+def parse_topic(name, categories):
+    """
+    Turn a topic name into fetch arguments
+
+    Topics use the /api/news/batch item names: a category, "all" for the
+    default headlines, or "q:<query>" for a search.
+
+    Returns:
+        dict: fetch kwargs, or None if the topic is invalid
+    """
+    name = (name or "").strip()
+    if name.startswith("q:"):
+        query = " ".join(name[2:].split())
+        return {"q": query} if query else None
+    name = name.lower()
+    if name == "all":
+        return {"category": ""}
+    if name in categories:
+        return {"category": name}
+    return None
+
+
+class Subscription:
+    """One client's queue of events for a set of topics"""
+
+    def __init__(self, topics, queue_size):
+        self.topics = list(topics)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def put(self, event):
+        """Queue an event, dropping the oldest one if the client is too slow"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class TopicBroker:
+    """Polls each subscribed topic once per interval and fans new articles out
+
+    Runs entirely on the event loop: subscribers are queues, not threads, so
+    idle connections cost only memory. Each topic is fetched once per
+    interval no matter how many clients follow it; articles are diffed
+    against the URLs already published for that topic and only new ones are
+    pushed. Topics are dropped when their last subscriber leaves.
+    """
+
+    def __init__(self, fetch, interval=60, queue_size=100, seen_limit=2000, snapshot_size=20, log=None):
+        self.fetch = fetch
+        self.interval = interval
+        self.queue_size = queue_size
+        self.seen_limit = seen_limit
+        self.snapshot_size = snapshot_size
+        self.log = log or (lambda message: None)
+
+        self._topics = {}  # name -> topic state
+        self._task = None
+
+        # Counters
+        self.polls = 0
+        self.poll_failures = 0
+        self.published = 0
+
+    def _new_topic(self, kwargs):
+        return {
+            "kwargs": kwargs,
+            "subscribers": set(),
+            "seen": OrderedDict(),
+            "latest": [],
+            "next_due": 0.0,
+            "last_poll": None
+        }
+
+    def subscribe(self, topics):
+        """
+        Subscribe to topics (name -> fetch kwargs)
+
+        Topics that were already polled send their latest articles right away
+        as a snapshot event.
+        """
+        subscription = Subscription(topics, self.queue_size)
+        for name, kwargs in topics.items():
+            topic = self._topics.get(name)
+            if topic is None:
+                topic = self._topics[name] = self._new_topic(kwargs)
+            topic["subscribers"].add(subscription)
+            if topic["latest"]:
+                subscription.put({"event": "snapshot", "topic": name, "articles": topic["latest"]})
+        self._ensure_running()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription; topics without subscribers stop being polled"""
+        for name in subscription.topics:
+            topic = self._topics.get(name)
+            if topic is None:
+                continue
+            topic["subscribers"].discard(subscription)
+            if not topic["subscribers"]:
+                del self._topics[name]
+
+    def _remember(self, topic, articles):
+        """Mark articles as seen; returns the ones that weren't"""
+        seen = topic["seen"]
+        new_articles = []
+        for article in articles:
+            url = article.get("url")
+            if not url or url in seen:
+                continue
+            seen[url] = True
+            new_articles.append(article)
+        while len(seen) > self.seen_limit:
+            seen.popitem(last=False)
+        return new_articles
+
+    async def poll_topic(self, name):
+        """Fetch one topic and publish its new articles"""
+        topic = self._topics.get(name)
+        if topic is None:
+            return
+        self.polls += 1
+        try:
+            result = await self.fetch(**topic["kwargs"])
+        except Exception as e:
+            self.poll_failures += 1
+            self.log(f"Live poll of '{name}' failed: {str(e)}")
+            return
+        topic["last_poll"] = datetime.now().isoformat()
+        if result.get("error"):
+            self.poll_failures += 1
+            self.log(f"Live poll of '{name}' failed: {result.get('error')}")
+            return
+
+        articles = result.get("articles", [])
+        first_poll = not topic["seen"]
+        new_articles = self._remember(topic, articles)
+        topic["latest"] = articles[:self.snapshot_size]
+        if not new_articles:
+            return
+
+        event = {
+            "event": "snapshot" if first_poll else "articles",
+            "topic": name,
+            "articles": topic["latest"] if first_poll else new_articles
+        }
+        # The topic may have lost subscribers while the fetch was running
+        for subscription in list(topic["subscribers"]):
+            subscription.put(event)
+        self.published += len(new_articles)
+
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+            due = [name for name, topic in self._topics.items() if topic["next_due"] <= now]
+            for name in due:
+                self._topics[name]["next_due"] = now + self.interval
+            if due:
+                await asyncio.gather(*(self.poll_topic(name) for name in due))
+            await asyncio.sleep(1)
+
+    def _ensure_running(self):
+        """Start the polling task on the running event loop if needed"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            self.log(f"Live feed broker started (polling every {self.interval}s)")
+
+    async def stop(self):
+        """Stop polling"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        """Get topic and subscriber counts"""
+        subscriptions = set()
+        topics = {}
+        for name, topic in self._topics.items():
+            subscriptions.update(topic["subscribers"])
+            topics[name] = {
+                "subscribers": len(topic["subscribers"]),
+                "seen": len(topic["seen"]),
+                "last_poll": topic["last_poll"]
+            }
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval": self.interval,
+            "subscribers": len(subscriptions),
+            "polls": self.polls,
+            "poll_failures": self.poll_failures,
+            "published": self.published,
+            "dropped": sum(subscription.dropped for subscription in subscriptions),
+            "topics": topics
+        }
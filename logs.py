@@ -0,0 +1,71 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = "[%(name)s %(asctime)s] %(levelname)s %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+ROOT_LOGGER = "fetchpress"
+
+_listener = None
+
+
+def get_log_level():
+    """LOG_LEVEL if set; otherwise DEBUG_MODE turns on debug output (read after .env is loaded)"""
+    if os.getenv("LOG_LEVEL"):
+        return os.getenv("LOG_LEVEL").upper()
+    return "DEBUG" if os.getenv("DEBUG_MODE", "false").lower() in ("1", "true", "yes") else "INFO"
+
+
+def start_logging():
+    """
+    Send fetchpress log records through a queue to a background writer thread
+
+    Request handlers only put records on the queue, so a slow or blocked
+    stdout never holds up a request.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(get_log_level())
+    root.propagate = False
+    root.handlers = [QueueHandler(log_queue)]
+
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+
+
+def stop_logging():
+    """Write out queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def restart_logging():
+    """Start a fresh writer thread in a forked child (threads don't survive fork)"""
+    global _listener
+    if _listener is not None:
+        _listener = None
+        start_logging()
+
+
+def get_logger(name):
+    """Get a logger below the fetchpress logger (e.g. "fetchpress.news-api")"""
+    start_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=restart_logging)
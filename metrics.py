@@ -0,0 +1,153 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Latency buckets: 2 per doubling (about 41% apart) from 0.1 ms to ~52 s, so
+# the relative error is the same for fast cache hits and slow upstream calls
+HISTOGRAM_LOWEST = 0.0001
+HISTOGRAM_BUCKETS_PER_DOUBLING = 2
+HISTOGRAM_BUCKET_COUNT = 39
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_registry = []
+
+
+def format_value(value):
+    """Format a sample value the way Prometheus prints it"""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_labels(labelnames, labelvalues, extra=""):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values"""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labelvalues, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{format_labels(self.labelnames, labelvalues)} {format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """Value read from a callback when metrics are rendered"""
+
+    def __init__(self, name, help_text, read):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+        _registry.append(self)
+
+    def render(self):
+        try:
+            value = self.read()
+        except Exception:
+            return []  # e.g. the cache backend is unreachable
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge",
+                f"{self.name} {format_value(value)}"]
+
+
+class Histogram:
+    """
+    Latency histogram with log-linear buckets (HDR histogram style)
+
+    Recording is a binary search plus a counter increment. Bucket bounds
+    grow geometrically, so every bucket has the same relative width and
+    quantiles are accurate to about half a bucket at any scale.
+    """
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.bounds = [HISTOGRAM_LOWEST * 2 ** (i / HISTOGRAM_BUCKETS_PER_DOUBLING)
+                       for i in range(HISTOGRAM_BUCKET_COUNT)]
+        self._series = {}  # label values -> [bucket counts (last = overflow), sum, count]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, seconds, *labelvalues):
+        index = bisect_left(self.bounds, seconds)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.bounds) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series_items = sorted((labelvalues, (list(counts), total, count))
+                                  for labelvalues, (counts, total, count) in self._series.items())
+        for labelvalues, (counts, total, count) in series_items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.bounds + [float("inf")], counts):
+                cumulative += bucket_count
+                le = 'le="' + format_value(bound if bound == float("inf") else float(f"{bound:.6g}")) + '"'
+                lines.append(f"{self.name}_bucket{format_labels(self.labelnames, labelvalues, le)} {cumulative}")
+            labels = format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render_metrics():
+    """All registered metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+# Metrics
+stage_seconds = Histogram(
+    "fetchpress_stage_seconds",
+    "Time spent in each stage of serving news (validate, upstream, json_decode, filter, dedupe, rank, serialize, compress)",
+    ["stage"]
+)
+request_seconds = Histogram("fetchpress_http_request_seconds", "Time to produce an HTTP response", ["route"])
+news_results = Counter("fetchpress_news_results_total", "News results by status and cache outcome",
+                       ["status", "cache"])
+
+
+@contextmanager
+def timed(stage):
+    """Record the time spent in the with-block under the given stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(time.perf_counter() - started, stage)
+
+
+def count_result(result):
+    """Count a news result by status and cache outcome; returns it unchanged"""
+    news_results.inc(result.get("status", "unknown"), (result.get("metadata") or {}).get("cache") or "none")
+    return result
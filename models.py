@@ -0,0 +1,149 @@
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+
+# Content at least this long (characters) is kept zlib-compressed and only
+# decompressed when the article is turned back into a dict. NewsAPI
+# truncates content to about 200 characters, so usually it stays a str.
+CONTENT_COMPRESS_MIN = 512
+
+PUBLISHED_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+ARTICLE_KEYS = frozenset(("source", "author", "title", "description", "url", "urlToImage", "publishedAt", "content"))
+
+
+def intern_text(value):
+    """Intern short repeated strings (source names, authors) so articles share them"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def parse_published(value):
+    """Parse a NewsAPI publishedAt string to epoch seconds (None if it isn't one)"""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def format_published(epoch):
+    """Format epoch seconds the way NewsAPI does (2024-01-31T12:00:00Z)"""
+    return time.strftime(PUBLISHED_FORMAT, time.gmtime(epoch))
+
+
+class Article:
+    """
+    Compact in-memory form of a NewsAPI article
+
+    Source names and authors are interned, publishedAt is an epoch int (the
+    original string is only kept if it wouldn't format back identically),
+    long content is stored compressed, and keys outside the NewsAPI article
+    shape (e.g. dedupe's duplicate_count) go in a small dict. to_dict()
+    rebuilds the original JSON shape.
+    """
+
+    __slots__ = ("source_id", "source_name", "author", "title", "description", "url", "image_url",
+                 "published", "_published_raw", "_content", "extra")
+
+    def __init__(self, source_id=None, source_name=None, author=None, title=None, description=None, url=None,
+                 image_url=None, published=None, published_raw=None, content=None, extra=None):
+        self.source_id = intern_text(source_id)
+        self.source_name = intern_text(source_name)
+        self.author = intern_text(author)
+        self.title = title
+        self.description = description
+        self.url = url
+        self.image_url = image_url
+        self.published = published
+        self._published_raw = published_raw
+        self.content = content
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, article):
+        """Build an Article from a NewsAPI article dict"""
+        source = article.get("source")
+        extra = {key: value for key, value in article.items() if key not in ARTICLE_KEYS}
+        if not isinstance(source, dict) or not source.keys() <= {"id", "name"}:
+            extra["source"] = source  # not the usual {id, name}: kept as is
+            source = source if isinstance(source, dict) else {}
+
+        published_raw = article.get("publishedAt")
+        published = parse_published(published_raw)
+        if published is not None and format_published(published) == published_raw:
+            published_raw = None  # rebuilt from the epoch on demand
+
+        return cls(source.get("id"), source.get("name"), article.get("author"), article.get("title"),
+                   article.get("description"), article.get("url"), article.get("urlToImage"), published,
+                   published_raw, article.get("content"), extra or None)
+
+    @property
+    def content(self):
+        """Article content (decompressed on access if stored compressed)"""
+        if isinstance(self._content, bytes):
+            return zlib.decompress(self._content).decode("utf-8")
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        if isinstance(value, str) and len(value) >= CONTENT_COMPRESS_MIN:
+            value = zlib.compress(value.encode("utf-8"))
+        self._content = value
+
+    @property
+    def published_at(self):
+        """publishedAt as NewsAPI sent it"""
+        if self._published_raw is not None or self.published is None:
+            return self._published_raw
+        return format_published(self.published)
+
+    def to_dict(self):
+        """The article in NewsAPI's JSON shape"""
+        article = {
+            "source": {"id": self.source_id, "name": self.source_name},
+            "author": self.author,
+            "title": self.title,
+            "description": self.description,
+            "url": self.url,
+            "urlToImage": self.image_url,
+            "publishedAt": self.published_at,
+            "content": self.content
+        }
+        if self.extra:
+            article.update(self.extra)
+        return article
+
+
+def compact_articles(articles):
+    """Convert article dicts to a tuple of Articles"""
+    return tuple(Article.from_dict(article) if isinstance(article, dict) else article for article in articles)
+
+
+def expand_articles(articles):
+    """Convert Articles back to a list of article dicts"""
+    return [article.to_dict() if isinstance(article, Article) else article for article in articles]
+
+
+def compact_response(result):
+    """Shallow copy of a news response with its articles stored as Articles"""
+    articles = result.get("articles") if isinstance(result, dict) else None
+    if not articles or not isinstance(articles, list):
+        return result
+    compact = dict(result)
+    compact["articles"] = compact_articles(articles)
+    return compact
+
+
+def expand_response(result):
+    """Reverse compact_response (a new dict and article dicts on every call)"""
+    articles = result.get("articles") if isinstance(result, dict) else None
+    if not isinstance(articles, tuple):
+        return result
+    expanded = dict(result)
+    expanded["articles"] = expand_articles(articles)
+    return expanded
@@ -3,17 +3,139 @@ import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import time
+import threading
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from cache import create_cache, ResponseCache, SingleFlight, AsyncSingleFlight
+from ratelimit import UpstreamLimiter, parse_retry_after
+from store import ArticleStore
+from filters import article_filter
+from dedupe import story_clusterer
+from circuit import CircuitBreaker, backoff_delay
+from logs import get_logger
+from metrics import Gauge, timed, count_result
+
+try:
+    import httpx
+except ImportError:  # async engine falls back to running requests in threads
+    httpx = None
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = get_logger("news-api")
+
 # Configuration
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
-BASE_URL = "https://newsapi.org/v2"
+BASE_URL = os.getenv("NEWS_API_BASE_URL", "https://newsapi.org/v2")
 DEFAULT_TIMEOUT = 15
 DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+DEFAULT_MAX_PAGES = int(os.getenv("NEWS_MAX_PAGES", "5"))
 MAX_RETRIES = 2
-RETRY_DELAY = 1
+RETRY_DELAY = 1              # base of the exponential backoff between retries
+RETRY_MAX_DELAY = float(os.getenv("NEWS_API_RETRY_MAX_DELAY", "8"))
+
+# Circuit breaker around upstream calls: opens when this share of the calls
+# in the window failed (or were slower than the slow-call threshold)
+CIRCUIT_FAILURE_RATE = float(os.getenv("NEWS_CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_MIN_CALLS = int(os.getenv("NEWS_CIRCUIT_MIN_CALLS", "5"))
+CIRCUIT_WINDOW = int(os.getenv("NEWS_CIRCUIT_WINDOW", "60"))
+CIRCUIT_SLOW_CALL = float(os.getenv("NEWS_CIRCUIT_SLOW_CALL", "5"))
+CIRCUIT_OPEN_SECONDS = int(os.getenv("NEWS_CIRCUIT_OPEN_SECONDS", "30"))
+
+# HTTP connection pool configuration
+CONNECT_TIMEOUT = float(os.getenv("NEWS_API_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("NEWS_API_READ_TIMEOUT", str(DEFAULT_TIMEOUT)))
+POOL_CONNECTIONS = int(os.getenv("NEWS_API_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("NEWS_API_POOL_MAXSIZE", "20"))
+ASYNC_MAX_CONNECTIONS = int(os.getenv("NEWS_API_ASYNC_MAX_CONNECTIONS", "200"))
+
+# Upstream budget (NewsAPI developer plan allows 100 requests per day)
+RATE_LIMIT_PER_MINUTE = int(os.getenv("NEWS_API_RATE_PER_MINUTE", "30"))
+RATE_LIMIT_BURST = int(os.getenv("NEWS_API_RATE_BURST", "10"))
+DAILY_QUOTA = int(os.getenv("NEWS_API_DAILY_QUOTA", "100"))  # 0 = unlimited
+# Share of the daily quota background prefetch may use; the rest is kept for users
+PREFETCH_QUOTA_SHARE = float(os.getenv("NEWS_API_PREFETCH_SHARE", "0.5"))
+BACKGROUND_QUOTA = int(DAILY_QUOTA * min(1.0, max(0.0, PREFETCH_QUOTA_SHARE)))
+# Server worker processes (set by gunicorn.conf.py); each gets an equal share
+# of the user budget so all workers together stay within it. The background
+# budget is split the same way until one worker takes over prefetching and
+# claims all of it (see app.start_background_services).
+WORKER_COUNT = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+RATE_LIMIT_DEFAULT_PAUSE = 60  # seconds to pause after a 429 without Retry-After
+
+# Collapse near-duplicate (syndicated) stories into one article per story
+DEDUPE_ENABLED = os.getenv("NEWS_DEDUPE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Article store configuration
+STORE_ENABLED = os.getenv("NEWS_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+STORE_PATH = os.getenv("NEWS_STORE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "articles.db"))
+
+# Response cache configuration
+CACHE_MAX_ENTRIES = int(os.getenv("NEWS_CACHE_MAX_ENTRIES", "256"))
+CACHE_MAX_BYTES = int(os.getenv("NEWS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CACHE_STALE_TTL = int(os.getenv("NEWS_CACHE_STALE_TTL", "3600"))  # how long expired entries may be served while refreshing
+# Hold cached articles as compact Article objects (models.py) in the memory backend
+CACHE_COMPACT = os.getenv("NEWS_CACHE_COMPACT", "true").lower() in ("1", "true", "yes")
+# "memory" (per process) or "redis" (shared by all workers and hosts)
+CACHE_BACKEND = os.getenv("NEWS_CACHE_BACKEND", "memory").lower()
+CACHE_REDIS_URL = os.getenv("NEWS_CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_LOCK_TIMEOUT = 30      # seconds a worker may hold a key's refresh lock
+CACHE_LOCK_WAIT = 5          # seconds other workers wait for that refresh
+CACHE_LOCK_POLL = 0.05
+CACHE_TTLS = {
+    "top-headlines": 120,          # headlines change quickly
+    "everything": 600,             # rolling searches (date range includes today)
+    "everything-historical": 86400  # date ranges that ended before today
+}
+
+try:
+    response_cache = create_cache(CACHE_BACKEND, CACHE_REDIS_URL, max_entries=CACHE_MAX_ENTRIES,
+                                  max_bytes=CACHE_MAX_BYTES, stale_ttl=CACHE_STALE_TTL, compact=CACHE_COMPACT)
+except (RuntimeError, ValueError) as e:
+    logger.warning(f"{str(e)}; using the in-process cache")
+    response_cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES,
+                                   stale_ttl=CACHE_STALE_TTL, compact=CACHE_COMPACT)
+news_flight = SingleFlight()
+async_news_flight = AsyncSingleFlight()
+
+article_store = ArticleStore(STORE_PATH) if STORE_ENABLED else None
+
+upstream_limiter = UpstreamLimiter(rate_per_minute=max(1, RATE_LIMIT_PER_MINUTE // WORKER_COUNT),
+                                   burst=max(1, RATE_LIMIT_BURST // WORKER_COUNT),
+                                   daily_quota=max(1, (DAILY_QUOTA - BACKGROUND_QUOTA) // WORKER_COUNT)
+                                   if DAILY_QUOTA else 0,
+                                   background_quota=BACKGROUND_QUOTA // WORKER_COUNT)
+
+upstream_circuit = CircuitBreaker(failure_rate=CIRCUIT_FAILURE_RATE, min_calls=CIRCUIT_MIN_CALLS,
+                                  window=CIRCUIT_WINDOW, slow_call_seconds=CIRCUIT_SLOW_CALL,
+                                  open_seconds=CIRCUIT_OPEN_SECONDS,
+                                  probe_timeout=CONNECT_TIMEOUT + READ_TIMEOUT + 1)
+
+Gauge("fetchpress_circuit_open", "1 while the NewsAPI circuit breaker is open",
+      lambda: int(upstream_circuit.state == "open"))
+
+# Background refreshes for stale cache entries
+revalidate_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="news-revalidate")
+_revalidating = set()
+_prefetched_keys = set()  # cache keys the prefetch scheduler refreshes (see set_prefetched_queries)
+_revalidating_lock = threading.Lock()
+
+
+# Exceptions mapped to error statuses (checked in this order)
+TIMEOUT_ERRORS = (requests.exceptions.Timeout,)
+CONNECTION_ERRORS = (requests.exceptions.ConnectionError,)
+NETWORK_ERRORS = (requests.exceptions.RequestException,)
+
+# Error statuses caused by NewsAPI being unreachable or failing, which are
+# answered with the last good (stale) result when there is one
+UPSTREAM_FAILURE_STATUSES = ("timeout", "connection_error", "network_error", "upstream_unavailable")
+if httpx is not None:
+    TIMEOUT_ERRORS += (httpx.TimeoutException,)
+    CONNECTION_ERRORS += (httpx.NetworkError,)
+    NETWORK_ERRORS += (httpx.HTTPError,)
 
 POLITICS_KEYWORDS = [
     "politics", "government", "election", "congress", "senate", 
@@ -21,10 +143,39 @@ POLITICS_KEYWORDS = [
     "Senate", "election", "government", "policy", "vote"
 ]
 
+_session = None
+_session_lock = threading.Lock()
+_async_client = None
+_async_client_loop = None
+
+def get_session():
+    """Get the shared keep-alive HTTP session used for NewsAPI requests"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    pool_block=False
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "Accept-Encoding": "gzip",
+                    "User-Agent": "FetchPress/1.1.0"
+                })
+                _session = session
+    return _session
+
 def log_debug(message):
-    """Simple debug logging with timestamp"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[NEWS-API {timestamp}] {message}")
+    """Debug logging (shown with LOG_LEVEL=DEBUG, written by the background log thread)"""
+    logger.debug(message)
+
+def log_warning(message):
+    """Log failures and fallbacks that should show at the default log level"""
+    logger.warning(message)
 
 def validate_date_format(date_string):
     """Check if date string is in correct format (YYYY-MM-DD)"""
@@ -53,264 +204,884 @@ def should_use_everything_endpoint(category, query, from_date, to_date):
     )
 
 def build_politics_query():
-    """Build optimized search query for politics news"""
-    return " OR ".join(POLITICS_KEYWORDS)
+    """Build optimized search query for politics news (each keyword once; NewsAPI ignores case)"""
+    keywords = {}
+    for keyword in POLITICS_KEYWORDS:
+        keywords.setdefault(keyword.lower(), keyword)
+    return " OR ".join(keywords.values())
+
+def get_cache_ttl(endpoint, to_date=None):
+    """Get cache TTL in seconds for an endpoint and date range"""
+    if endpoint == "everything" and to_date and to_date < datetime.now().strftime("%Y-%m-%d"):
+        return CACHE_TTLS["everything-historical"]
+    return CACHE_TTLS.get(endpoint, CACHE_TTLS["top-headlines"])
+
+def build_cache_key(endpoint, category, q, language, from_date, to_date, page_size, page=1):
+    """Build a normalized cache key for a NewsAPI request"""
+    return (
+        endpoint,
+        (category or "").strip().lower(),
+        " ".join((q or "").split()).lower(),
+        (language or "").strip().lower(),
+        from_date or "",
+        to_date or "",
+        int(page_size),
+        int(page)
+    )
+
+def copy_response(data, **metadata):
+    """Copy a shared response so callers can modify it safely"""
+    result = dict(data)
+    if "metadata" in data or metadata:
+        result["metadata"] = dict(data.get("metadata", {}), **metadata)
+    return result
 
 def filter_valid_articles(articles):
-    """Remove articles with missing or removed content"""
-    if not articles:
-        return []
-    
-    valid_articles = []
-    for article in articles:
-        # Check if article has required fields and isn't removed
-        if (article and 
-            article.get('title') and 
-            article.get('title') != '[Removed]' and
-            article.get('description') and 
-            article.get('description') != '[Removed]' and
-            article.get('url') and
-            article.get('source')):
-            
-            # Additional quality checks
-            title_length = len(article.get('title', ''))
-            desc_length = len(article.get('description', ''))
-            
-            # Skip articles with very short titles or descriptions
-            if title_length > 10 and desc_length > 20:
-                valid_articles.append(article)
-    
-    return valid_articles
+    """Remove articles with missing or removed content (single pass, see filters.py)"""
+    return article_filter.filter(articles)
 
-def make_api_request(url, params, retries=0):
-    """Make API request with retry logic"""
-    try:
-        log_debug(f"Making request to: {url}")
-        log_debug(f"Parameters: {params}")
-        
-        response = requests.get(url, params=params, timeout=DEFAULT_TIMEOUT)
-        return response
-        
-    except requests.exceptions.Timeout:
-        if retries < MAX_RETRIES:
-            log_debug(f"Request timeout, retrying in {RETRY_DELAY}s... (attempt {retries + 1})")
-            time.sleep(RETRY_DELAY)
-            return make_api_request(url, params, retries + 1)
-        raise
-        
-    except requests.exceptions.ConnectionError:
-        if retries < MAX_RETRIES:
-            log_debug(f"Connection error, retrying in {RETRY_DELAY}s... (attempt {retries + 1})")
-            time.sleep(RETRY_DELAY)
-            return make_api_request(url, params, retries + 1)
-        raise
-
-def fetch_news(category="", q="", language="en", from_date=None, to_date=None, page_size=None):
+def record_upstream_call(started, failed):
+    """Report an upstream call's outcome to the circuit breaker"""
+    if upstream_circuit.record(failed, time.perf_counter() - started):
+        log_warning(f" Circuit opened, failing fast for {CIRCUIT_OPEN_SECONDS}s")
+
+def get_retry_delay(retries):
+    """Delay before retry number retries+1, or None when we shouldn't retry"""
+    if retries >= MAX_RETRIES or not upstream_circuit.allows_retry():
+        return None
+    return backoff_delay(retries, RETRY_DELAY, RETRY_MAX_DELAY)
+
+def make_api_request(url, params):
+    """Make API request with retry logic (exponential backoff with jitter)"""
+    retries = 0
+    while True:
+        started = time.perf_counter()
+        failed = True  # until a response arrives: any exception counts as a failed call
+        try:
+            log_debug(f"Making request to: {url}")
+            log_debug(f"Parameters: {params}")
+
+            response = get_session().get(url, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+            failed = response.status_code >= 500
+            return response
+
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            error = e
+        finally:
+            record_upstream_call(started, failed)
+
+        delay = get_retry_delay(retries)
+        if delay is None:
+            raise error
+        retries += 1
+        log_debug(f"{type(error).__name__}, retrying in {delay:.2f}s... (attempt {retries})")
+        time.sleep(delay)
+
+def get_async_client():
+    """Get the shared async HTTP client for the running event loop"""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=POOL_MAXSIZE
+            ),
+            headers={
+                "Accept-Encoding": "gzip",
+                "User-Agent": "FetchPress/1.1.0"
+            }
+        )
+        _async_client_loop = loop
+    return _async_client
+
+async def close_async_client():
+    """Close the shared async HTTP client (call on server shutdown)"""
+    global _async_client, _async_client_loop
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+        _async_client_loop = None
+
+async def async_make_api_request(url, params):
+    """Make API request on the shared async client with retry logic"""
+    if httpx is None:
+        # No async client installed, run the blocking request in a thread
+        return await asyncio.to_thread(make_api_request, url, params)
+
+    client = get_async_client()
+    retries = 0
+    while True:
+        started = time.perf_counter()
+        failed = True  # until a response arrives: any exception counts as a failed call
+        try:
+            log_debug(f"Making async request to: {url}")
+            response = await client.get(url, params=params)
+            failed = response.status_code >= 500
+            return response
+
+        except (httpx.TimeoutException, httpx.NetworkError) as e:
+            error = e
+        except asyncio.CancelledError:
+            failed = None  # the client went away, which says nothing about NewsAPI
+            upstream_circuit.release_probe()
+            raise
+        finally:
+            if failed is not None:
+                record_upstream_call(started, failed)
+
+        delay = get_retry_delay(retries)
+        if delay is None:
+            raise error
+        retries += 1
+        log_debug(f"{type(error).__name__}, retrying in {delay:.2f}s... (attempt {retries})")
+        await asyncio.sleep(delay)
+
+def prepare_news_request(category="", q="", language="en", from_date=None, to_date=None, page_size=None, page=1):
     """
-    Fetch news articles from NewsAPI
-    
-    Args:
-        category (str): News category (business, entertainment, etc.)
-        q (str): Search query/keywords
-        language (str): Language code (en, es, fr, etc.)
-        from_date (str): Start date in YYYY-MM-DD format
-        to_date (str): End date in YYYY-MM-DD format
-        page_size (int): Number of articles to fetch (max 100)
-    
+    Validate parameters and build the NewsAPI request for them
+
     Returns:
-        dict: API response with articles and metadata
+        tuple: (news_request, error) - news_request is a dict with url, params,
+        endpoint and cache_key; error is a response dict when validation failed
     """
     
     # Check if API key is configured
     if not NEWS_API_KEY:
-        log_debug(" NEWS_API_KEY not configured")
-        return {
+        log_warning(" NEWS_API_KEY not configured")
+        return None, {
             "error": "News API key not configured. Please add NEWS_API_KEY to your .env file", 
             "articles": [],
             "status": "configuration_error",
             "help": "Get your free API key from https://newsapi.org/"
         }
     
-    try:
-        # Set default page size
-        if not page_size:
-            page_size = DEFAULT_PAGE_SIZE
-        
-        # Validate page size
-        page_size = min(max(1, page_size), 100)  # Ensure between 1-100
+    # Set default page size
+    if not page_size:
+        page_size = DEFAULT_PAGE_SIZE
+    
+    # Validate page size
+    page_size = min(max(1, page_size), 100)  # Ensure between 1-100
+    page = max(1, int(page or 1))
+    
+    # Validate date formats if provided
+    if from_date and not validate_date_format(from_date):
+        log_debug(f"Invalid from_date format: {from_date}")
+        return None, {
+            "error": "Invalid date format. Use YYYY-MM-DD format",
+            "articles": [],
+            "status": "validation_error"
+        }
         
-        # Validate date formats if provided
-        if from_date and not validate_date_format(from_date):
-            log_debug(f"Invalid from_date format: {from_date}")
-            return {
-                "error": "Invalid date format. Use YYYY-MM-DD format",
-                "articles": [],
-                "status": "validation_error"
-            }
-            
-        if to_date and not validate_date_format(to_date):
-            log_debug(f"Invalid to_date format: {to_date}")
-            return {
-                "error": "Invalid date format. Use YYYY-MM-DD format",
-                "articles": [],
-                "status": "validation_error"
-            }
+    if to_date and not validate_date_format(to_date):
+        log_debug(f"Invalid to_date format: {to_date}")
+        return None, {
+            "error": "Invalid date format. Use YYYY-MM-DD format",
+            "articles": [],
+            "status": "validation_error"
+        }
+    
+    # Determine which endpoint to use
+    use_everything = should_use_everything_endpoint(category, q, from_date, to_date)
+    
+    if use_everything:
+        # Use /everything endpoint for more flexible searches
+        url = f"{BASE_URL}/everything"
+        params = {
+            "apiKey": NEWS_API_KEY,
+            "language": language,
+            "pageSize": page_size,
+            "sortBy": "publishedAt"
+        }
         
-        # Determine which endpoint to use
-        use_everything = should_use_everything_endpoint(category, q, from_date, to_date)
+        # Build search query
+        if category == "politics":
+            params["q"] = build_politics_query()
+            log_debug("Using politics-specific search query")
+        elif q:
+            params["q"] = q
+            log_debug(f"Using custom search query: {q}")
+        else:
+            params["q"] = "latest news"
+            log_debug("Using default search query")
         
-        if use_everything:
-            # Use /everything endpoint for more flexible searches
-            url = f"{BASE_URL}/everything"
-            params = {
-                "apiKey": NEWS_API_KEY,
-                "language": language,
-                "pageSize": page_size,
-                "sortBy": "publishedAt"
-            }
-            
-            # Build search query
-            if category == "politics":
-                params["q"] = build_politics_query()
-                log_debug("Using politics-specific search query")
-            elif q:
-                params["q"] = q
-                log_debug(f"Using custom search query: {q}")
-            else:
-                params["q"] = "latest news"
-                log_debug("Using default search query")
-            
-            # Handle date range
-            if from_date and to_date:
-                params["from"] = from_date
-                params["to"] = to_date
-                log_debug(f"Using custom date range: {from_date} to {to_date}")
-            else:
-                # Use default date range for fresher content
-                default_from, default_to = get_default_date_range()
-                params["from"] = default_from
-                params["to"] = default_to
-                log_debug(f"Using default date range: {default_from} to {default_to}")
-                
+        # Handle date range
+        if from_date and to_date:
+            params["from"] = from_date
+            params["to"] = to_date
+            log_debug(f"Using custom date range: {from_date} to {to_date}")
         else:
-            # Use /top-headlines for standard categories
-            url = f"{BASE_URL}/top-headlines"
-            params = {
-                "apiKey": NEWS_API_KEY,
-                "language": language,
-                "pageSize": page_size,
-                "country": "us"  # Default to US news
-            }
+            # Use default date range for fresher content
+            default_from, default_to = get_default_date_range()
+            params["from"] = default_from
+            params["to"] = default_to
+            log_debug(f"Using default date range: {default_from} to {default_to}")
             
-            if category:
-                params["category"] = category
-                log_debug(f"Using category: {category}")
-            
-            if q:
-                params["q"] = q
-                # Remove country restriction when using search query
-                params.pop("country", None)
-                log_debug(f"Using search query: {q} (removed country filter)")
-
-        # Clean parameters (remove empty values)
-        params = {k: v for k, v in params.items() if v is not None and v != ""}
-        
-        # Make API request
-        response = make_api_request(url, params)
+    else:
+        # Use /top-headlines for standard categories
+        url = f"{BASE_URL}/top-headlines"
+        params = {
+            "apiKey": NEWS_API_KEY,
+            "language": language,
+            "pageSize": page_size,
+            "country": "us"  # Default to US news
+        }
         
-        log_debug(f"Response status: {response.status_code}")
+        if category:
+            params["category"] = category
+            log_debug(f"Using category: {category}")
         
-        # Handle successful response
-        if response.status_code == 200:
+        if q:
+            params["q"] = q
+            # Remove country restriction when using search query
+            params.pop("country", None)
+            log_debug(f"Using search query: {q} (removed country filter)")
+
+    if page > 1:
+        params["page"] = page
+
+    # Clean parameters (remove empty values)
+    params = {k: v for k, v in params.items() if v is not None and v != ""}
+    
+    endpoint = "everything" if use_everything else "top-headlines"
+    cache_key = build_cache_key(endpoint, category, params.get("q"), language,
+                                params.get("from"), params.get("to"), page_size, page)
+    
+    # Explicit date ranges that ended before today won't change any more
+    closed_window = None
+    if from_date and to_date and to_date < datetime.now().strftime("%Y-%m-%d"):
+        closed_window = (from_date, to_date)
+    
+    return {
+        "url": url,
+        "params": params,
+        "endpoint": endpoint,
+        "category": category,
+        "language": language,
+        "page_size": page_size,
+        "page": page,
+        "cache_key": cache_key,
+        "scope": "|".join(cache_key[:4]),  # endpoint|category|q|language
+        "window": closed_window
+    }, None
+
+def get_cached_news(news_request):
+    """Get a cached response for a prepared request, or None
+
+    Expired entries still inside the stale window are returned marked as
+    stale, and a refresh is started in the background.
+    """
+    cached = response_cache.get(news_request["cache_key"])
+    if cached is not None:
+        log_debug(f"Cache hit for {news_request['endpoint']} ({len(cached.get('articles', []))} articles)")
+        return copy_response(cached, cache="hit",
+                             expires_in=int(response_cache.ttl_remaining(news_request["cache_key"])))
+
+    stale = response_cache.get_stale(news_request["cache_key"])
+    if stale is not None:
+        log_debug(f"Serving stale {news_request['endpoint']} response while revalidating")
+        revalidate_in_background(news_request)
+        return copy_response(stale, cache="stale", expires_in=0)
+    return None
+
+def set_prefetched_queries(queries):
+    """
+    Register the fetch_news kwargs the prefetch scheduler keeps warm in this cache
+
+    Stale entries for these are left to the scheduler instead of being
+    revalidated on request.
+    """
+    keys = set()
+    for kwargs in queries:
+        news_request, error = prepare_news_request(**kwargs)
+        if not error:
+            keys.add(news_request["cache_key"])
+    with _revalidating_lock:
+        _prefetched_keys.clear()
+        _prefetched_keys.update(keys)
+
+def revalidate_in_background(news_request):
+    """
+    Refresh a cache entry without making the caller wait
+
+    Refreshes count against the background share of the daily quota and are
+    skipped once it is used up, or when the prefetch scheduler owns the key.
+    """
+    cache_key = news_request["cache_key"]
+    with _revalidating_lock:
+        if cache_key in _revalidating or cache_key in _prefetched_keys:
+            return
+        if not upstream_limiter.background_available():
+            return
+        _revalidating.add(cache_key)
+    news_request = dict(news_request, background=True)
+
+    def refresh():
+        try:
+            news_flight.do(cache_key, lambda: request_news(news_request))
+        except Exception as e:
+            log_warning(f" Background refresh failed: {str(e)}")
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(cache_key)
+
+    revalidate_executor.submit(refresh)
+
+def build_news_result(news_request, articles, raw_count, cache="miss"):
+    """Build the successful response dict for a prepared request"""
+    category = news_request["category"]
+    return {
+        "status": "ok",
+        "totalResults": len(articles),
+        "articles": articles,
+        "metadata": {
+            "source_endpoint": news_request["endpoint"],
+            "raw_count": raw_count,
+            "filtered_count": len(articles),
+            "language": news_request["language"],
+            "category": category if category else "all",
+            "fetch_time": datetime.now().isoformat(),
+            "cache": cache
+        }
+    }
+
+def store_articles(news_request, articles, complete=False):
+    """Write fetched articles to the article store (never fails the request)"""
+    if article_store is None or not articles:
+        return
+    try:
+        written = article_store.ingest(
+            news_request["scope"],
+            articles,
+            category=news_request["category"],
+            language=news_request["language"],
+            window=news_request["window"],
+            incremental=news_request["page"] == 1,
+            complete=complete
+        )
+        log_debug(f"Stored {written} new articles for {news_request['scope']}")
+    except Exception as e:
+        log_warning(f" Article store write failed: {str(e)}")
+
+def get_stored_news(news_request):
+    """
+    Answer a closed date window from the article store if it was fetched before
+
+    Only for the exact window, and only when NewsAPI's whole result set was
+    stored or enough articles were to fill the requested page; an empty
+    answer is never served (or cached) from the store.
+    """
+    if article_store is None or news_request["window"] is None or news_request["page"] > 1:
+        return None
+    try:
+        from_date, to_date = news_request["window"]
+        coverage = article_store.get_coverage(news_request["scope"], from_date, to_date)
+        if coverage is None:
+            return None
+        stored_count, complete = coverage
+        if not complete and stored_count < news_request["page_size"]:
+            return None
+        articles = article_store.query_scope(news_request["scope"], from_date, to_date,
+                                             limit=news_request["page_size"])
+    except Exception as e:
+        log_warning(f" Article store read failed: {str(e)}")
+        return None
+    if not articles or (not complete and len(articles) < news_request["page_size"]):
+        return None
+
+    log_debug(f"Answered {news_request['scope']} {from_date}..{to_date} from article store")
+    result = build_news_result(news_request, articles, len(articles), cache="store")
+    ttl = get_cache_ttl(news_request["endpoint"], to_date)
+    result["metadata"]["expires_in"] = ttl
+    response_cache.set(news_request["cache_key"], result, ttl)
+    return result
+
+def with_store_fallback(news_request, result):
+    """Replace an error result with stored articles for the same query, if any"""
+    if not result.get("error") or article_store is None or news_request["page"] > 1:
+        return result
+    try:
+        params = news_request["params"]
+        articles = article_store.query_scope(news_request["scope"], params.get("from"), params.get("to"),
+                                             limit=news_request["page_size"])
+    except Exception as e:
+        log_warning(f" Article store read failed: {str(e)}")
+        return result
+    if not articles:
+        return result
+
+    log_debug(f"Serving {len(articles)} stored articles after upstream {result.get('status')}")
+    fallback = build_news_result(news_request, articles, len(articles), cache="store")
+    fallback["metadata"]["fallback_reason"] = result.get("status")
+    return fallback
+
+def is_upstream_failure(result):
+    """Check whether an error result means NewsAPI itself is failing"""
+    status = result.get("status")
+    if status == "api_error":
+        return (result.get("status_code") or 0) >= 500
+    return status in UPSTREAM_FAILURE_STATUSES
+
+def with_stale_fallback(news_request, result):
+    """Replace an upstream failure with the last good cached result, if any"""
+    if not result.get("error") or not is_upstream_failure(result):
+        return result
+    stale = response_cache.get_stale(news_request["cache_key"])
+    if stale is None:
+        return result
+
+    log_debug(f"Serving stale {news_request['endpoint']} response after upstream {result.get('status')}")
+    return copy_response(stale, cache="stale", expires_in=0, fallback_reason=result.get("status"))
+
+def with_fallbacks(news_request, result):
+    """Answer an error result from the stale cache, else the article store"""
+    return with_store_fallback(news_request, with_stale_fallback(news_request, result))
+
+def handle_news_response(response, news_request):
+    """Convert a NewsAPI HTTP response into our result format"""
+    endpoint = news_request["endpoint"]
+
+    log_debug(f"Response status: {response.status_code}")
+
+    # Handle successful response
+    if response.status_code == 200:
+        with timed("json_decode"):
             data = response.json()
-            raw_articles = data.get('articles', [])
-            
-            # Filter articles for quality
+        raw_articles = data.get('articles', [])
+
+        # Filter articles for quality
+        with timed("filter"):
             filtered_articles = filter_valid_articles(raw_articles)
-            
-            log_debug(f" Fetched {len(filtered_articles)} valid articles (filtered from {len(raw_articles)} total)")
-            
-            return {
-                "status": "ok",
-                "totalResults": len(filtered_articles),
-                "articles": filtered_articles,
-                "metadata": {
-                    "source_endpoint": "everything" if use_everything else "top-headlines",
-                    "raw_count": len(raw_articles),
-                    "filtered_count": len(filtered_articles),
-                    "language": language,
-                    "category": category if category else "all",
-                    "fetch_time": datetime.now().isoformat()
-                }
-            }
-            
-        # Handle rate limiting
-        elif response.status_code == 429:
-            log_debug(" Rate limit exceeded")
-            return {
-                "error": "Rate limit exceeded. Please try again later.",
-                "articles": [],
-                "status": "rate_limited",
-                "retry_after": response.headers.get("Retry-After", "unknown")
-            }
-            
-        # Handle authentication errors
-        elif response.status_code == 401:
-            log_debug(" Invalid API key")
-            return {
-                "error": "Invalid API key. Please check your NEWS_API_KEY.",
-                "articles": [],
-                "status": "unauthorized",
-                "help": "Verify your API key at https://newsapi.org/account"
-            }
-            
-        # Handle other API errors
-        else:
-            log_debug(f" API error: {response.status_code}")
-            try:
-                error_data = response.json()
-                error_message = error_data.get('message', f'HTTP {response.status_code} error')
-            except:
-                error_message = f'HTTP {response.status_code} error'
-            
-            return {
-                "error": f"API error: {error_message}",
-                "status_code": response.status_code,
-                "articles": [],
-                "status": "api_error"
-            }
 
-    except requests.exceptions.Timeout:
-        log_debug(" Request timeout after retries")
+        log_debug(f" Fetched {len(filtered_articles)} valid articles (filtered from {len(raw_articles)} total)")
+
+        # Complete when this one page held everything NewsAPI has for the query
+        store_articles(news_request, filtered_articles,
+                       complete=news_request["page"] == 1 and len(raw_articles) >= (data.get("totalResults") or 0))
+
+        # Collapse syndicated copies of the same story
+        with timed("dedupe"):
+            articles = story_clusterer.dedupe(filtered_articles) if DEDUPE_ENABLED else filtered_articles
+
+        result = build_news_result(news_request, articles, len(raw_articles))
+        result["metadata"]["duplicates_collapsed"] = len(filtered_articles) - len(articles)
+        result["metadata"]["page"] = news_request["page"]
+        result["metadata"]["upstream_total"] = data.get("totalResults")
+
+        ttl = get_cache_ttl(endpoint, news_request["params"].get("to"))
+        result["metadata"]["expires_in"] = ttl
+        response_cache.set(news_request["cache_key"], result, ttl)
+        return result
+
+    # Handle rate limiting: stop calling NewsAPI until Retry-After has passed
+    elif response.status_code == 429:
+        retry_after = response.headers.get("Retry-After")
+        upstream_limiter.pause(parse_retry_after(retry_after, RATE_LIMIT_DEFAULT_PAUSE))
+        log_warning(f" Rate limit exceeded, pausing upstream calls (Retry-After: {retry_after})")
+        return get_throttled_fallback(news_request, "rate_limited") or {
+            "error": "Rate limit exceeded. Please try again later.",
+            "articles": [],
+            "status": "rate_limited",
+            "retry_after": retry_after or "unknown"
+        }
+
+    # Handle authentication errors
+    elif response.status_code == 401:
+        log_warning(" Invalid API key")
+        return {
+            "error": "Invalid API key. Please check your NEWS_API_KEY.",
+            "articles": [],
+            "status": "unauthorized",
+            "help": "Verify your API key at https://newsapi.org/account"
+        }
+
+    # Handle other API errors
+    else:
+        log_warning(f" API error: {response.status_code}")
+        try:
+            error_data = response.json()
+            error_message = error_data.get('message', f'HTTP {response.status_code} error')
+        except:
+            error_message = f'HTTP {response.status_code} error'
+
+        return {
+            "error": f"API error: {error_message}",
+            "status_code": response.status_code,
+            "articles": [],
+            "status": "api_error"
+        }
+
+def handle_news_error(error):
+    """Convert a request exception into our result format"""
+    if isinstance(error, TIMEOUT_ERRORS):
+        log_warning(" Request timeout after retries")
         return {
             "error": "Request timeout. Please try again later.",
             "articles": [],
             "status": "timeout"
         }
         
-    except requests.exceptions.ConnectionError:
-        log_debug(" Connection error after retries")
+    if isinstance(error, CONNECTION_ERRORS):
+        log_warning(" Connection error after retries")
         return {
             "error": "Connection error. Please check your internet connection.",
             "articles": [],
             "status": "connection_error"
         }
         
-    except requests.exceptions.RequestException as e:
-        log_debug(f" Network error: {str(e)}")
+    if isinstance(error, NETWORK_ERRORS):
+        log_warning(f" Network error: {str(error)}")
         return {
-            "error": f"Network error: {str(e)}",
+            "error": f"Network error: {str(error)}",
             "articles": [],
             "status": "network_error"
         }
         
+    log_warning(f" Unexpected error: {str(error)}")
+    return {
+        "error": f"Unexpected error: {str(error)}",
+        "articles": [],
+        "status": "unexpected_error"
+    }
+
+def get_throttled_fallback(news_request, reason):
+    """Get the last cached result for a request we may not send upstream"""
+    stale = response_cache.get_stale(news_request["cache_key"])
+    if stale is not None:
+        log_debug(f"Serving cached {news_request['endpoint']} response while throttled ({reason})")
+        return copy_response(stale, cache="stale", throttled=reason)
+    return None
+
+def check_upstream_circuit(news_request, reserve=False):
+    """
+    Fail fast while the circuit is open; returns a fallback response then
+
+    The first check (before the upstream budget is taken) only looks; the
+    second, with reserve=True, takes the half-open probe slot.
+    """
+    if upstream_circuit.allow_request() if reserve else upstream_circuit.can_request():
+        return None
+
+    retry_after = upstream_circuit.retry_after()
+    log_debug(f" Circuit open, not calling NewsAPI (retry in {retry_after:.0f}s)")
+    return {
+        "error": "NewsAPI is temporarily unavailable. Please try again later.",
+        "articles": [],
+        "status": "upstream_unavailable",
+        "retry_after": str(int(retry_after + 0.5))
+    }
+
+def check_upstream_budget(news_request):
+    """Reserve an upstream call; returns a fallback response when throttled"""
+    allowed, reason, retry_after = upstream_limiter.acquire(background=news_request.get("background", False))
+    if allowed:
+        return None
+
+    log_debug(f" Upstream call throttled ({reason}), retry in {retry_after:.0f}s")
+    return get_throttled_fallback(news_request, reason) or {
+        "error": "Rate limit exceeded. Please try again later.",
+        "articles": [],
+        "status": "rate_limited",
+        "reason": reason,
+        "retry_after": str(int(retry_after + 0.5))
+    }
+
+def get_shared_result(news_request):
+    """Cached response another worker has stored (fresh, else stale), or None"""
+    cache_key = news_request["cache_key"]
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return copy_response(cached, cache="hit", expires_in=int(response_cache.ttl_remaining(cache_key)))
+    stale = response_cache.get_stale(cache_key)
+    if stale is not None:
+        return copy_response(stale, cache="stale", expires_in=0)
+    return None
+
+def wait_for_shared_result(news_request):
+    """
+    Wait for the worker holding a key's refresh lock to store its result
+
+    Returns the cached response, or None if it didn't arrive in time (the
+    caller then fetches itself).
+    """
+    deadline = time.monotonic() + CACHE_LOCK_WAIT
+    while True:
+        shared = get_shared_result(news_request)
+        if shared is not None or time.monotonic() >= deadline:
+            return shared
+        time.sleep(CACHE_LOCK_POLL)
+
+async def async_wait_for_shared_result(news_request):
+    """asyncio version of wait_for_shared_result"""
+    deadline = time.monotonic() + CACHE_LOCK_WAIT
+    while True:
+        shared = await asyncio.to_thread(get_shared_result, news_request)
+        if shared is not None or time.monotonic() >= deadline:
+            return shared
+        await asyncio.sleep(CACHE_LOCK_POLL)
+
+def check_upstream(news_request):
+    """Check the circuit and the upstream budget; returns a fallback response when we may not call NewsAPI"""
+    throttled = (check_upstream_circuit(news_request) or check_upstream_budget(news_request)
+                 or check_upstream_circuit(news_request, reserve=True))
+    return with_fallbacks(news_request, throttled) if throttled else None
+
+def request_news(news_request):
+    """Call NewsAPI for a prepared request (or answer it from the article store)"""
+    stored = get_stored_news(news_request)
+    if stored:
+        return stored
+
+    # With a shared cache only one worker refreshes a key at a time
+    cache_key = news_request["cache_key"]
+    token = response_cache.acquire_lock(cache_key, CACHE_LOCK_TIMEOUT)
+    if token is None:
+        shared = wait_for_shared_result(news_request)
+        if shared is not None:
+            log_debug(f"Used {news_request['endpoint']} response refreshed by another worker")
+            return shared
+
+    try:
+        throttled = check_upstream(news_request)
+        if throttled:
+            return throttled
+
+        try:
+            with timed("upstream"):
+                response = make_api_request(news_request["url"], news_request["params"])
+        except Exception as e:
+            return with_fallbacks(news_request, handle_news_error(e))
+        return with_fallbacks(news_request, handle_news_response(response, news_request))
+    finally:
+        if token is not None:
+            response_cache.release_lock(cache_key, token)
+
+def handle_async_response(response, news_request):
+    """handle_news_response plus fallbacks, for running in a thread"""
+    return with_fallbacks(news_request, handle_news_response(response, news_request))
+
+async def async_request_news(news_request):
+    """
+    Call NewsAPI for a prepared request on the async client
+
+    The article store (SQLite) and a Redis cache are blocking, so those
+    calls run in threads rather than on the event loop.
+    """
+    stored = await asyncio.to_thread(get_stored_news, news_request)
+    if stored:
+        return stored
+
+    # With a shared cache only one worker refreshes a key at a time
+    cache_key = news_request["cache_key"]
+    token = await asyncio.to_thread(response_cache.acquire_lock, cache_key, CACHE_LOCK_TIMEOUT)
+    if token is None:
+        shared = await async_wait_for_shared_result(news_request)
+        if shared is not None:
+            log_debug(f"Used {news_request['endpoint']} response refreshed by another worker")
+            return shared
+
+    try:
+        throttled = await asyncio.to_thread(check_upstream, news_request)
+        if throttled:
+            return throttled
+
+        try:
+            with timed("upstream"):
+                response = await async_make_api_request(news_request["url"], news_request["params"])
+        except Exception as e:
+            return await asyncio.to_thread(with_fallbacks, news_request, handle_news_error(e))
+        return await asyncio.to_thread(handle_async_response, response, news_request)
+    finally:
+        if token is not None:
+            await asyncio.to_thread(response_cache.release_lock, cache_key, token)
+
+def fetch_news(category="", q="", language="en", from_date=None, to_date=None, page_size=None,
+               force_refresh=False, page=1, background=False):
+    """
+    Fetch news articles from NewsAPI
+    
+    Args:
+        category (str): News category (business, entertainment, etc.)
+        q (str): Search query/keywords
+        language (str): Language code (en, es, fr, etc.)
+        from_date (str): Start date in YYYY-MM-DD format
+        to_date (str): End date in YYYY-MM-DD format
+        page_size (int): Number of articles to fetch (max 100)
+        force_refresh (bool): Skip the cache and always call NewsAPI
+        page (int): Result page to fetch (1-based)
+        background (bool): Count an upstream call against the prefetch share of the quota
+    
+    Returns:
+        dict: API response with articles and metadata
+    """
+    try:
+        with timed("validate"):
+            news_request, error = prepare_news_request(category, q, language, from_date, to_date, page_size, page)
+        if error:
+            return count_result(error)
+        news_request["background"] = background
+        
+        # Serve from cache when possible
+        cached = None if force_refresh else get_cached_news(news_request)
+        if cached is not None:
+            return count_result(cached)
+        
+        # Make API request (concurrent identical calls share one upstream request)
+        result, shared = news_flight.do(news_request["cache_key"], lambda: request_news(news_request))
+        if shared:
+            log_debug(f"Joined in-flight request for {news_request['endpoint']}")
+        return count_result(copy_response(result))
+
+    except Exception as e:
+        return count_result(handle_news_error(e))
+
+async def async_fetch_news(category="", q="", language="en", from_date=None, to_date=None, page_size=None,
+                           force_refresh=False, page=1, background=False):
+    """
+    Fetch news articles from NewsAPI without blocking the event loop
+
+    Takes the same arguments and returns the same response dict as
+    fetch_news, but runs on the shared async client so one process can keep
+    many upstream requests in flight.
+    """
+    try:
+        with timed("validate"):
+            news_request, error = prepare_news_request(category, q, language, from_date, to_date, page_size, page)
+        if error:
+            return count_result(error)
+        news_request["background"] = background
+        
+        # Serve from cache when possible (a Redis lookup runs in a thread)
+        cached = None
+        if not force_refresh:
+            if isinstance(response_cache, ResponseCache):
+                cached = get_cached_news(news_request)
+            else:
+                cached = await asyncio.to_thread(get_cached_news, news_request)
+        if cached is not None:
+            return count_result(cached)
+        
+        # Make API request (concurrent identical calls share one upstream request)
+        result, shared = await async_news_flight.do(news_request["cache_key"],
+                                                    lambda: async_request_news(news_request))
+        if shared:
+            log_debug(f"Joined in-flight async request for {news_request['endpoint']}")
+        return count_result(copy_response(result))
+
     except Exception as e:
-        log_debug(f" Unexpected error: {str(e)}")
+        return count_result(handle_news_error(e))
+
+class NewsPageError(Exception):
+    """Raised by iter_news_pages when the first page can't be fetched"""
+
+    def __init__(self, result):
+        super().__init__(result.get("error"))
+        self.result = result
+
+def is_last_page(result, page, page_size):
+    """Check whether a page result is the last one NewsAPI has for a query"""
+    metadata = result.get("metadata", {})
+    if metadata.get("raw_count", 0) < page_size:
+        return True
+    total = metadata.get("upstream_total")
+    return total is not None and page * page_size >= total
+
+def iter_news_pages(category="", q="", language="en", from_date=None, to_date=None, page_size=MAX_PAGE_SIZE,
+                    max_pages=DEFAULT_MAX_PAGES, target_count=None, cutoff=None):
+    """
+    Walk NewsAPI result pages lazily, yielding articles as each page arrives
+
+    Articles are filtered (and near-duplicates collapsed) per page by
+    fetch_news; articles repeated across pages are skipped by URL. Stops after
+    max_pages, once target_count articles were yielded, at the first article
+    published before cutoff (YYYY-MM-DD or ISO timestamp, results are newest
+    first), on the last page, or when a page after the first fails (NewsAPI
+    caps how deep free plans can page).
+    """
+    seen_urls = set()
+    yielded = 0
+    for page in range(1, max(1, max_pages) + 1):
+        result = fetch_news(category, q, language, from_date, to_date, page_size, page=page)
+        if result.get("error"):
+            if page == 1:
+                raise NewsPageError(result)
+            log_debug(f"Stopping pagination at page {page}: {result.get('status')}")
+            return
+
+        for article in result.get("articles", []):
+            if cutoff and (article.get("publishedAt") or "") < cutoff:
+                return
+            if article.get("url") in seen_urls:
+                continue
+            seen_urls.add(article.get("url"))
+            yield article
+            yielded += 1
+            if target_count and yielded >= target_count:
+                return
+
+        if is_last_page(result, page, page_size):
+            return
+
+def search_local_news(q, language="en", from_date=None, to_date=None, page_size=None):
+    """
+    Search articles already in the article store (no NewsAPI call)
+
+    Returns the same response dict as fetch_news, ranked by BM25 relevance.
+    """
+    if article_store is None or not article_store.fts_enabled:
         return {
-            "error": f"Unexpected error: {str(e)}",
+            "error": "Local search is not available (article store or SQLite FTS5 missing)",
             "articles": [],
-            "status": "unexpected_error"
+            "status": "configuration_error"
+        }
+
+    page_size = min(max(1, page_size or DEFAULT_PAGE_SIZE), 100)
+    started = time.perf_counter()
+    matches = article_store.search(q, language, from_date, to_date, limit=page_size)
+    articles = [article for article, score in matches]
+
+    log_debug(f"Local search for '{q}' matched {len(articles)} articles")
+    return {
+        "status": "ok",
+        "totalResults": len(articles),
+        "articles": articles,
+        "metadata": {
+            "source_endpoint": "local-index",
+            "raw_count": len(articles),
+            "filtered_count": len(articles),
+            "language": language,
+            "category": "all",
+            "fetch_time": datetime.now().isoformat(),
+            "search_ms": round((time.perf_counter() - started) * 1000, 2),
+            "cache": "local"
         }
+    }
+
+def search_news(q, language="en", from_date=None, to_date=None, page_size=None, mode="hybrid"):
+    """
+    Search news using the local full-text index and/or NewsAPI
+
+    Modes:
+        local: only the local index
+        hybrid: local results right away; NewsAPI is queried in the background
+                so later searches see more (waits for NewsAPI if nothing local)
+        upstream: same as fetch_news(q=...)
+    """
+    if mode == "upstream":
+        return fetch_news("", q, language, from_date, to_date, page_size)
+
+    local = search_local_news(q, language, from_date, to_date, page_size)
+    if mode == "local":
+        return local
+
+    if local.get("error") or not local["articles"]:
+        return fetch_news("", q, language, from_date, to_date, page_size)
+
+    # Fill the store with upstream results for next time
+    revalidate_executor.submit(fetch_news, "", q, language, from_date, to_date, page_size)
+    local["metadata"]["upstream"] = "refreshing"
+    return local
 
 def get_news_categories():
     """Get list of available news categories"""
@@ -388,7 +1159,21 @@ def get_api_status():
         "api_key_configured": bool(NEWS_API_KEY),
         "base_url": BASE_URL,
         "default_timeout": DEFAULT_TIMEOUT,
+        "connect_timeout": CONNECT_TIMEOUT,
+        "read_timeout": READ_TIMEOUT,
+        "pool_maxsize": POOL_MAXSIZE,
         "max_retries": MAX_RETRIES,
+        "cache": response_cache.stats(),
+        "cache_ttls": dict(CACHE_TTLS),
+        "single_flight": news_flight.stats(),
+        "async_single_flight": async_news_flight.stats(),
+        "quota": upstream_limiter.stats(),
+        "circuit": upstream_circuit.stats(),
+        "workers": WORKER_COUNT,
+        "store": article_store.stats() if article_store else None,
+        "filters": article_filter.stats(),
+        "dedupe": story_clusterer.stats(),
+        "async_client": "httpx" if httpx is not None else "thread-pool",
         "supported_categories": get_news_categories(),
         "supported_languages": list(get_supported_languages().keys()),
         "version": "1.1.0"
@@ -0,0 +1,203 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows): every process counts as the leader
+    fcntl = None
+
+
+class LeaderLock:
+    """Non-blocking inter-process lock on a file
+
+    Used so that only one of several server worker processes runs the
+    prefetch scheduler. The OS releases the lock when the holder exits, so
+    another worker can take over.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def try_acquire(self):
+        """Take the lock if no other process holds it; returns True on success"""
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            self._file = True
+            return True
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        lock_file = open(self.path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is not None and fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+        self._file = None
+
+
+class PrefetchScheduler:
+    """Background thread that keeps hot news queries fresh in the cache
+
+    Each key is refreshed every interval seconds (plus or minus jitter) with
+    fetch(**kwargs, force_refresh=True). Refreshes are skipped and retried
+    later when the per-minute upstream budget is used up, and for a whole
+    interval while can_refresh() (e.g. the daily quota check) returns False;
+    in the meantime the cache keeps serving the previous (stale) result. Each
+    fresh result is also passed to on_result(name, kwargs, result) when one
+    is given.
+    """
+
+    def __init__(self, fetch, keys, interval=90, jitter=0.1, budget_per_minute=30, log=None, on_result=None,
+                 can_refresh=None):
+        self.fetch = fetch
+        self.on_result = on_result
+        self.can_refresh = can_refresh
+        self.interval = interval
+        self.jitter = jitter
+        self.budget_per_minute = budget_per_minute
+        self.log = log or (lambda message: None)
+
+        self._keys = dict(keys)  # name -> fetch kwargs
+        self._status = {name: self._new_status() for name in self._keys}
+        self._next_due = {}
+        self._recent_refreshes = deque()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _new_status():
+        return {
+            "last_refresh": None,
+            "last_status": None,
+            "lag_seconds": None,
+            "duration_ms": None,
+            "refreshes": 0,
+            "failures": 0,
+            "deferred": 0
+        }
+
+    def _next_delay(self):
+        """Refresh interval with random jitter applied"""
+        spread = self.interval * self.jitter
+        return max(1.0, self.interval + random.uniform(-spread, spread))
+
+    def _take_budget(self, now):
+        """Reserve one upstream call from the per-minute budget"""
+        while self._recent_refreshes and self._recent_refreshes[0] <= now - 60:
+            self._recent_refreshes.popleft()
+        if len(self._recent_refreshes) >= self.budget_per_minute:
+            return False
+        self._recent_refreshes.append(now)
+        return True
+
+    def refresh(self, name, due=None):
+        """Refresh one key now"""
+        kwargs = self._keys[name]
+        started = time.monotonic()
+        try:
+            result = self.fetch(force_refresh=True, **kwargs)
+            result_status = result.get("status", "unknown")
+            if result.get("metadata", {}).get("cache") == "stale":
+                result_status = "stale"  # upstream was skipped (e.g. throttled)
+        except Exception as e:
+            self.log(f"Prefetch of '{name}' failed: {str(e)}")
+            result_status = "error"
+
+        if result_status == "ok" and self.on_result is not None:
+            try:
+                self.on_result(name, kwargs, result)
+            except Exception as e:
+                self.log(f"Prefetch result handler for '{name}' failed: {str(e)}")
+
+        with self._lock:
+            status = self._status[name]
+            status["last_refresh"] = datetime.now().isoformat()
+            status["last_status"] = result_status
+            status["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+            status["lag_seconds"] = round(max(0.0, started - due), 3) if due is not None else 0.0
+            status["refreshes"] += 1
+            if result_status != "ok":
+                status["failures"] += 1
+
+    def _run(self):
+        # Spread the first round over a few seconds instead of firing all at once
+        now = time.monotonic()
+        for index, name in enumerate(self._keys):
+            self._next_due[name] = now + index * 0.5
+
+        while not self._stop.is_set():
+            now = time.monotonic()
+            due = sorted((when, name) for name, when in self._next_due.items() if when <= now)
+
+            for when, name in due:
+                if self._stop.is_set():
+                    return
+                if self.can_refresh is not None and not self.can_refresh():
+                    # Quota is low: leave upstream calls to users until the next round
+                    with self._lock:
+                        self._status[name]["deferred"] += 1
+                    self._next_due[name] = time.monotonic() + self._next_delay()
+                    continue
+                with self._lock:
+                    allowed = self._take_budget(time.monotonic())
+                    if not allowed:
+                        self._status[name]["deferred"] += 1
+                if not allowed:
+                    # Out of budget: try again shortly, cache serves stale data meanwhile
+                    self._next_due[name] = time.monotonic() + 5
+                    continue
+                self.refresh(name, due=when)
+                self._next_due[name] = time.monotonic() + self._next_delay()
+
+            wait = min(self._next_due.values()) - time.monotonic() if self._next_due else self.interval
+            self._stop.wait(max(0.1, wait))
+
+    def start(self):
+        """Start the background thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="news-prefetch", daemon=True)
+        self._thread.start()
+        self.log(f"Prefetch scheduler started for {len(self._keys)} keys (every ~{self.interval}s)")
+
+    def stop(self, timeout=5):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def status(self):
+        """Get per-key refresh status"""
+        with self._lock:
+            now = time.monotonic()
+            keys = {}
+            for name, status in self._status.items():
+                keys[name] = dict(status)
+                next_due = self._next_due.get(name)
+                keys[name]["next_refresh_in"] = round(max(0.0, next_due - now), 1) if next_due else None
+            return {
+                "running": self.is_running(),
+                "interval": self.interval,
+                "jitter": self.jitter,
+                "budget_per_minute": self.budget_per_minute,
+                "used_last_minute": sum(1 for t in self._recent_refreshes if t > now - 60),
+                "keys": keys
+            }
@@ -0,0 +1,277 @@
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+try:
+    import numpy
+except ImportError:  # ranking runs in pure Python instead
+    numpy = None
+
+# Where a query term appears matters: a title match counts most
+FIELD_WEIGHTS = (("title", 3.0), ("description", 1.5), ("content", 1.0))
+
+# Score = keyword match strength (BM25-style saturation and IDF over the
+# candidate set, scaled to 0..1) blended with an exponential recency decay;
+# each further article from the same source is then scaled down once more
+KEYWORD_WEIGHT = 0.7
+RECENCY_WEIGHT = 0.3
+RECENCY_HALF_LIFE_HOURS = 24
+TERM_SATURATION = 1.2
+DIVERSITY_PENALTY = 0.85
+
+FEATURE_CACHE_SIZE = 20000
+VOCABULARY_LIMIT = 500000
+
+QUERY_OPERATORS = {"AND", "OR", "NOT"}
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_QUERY_TOKEN_RE = re.compile(r'[-+]?"[^"]*"|[-+]?[^\s()"]+')
+
+
+def normalize_word(word):
+    """Fold simple plurals (elections -> election)"""
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    return [normalize_word(word) for word in _WORD_RE.findall(text.lower())]
+
+
+def query_terms(query):
+    """
+    Distinct search words of a NewsAPI query
+
+    AND/OR/NOT and parentheses are dropped, quoted phrases count as their
+    words, and excluded words (-word or NOT word) are left out.
+    """
+    terms = []
+    exclude_next = False
+    for token in _QUERY_TOKEN_RE.findall(query or ""):
+        if token in QUERY_OPERATORS:
+            exclude_next = token == "NOT"
+            continue
+        excluded = exclude_next or token.startswith("-")
+        exclude_next = False
+        if excluded:
+            continue
+        for word in tokenize(token):
+            if word not in terms:
+                terms.append(word)
+    return terms
+
+
+def parse_published(value):
+    """publishedAt as epoch seconds (None if missing or unreadable)"""
+    try:
+        parsed = datetime.fromisoformat(value or "")
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class ArticleRanker:
+    """
+    Orders articles by relevance to a query
+
+    Each article is tokenized once; its weighted word counts are cached per
+    URL so repeat rankings of the same articles only do the scoring. With
+    NumPy installed the scoring is vectorized over the whole candidate set.
+    """
+
+    def __init__(self, cache_size=FEATURE_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._features = OrderedDict()  # url -> (text key, features)
+        self._vocabulary = {}
+        self._sources = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.feature_hits = 0
+        self.feature_misses = 0
+        self.rankings = 0
+
+    def _word_id(self, word):
+        """Vocabulary id of a word (lock held)"""
+        word_id = self._vocabulary.get(word)
+        if word_id is None:
+            word_id = self._vocabulary[word] = len(self._vocabulary)
+        return word_id
+
+    def _build_features(self, article):
+        """Weighted word counts, publish time and source id of an article (lock held)"""
+        weights = {}
+        for field, field_weight in FIELD_WEIGHTS:
+            for word in tokenize(article.get(field) or ""):
+                word_id = self._word_id(word)
+                weights[word_id] = weights.get(word_id, 0.0) + field_weight
+
+        source = (article.get("source") or {}).get("name") or ""
+        source_id = self._sources.get(source)
+        if source_id is None:
+            source_id = self._sources[source] = len(self._sources)
+
+        ids = vector = None
+        if numpy is not None:
+            ids = numpy.fromiter(weights.keys(), dtype=numpy.int64, count=len(weights))
+            vector = numpy.fromiter(weights.values(), dtype=numpy.float64, count=len(weights))
+        return weights, ids, vector, parse_published(article.get("publishedAt")), source_id
+
+    def features(self, articles):
+        """
+        Get the (cached) features of each article
+
+        Returns the list of features and the vocabulary size they were built
+        with (word ids are below it).
+        """
+        result = []
+        with self._lock:
+            if len(self._vocabulary) > VOCABULARY_LIMIT:
+                # Start over rather than grow without bound (ids are only valid with their vocabulary)
+                self._vocabulary.clear()
+                self._features.clear()
+
+            for article in articles:
+                url = article.get("url")
+                key = (article.get("title"), article.get("description"), article.get("publishedAt"))
+                cached = self._features.get(url) if url else None
+                if cached is not None and cached[0] == key:
+                    self._features.move_to_end(url)
+                    self.feature_hits += 1
+                    result.append(cached[1])
+                    continue
+
+                features = self._build_features(article)
+                self.feature_misses += 1
+                result.append(features)
+                if url:
+                    self._features[url] = (key, features)
+
+            while len(self._features) > self.cache_size:
+                self._features.popitem(last=False)
+            return result, len(self._vocabulary)
+
+    def term_ids(self, terms):
+        with self._lock:
+            return [self._vocabulary.get(term, -1) for term in terms]
+
+    def rank(self, articles, query="", category="", now=None):
+        """
+        Return the articles ordered by relevance (a new list)
+
+        The query's words are matched (the category name stands in when
+        there is no query); without either, recency and source diversity
+        alone decide. Ties keep the input order.
+        """
+        if len(articles) < 2:
+            return list(articles)
+
+        features, vocabulary_size = self.features(articles)
+        terms = query_terms(query) or query_terms(category)
+        ids = [term_id for term_id in self.term_ids(terms) if 0 <= term_id < vocabulary_size]
+        now = time.time() if now is None else now
+        self.rankings += 1
+
+        if numpy is not None:
+            order = self._rank_vectorized(features, ids, vocabulary_size, now)
+        else:
+            order = self._rank_python(features, ids, now)
+        return [articles[index] for index in order]
+
+    def _rank_vectorized(self, features, term_ids, vocabulary_size, now):
+        count = len(features)
+        _, word_ids, word_weights, published, sources = zip(*features)
+        recency = numpy.array([-math.inf if value is None else value for value in published])
+        age_hours = numpy.maximum(now - recency, 0.0) / 3600.0
+        recency_score = numpy.exp2(-age_hours / RECENCY_HALF_LIFE_HOURS)
+
+        if term_ids:
+            # Term frequency matrix (articles x terms): every word of every
+            # article looked up in a word id -> term column table
+            lengths = numpy.fromiter(map(len, word_ids), dtype=numpy.int64, count=count)
+            all_ids = numpy.concatenate(word_ids)
+            all_weights = numpy.concatenate(word_weights)
+            owner = numpy.repeat(numpy.arange(count), lengths)
+
+            column_of = numpy.full(vocabulary_size, -1, dtype=numpy.int64)
+            column_of[term_ids] = numpy.arange(len(term_ids))
+            columns = column_of[all_ids]
+            matched = columns >= 0
+            frequency = numpy.bincount(owner[matched] * len(term_ids) + columns[matched],
+                                       weights=all_weights[matched],
+                                       minlength=count * len(term_ids)).reshape(count, len(term_ids))
+
+            document_frequency = (frequency > 0).sum(axis=0)
+            idf = numpy.log1p((count - document_frequency + 0.5) / (document_frequency + 0.5))
+            keyword = (frequency / (frequency + TERM_SATURATION) * idf).sum(axis=1)
+            if keyword.max() > 0:
+                keyword /= keyword.max()
+            score = KEYWORD_WEIGHT * keyword + RECENCY_WEIGHT * recency_score
+        else:
+            score = recency_score
+
+        # Penalize each further article from a source already ranked above it
+        sources = numpy.array(sources, dtype=numpy.int64)
+        by_score = numpy.argsort(-score, kind="stable")
+        grouped = by_score[numpy.argsort(sources[by_score], kind="stable")]
+        group_sources = sources[grouped]
+        starts = numpy.flatnonzero(numpy.r_[True, group_sources[1:] != group_sources[:-1]])
+        occurrence = numpy.empty(count, dtype=numpy.int64)
+        occurrence[grouped] = numpy.arange(count) - numpy.repeat(starts, numpy.diff(numpy.r_[starts, count]))
+        score = score * DIVERSITY_PENALTY ** occurrence
+
+        return numpy.argsort(-score, kind="stable").tolist()
+
+    def _rank_python(self, features, term_ids, now):
+        count = len(features)
+        recency_score = []
+        for _, _, _, published, _ in features:
+            if published is None:
+                recency_score.append(0.0)
+            else:
+                age_hours = max(now - published, 0.0) / 3600.0
+                recency_score.append(2.0 ** (-age_hours / RECENCY_HALF_LIFE_HOURS))
+
+        if term_ids:
+            frequency = [[weights.get(term_id, 0.0) for term_id in term_ids] for weights, _, _, _, _ in features]
+            idf = []
+            for column in range(len(term_ids)):
+                document_frequency = sum(1 for row in frequency if row[column] > 0)
+                idf.append(math.log1p((count - document_frequency + 0.5) / (document_frequency + 0.5)))
+            keyword = [sum(tf / (tf + TERM_SATURATION) * weight for tf, weight in zip(row, idf)) for row in frequency]
+            best = max(keyword)
+            if best > 0:
+                keyword = [value / best for value in keyword]
+            score = [KEYWORD_WEIGHT * k + RECENCY_WEIGHT * r for k, r in zip(keyword, recency_score)]
+        else:
+            score = recency_score
+
+        seen = {}
+        for index in sorted(range(count), key=lambda i: -score[i]):
+            source = features[index][4]
+            occurrence = seen.get(source, 0)
+            seen[source] = occurrence + 1
+            score[index] *= DIVERSITY_PENALTY ** occurrence
+
+        return sorted(range(count), key=lambda i: -score[i])
+
+    def stats(self):
+        """Get ranking counters"""
+        with self._lock:
+            return {
+                "engine": "numpy" if numpy is not None else "python",
+                "rankings": self.rankings,
+                "cached_articles": len(self._features),
+                "vocabulary": len(self._vocabulary),
+                "feature_hits": self.feature_hits,
+                "feature_misses": self.feature_misses
+            }
+
+
+# Shared ranker used for ?sort=relevance
+article_ranker = ArticleRanker()
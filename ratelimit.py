@@ -0,0 +1,182 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value, default=60):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds"""
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens per second, up to capacity"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available; returns True on success"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def wait_time(self, tokens=1):
+        """Seconds until tokens will be available"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                return 0.0
+            return (tokens - self._tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def available(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class UpstreamLimiter:
+    """Budget manager for calls to NewsAPI
+
+    Combines a token bucket (short-term rate), a daily quota counter that
+    resets at UTC midnight, and a pause window set from Retry-After when
+    NewsAPI answers 429. acquire() never blocks: callers that are refused
+    should fall back to cached data instead of calling upstream.
+
+    Background calls (prefetch, stale refreshes) have their own daily
+    budget, background_quota, next to the daily_quota for requests from
+    users, so they can never use up the calls left for users. With
+    daily_quota 0 neither is limited.
+    """
+
+    def __init__(self, rate_per_minute=30, burst=10, daily_quota=100, background_quota=0):
+        self.bucket = TokenBucket(rate_per_minute / 60.0, burst)
+        self.rate_per_minute = rate_per_minute
+        self.daily_quota = daily_quota
+        self.background_quota = background_quota
+        self._day = self._today()
+        self._used_today = 0
+        self._used_background = 0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.allowed = 0
+        self.throttled = 0
+        self.rate_limited_responses = 0
+
+    @staticmethod
+    def _today():
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _roll_day(self):
+        """Reset the daily counter when the UTC day changes (lock held)"""
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._used_today = 0
+            self._used_background = 0
+
+    def set_background_quota(self, calls):
+        """Change the background budget (e.g. when this worker takes over prefetching)"""
+        with self._lock:
+            self.background_quota = max(0, calls)
+
+    def _background_exhausted(self):
+        """Check whether background work has used up its budget (lock held)"""
+        return bool(self.daily_quota) and self._used_background >= self.background_quota
+
+    def background_available(self):
+        """Check whether background work may still call upstream today"""
+        with self._lock:
+            self._roll_day()
+            return not self._background_exhausted() and time.monotonic() >= self._paused_until
+
+    def acquire(self, background=False):
+        """
+        Reserve one upstream call
+
+        Args:
+            background (bool): Count the call against the background budget
+
+        Returns:
+            tuple: (allowed, reason, retry_after_seconds)
+        """
+        with self._lock:
+            self._roll_day()
+            now = time.monotonic()
+
+            if now < self._paused_until:
+                self.throttled += 1
+                return False, "paused", self._paused_until - now
+
+            if background:
+                if self._background_exhausted():
+                    self.throttled += 1
+                    return False, "background_quota", self._seconds_until_reset()
+            elif self.daily_quota and self._used_today - self._used_background >= self.daily_quota:
+                self.throttled += 1
+                return False, "daily_quota", self._seconds_until_reset()
+
+            if not self.bucket.try_acquire():
+                self.throttled += 1
+                return False, "rate", self.bucket.wait_time()
+
+            self._used_today += 1
+            if background:
+                self._used_background += 1
+            self.allowed += 1
+            return True, None, 0.0
+
+    def pause(self, seconds):
+        """Stop upstream calls for the given number of seconds (e.g. Retry-After)"""
+        with self._lock:
+            self.rate_limited_responses += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _seconds_until_reset(self):
+        now = datetime.now(timezone.utc)
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp() + 86400
+        return midnight - now.timestamp()
+
+    def stats(self):
+        """Get current quota usage"""
+        with self._lock:
+            self._roll_day()
+            paused_for = max(0.0, self._paused_until - time.monotonic())
+            return {
+                "day": self._day,
+                "used_today": self._used_today,
+                "daily_quota": self.daily_quota,
+                "remaining_today": (max(0, self.daily_quota - self._used_today + self._used_background)
+                                    if self.daily_quota else None),
+                "background_used_today": self._used_background,
+                "background_quota": self.background_quota if self.daily_quota else None,
+                "rate_per_minute": self.rate_per_minute,
+                "tokens_available": round(self.bucket.available(), 2),
+                "paused_for_seconds": round(paused_for, 1),
+                "allowed": self.allowed,
+                "throttled": self.throttled,
+                "rate_limited_responses": self.rate_limited_responses
+            }
@@ -0,0 +1,177 @@
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+try:
+    import brotli
+except ImportError:  # only gzip (and plain) files are written
+    brotli = None
+
+# Snapshots are compressed once, so they can afford the slowest settings
+SNAPSHOT_GZIP_LEVEL = 9
+SNAPSHOT_BROTLI_QUALITY = 11
+
+# Content coding -> file suffix after .json
+SNAPSHOT_SUFFIXES = {"br": ".br", "gzip": ".gz", None: ""}
+
+
+def snapshot_day(now=None):
+    """UTC date bucket (YYYY-MM-DD) of a time"""
+    return datetime.fromtimestamp(time.time() if now is None else now, timezone.utc).strftime("%Y-%m-%d")
+
+
+class SnapshotStore:
+    """
+    Precomputed /api/news responses on disk, one per (day, language, category)
+
+    Layout: <directory>/<YYYY-MM-DD>/<language>/<category>.json, plus
+    .json.gz (and .json.br with brotli installed) copies of the same body and
+    a .meta file with the ETag and Last-Modified validators. Other variants
+    of a view (e.g. with thumbnail URLs) are stored as <category>.<variant>.* Every file is
+    written to a temporary name and renamed into place, so readers (this
+    app or a reverse proxy serving the directory) never see a partial one.
+    A snapshot counts as fresh for max_age seconds after it was last
+    written or confirmed unchanged.
+    """
+
+    def __init__(self, directory, max_age=300, keep_days=7, log=None):
+        self.directory = directory
+        self.max_age = max_age
+        self.keep_days = keep_days
+        self.log = log or (lambda message: None)
+        self._validators = {}  # .meta path -> (mtime_ns, meta)
+        self._pruned_day = None
+        self._lock = threading.Lock()
+
+        # Counters
+        self.writes = 0
+        self.unchanged = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, day, language, category, suffix="", variant=""):
+        name = f"{category}.{variant}" if variant else category
+        return os.path.join(self.directory, day, language, f"{name}{suffix}")
+
+    def _replace(self, path, data):
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def write(self, language, category, body, etag, last_modified=None, now=None, variant=""):
+        """
+        Store today's snapshot of a view; returns True if its content changed
+
+        An unchanged snapshot (same ETag) is only touched to keep it fresh.
+        """
+        day = snapshot_day(now)
+        meta_path = self._path(day, language, category, ".meta", variant)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                current = json.load(f)
+        except (OSError, ValueError):
+            current = None
+
+        if current is not None and current.get("etag") == etag:
+            try:
+                for encoding in current["encodings"]:
+                    os.utime(self._path(day, language, category, ".json" + SNAPSHOT_SUFFIXES[encoding], variant))
+                os.utime(meta_path)
+                with self._lock:
+                    self.unchanged += 1
+                return False
+            except OSError:
+                pass  # a file went missing: write them all again
+
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        variants = {None: body, "gzip": gzip.compress(body, compresslevel=SNAPSHOT_GZIP_LEVEL, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=SNAPSHOT_BROTLI_QUALITY)
+        for encoding, data in variants.items():
+            self._replace(self._path(day, language, category, ".json" + SNAPSHOT_SUFFIXES[encoding], variant), data)
+
+        # Validators last, so they never describe a body that isn't in place yet
+        meta = {
+            "etag": etag,
+            "last_modified": int(last_modified.timestamp()) if last_modified else None,
+            "encodings": list(variants)
+        }
+        self._replace(meta_path, json.dumps(meta).encode("utf-8"))
+        with self._lock:
+            self.writes += 1
+        self.prune(day)
+        return True
+
+    def find(self, language, category, encoding=None, now=None, variant=""):
+        """
+        Today's fresh snapshot of a view, or None
+
+        Returns {"path", "encoding", "etag", "last_modified", "age"}; the file
+        is the one for the requested content coding if it was written.
+        """
+        now = time.time() if now is None else now
+        day = snapshot_day(now)
+        meta_path = self._path(day, language, category, ".meta", variant)
+        try:
+            stat = os.stat(meta_path)
+        except OSError:
+            stat = None
+        age = now - stat.st_mtime if stat else None
+        if age is None or age > self.max_age:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            cached = self._validators.get(meta_path)
+        if cached is not None and cached[0] == stat.st_mtime_ns:
+            meta = cached[1]
+        else:
+            try:
+                with open(meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                return None
+            with self._lock:
+                self._validators[meta_path] = (stat.st_mtime_ns, meta)
+
+        if encoding not in meta["encodings"]:
+            encoding = "gzip" if encoding == "br" and "gzip" in meta["encodings"] else None
+        with self._lock:
+            self.hits += 1
+        return {
+            "path": self._path(day, language, category, ".json" + SNAPSHOT_SUFFIXES[encoding], variant),
+            "encoding": encoding,
+            "etag": meta["etag"],
+            "last_modified": (datetime.fromtimestamp(meta["last_modified"], timezone.utc)
+                              if meta["last_modified"] else None),
+            "age": max(0.0, age)
+        }
+
+    def prune(self, today):
+        """Delete day directories older than keep_days (once per day)"""
+        if self._pruned_day == today or not os.path.isdir(self.directory):
+            return
+        self._pruned_day = today
+        oldest = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=self.keep_days)).strftime("%Y-%m-%d")
+        for name in os.listdir(self.directory):
+            if len(name) == 10 and name < oldest:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+                self.log(f"Removed snapshots of {name}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "max_age": self.max_age,
+                "brotli": brotli is not None,
+                "writes": self.writes,
+                "unchanged": self.unchanged,
+                "hits": self.hits,
+                "misses": self.misses
+            }
@@ -0,0 +1,362 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    content TEXT,
+    author TEXT,
+    url_to_image TEXT,
+    source_id TEXT,
+    source_name TEXT,
+    published_at TEXT,
+    category TEXT,
+    language TEXT,
+    fetched_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source_name, published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_category ON articles (category, published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_language ON articles (language, published_at);
+
+-- Which query (scope) returned which article
+CREATE TABLE IF NOT EXISTS article_scopes (
+    scope TEXT NOT NULL,
+    url_hash TEXT NOT NULL,
+    PRIMARY KEY (scope, url_hash)
+);
+
+-- Newest publishedAt seen per scope, for incremental ingestion
+CREATE TABLE IF NOT EXISTS ingest_state (
+    scope TEXT PRIMARY KEY,
+    last_published_at TEXT,
+    updated_at TEXT
+);
+
+-- Closed date windows fetched per scope: how many articles were stored for
+-- the window and whether that was NewsAPI's whole result set
+CREATE TABLE IF NOT EXISTS coverage (
+    scope TEXT NOT NULL,
+    from_date TEXT NOT NULL,
+    to_date TEXT NOT NULL,
+    fetched_at TEXT,
+    article_count INTEGER NOT NULL DEFAULT 0,
+    complete INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, from_date, to_date)
+);
+"""
+
+# Full-text index over title/description/content, kept in sync by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+    title, description, content,
+    content = 'articles', content_rowid = 'rowid', tokenize = 'porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, description, content)
+    VALUES (new.rowid, new.title, new.description, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, description, content)
+    VALUES ('delete', old.rowid, old.title, old.description, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, description, content)
+    VALUES ('delete', old.rowid, old.title, old.description, old.content);
+    INSERT INTO articles_fts (rowid, title, description, content)
+    VALUES (new.rowid, new.title, new.description, new.content);
+END;
+"""
+
+# BM25 column weights: title, description, content
+FTS_WEIGHTS = (10.0, 4.0, 1.0)
+FTS_OPERATORS = {"AND", "OR", "NOT", "NEAR"}
+
+
+def build_fts_query(query):
+    """
+    Turn a NewsAPI-style search string into a safe FTS5 query
+
+    Words are quoted so user input can't inject FTS syntax. "a OR b" style
+    queries (like the politics query) match any term; everything else
+    matches all terms.
+    """
+    terms = [term for term in re.findall(r"\w+", query or "") if term not in FTS_OPERATORS]
+    # Dedupe case-insensitively, keeping order
+    seen = set()
+    unique_terms = []
+    for term in terms:
+        if term.lower() not in seen:
+            seen.add(term.lower())
+            unique_terms.append(f'"{term}"')
+    if not unique_terms:
+        return None
+    joiner = " OR " if " OR " in (query or "") else " "
+    return joiner.join(unique_terms)
+
+
+def hash_url(url):
+    """Stable key for an article URL"""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def next_day(date_string):
+    """Get the day after a YYYY-MM-DD date (exclusive upper bound for queries)"""
+    return (datetime.strptime(date_string, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def row_to_article(row):
+    """Convert a database row back into the NewsAPI article format"""
+    return {
+        "source": {"id": row["source_id"], "name": row["source_name"]},
+        "author": row["author"],
+        "title": row["title"],
+        "description": row["description"],
+        "url": row["url"],
+        "urlToImage": row["url_to_image"],
+        "publishedAt": row["published_at"],
+        "content": row["content"]
+    }
+
+
+class ArticleStore:
+    """SQLite-backed store of every article fetch_news has returned
+
+    Articles are keyed by URL hash, so the same story fetched by several
+    queries is stored once. Each query is recorded as a scope so that its
+    results can be answered again from disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._upgrade_coverage()
+            self.fts_enabled = self._create_fts()
+            self._conn.commit()
+
+        # Counters
+        self.written = 0
+        self.skipped = 0
+
+    def _upgrade_coverage(self):
+        """Add the coverage columns missing from stores created before them (lock held)"""
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(coverage)")}
+        for column in ("article_count", "complete"):
+            if column not in columns:
+                # Old rows say nothing about completeness, so they never answer a request
+                self._conn.execute(f"ALTER TABLE coverage ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+
+    def _create_fts(self):
+        """Create the full-text index if SQLite supports FTS5 (lock held)"""
+        existed = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'"
+        ).fetchone() is not None
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+        if not existed:
+            # Index articles stored before the index existed
+            self._conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+        return True
+
+    def ingest(self, scope, articles, category="", language="", window=None, incremental=True, complete=False):
+        """
+        Write articles returned for a scope
+
+        Without a window (rolling feeds like top headlines) only articles newer
+        than the last publishedAt seen for the scope are written. With a closed
+        (from_date, to_date) window, or incremental=False (later result pages),
+        every article is written. The first page of a closed window is
+        recorded as covered, with its article count and whether it was the
+        complete result set (complete=True).
+
+        Returns:
+            int: number of articles written
+        """
+        now = datetime.now().isoformat()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_published_at FROM ingest_state WHERE scope = ?", (scope,)
+            ).fetchone()
+            watermark = row["last_published_at"] if row and incremental and window is None else None
+
+            new_articles = [
+                article for article in articles
+                if article.get("url") and (watermark is None or (article.get("publishedAt") or "") > watermark)
+            ]
+            self.skipped += len(articles) - len(new_articles)
+
+            with self._conn:
+                self._conn.executemany(
+                    """
+                    INSERT INTO articles (url_hash, url, title, description, content, author, url_to_image,
+                                          source_id, source_name, published_at, category, language, fetched_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (url_hash) DO UPDATE SET
+                        title = excluded.title,
+                        description = excluded.description,
+                        content = excluded.content,
+                        url_to_image = excluded.url_to_image,
+                        category = COALESCE(NULLIF(excluded.category, ''), articles.category),
+                        fetched_at = excluded.fetched_at
+                    """,
+                    [
+                        (
+                            hash_url(article["url"]),
+                            article["url"],
+                            article.get("title"),
+                            article.get("description"),
+                            article.get("content"),
+                            article.get("author"),
+                            article.get("urlToImage"),
+                            (article.get("source") or {}).get("id"),
+                            (article.get("source") or {}).get("name"),
+                            article.get("publishedAt"),
+                            category,
+                            language,
+                            now
+                        )
+                        for article in new_articles
+                    ]
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO article_scopes (scope, url_hash) VALUES (?, ?)",
+                    [(scope, hash_url(article["url"])) for article in new_articles]
+                )
+
+                newest = max((article.get("publishedAt") or "" for article in new_articles), default="")
+                if newest:
+                    self._conn.execute(
+                        """
+                        INSERT INTO ingest_state (scope, last_published_at, updated_at) VALUES (?, ?, ?)
+                        ON CONFLICT (scope) DO UPDATE SET
+                            last_published_at = MAX(ingest_state.last_published_at, excluded.last_published_at),
+                            updated_at = excluded.updated_at
+                        """,
+                        (scope, newest, now)
+                    )
+
+                if window is not None and incremental:
+                    self._conn.execute(
+                        """
+                        INSERT OR REPLACE INTO coverage (scope, from_date, to_date, fetched_at, article_count, complete)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        """,
+                        (scope, window[0], window[1], now, len(new_articles), int(complete))
+                    )
+
+            self.written += len(new_articles)
+            return len(new_articles)
+
+    def get_coverage(self, scope, from_date, to_date):
+        """
+        How exactly this closed window of the scope was fetched before
+
+        Returns (article_count, complete), or None if it wasn't. Only the exact
+        window counts: a wider one says nothing about what a narrower one
+        would return, since just its first page was stored.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT article_count, complete FROM coverage WHERE scope = ? AND from_date = ? AND to_date = ?",
+                (scope, from_date, to_date)
+            ).fetchone()
+            return (row["article_count"], bool(row["complete"])) if row else None
+
+    def query_scope(self, scope, from_date=None, to_date=None, limit=50):
+        """Get the newest stored articles for a scope, optionally within dates"""
+        sql = ("SELECT a.* FROM article_scopes s JOIN articles a ON a.url_hash = s.url_hash "
+               "WHERE s.scope = ?")
+        args = [scope]
+        if from_date:
+            sql += " AND a.published_at >= ?"
+            args.append(from_date)
+        if to_date:
+            sql += " AND a.published_at < ?"
+            args.append(next_day(to_date))
+        sql += " ORDER BY a.published_at DESC LIMIT ?"
+        args.append(limit)
+
+        with self._lock:
+            return [row_to_article(row) for row in self._conn.execute(sql, args)]
+
+    def search(self, query, language=None, from_date=None, to_date=None, limit=50):
+        """
+        Full-text search over stored articles, best BM25 match first
+
+        Returns:
+            list: (article, score) tuples; lower scores are better matches
+        """
+        fts_query = build_fts_query(query)
+        if not self.fts_enabled or fts_query is None:
+            return []
+
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        filters = ""
+        args = []
+        if language:
+            filters += " AND a.language = ?"
+            args.append(language)
+        if from_date:
+            filters += " AND a.published_at >= ?"
+            args.append(from_date)
+        if to_date:
+            filters += " AND a.published_at < ?"
+            args.append(next_day(to_date))
+
+        # Rank inside the FTS index first and only join the best candidates;
+        # if the filters throw too many of them away, rank every match instead
+        candidates = limit * 4 if filters else limit
+        fast_sql = (f"SELECT a.*, f.score FROM (SELECT rowid, bm25(articles_fts, {weights}) AS score "
+                    "FROM articles_fts WHERE articles_fts MATCH ? ORDER BY score LIMIT ?) f "
+                    f"JOIN articles a ON a.rowid = f.rowid WHERE 1 = 1{filters} ORDER BY f.score LIMIT ?")
+        full_sql = (f"SELECT a.*, bm25(articles_fts, {weights}) AS score "
+                    "FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid "
+                    f"WHERE articles_fts MATCH ?{filters} ORDER BY score LIMIT ?")
+
+        with self._lock:
+            rows = self._conn.execute(fast_sql, [fts_query, candidates] + args + [limit]).fetchall()
+            if len(rows) < limit and filters:
+                candidate_count = self._conn.execute(
+                    "SELECT COUNT(*) FROM (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ? LIMIT ?)",
+                    (fts_query, candidates)
+                ).fetchone()[0]
+                if candidate_count == candidates:
+                    rows = self._conn.execute(full_sql, [fts_query] + args + [limit]).fetchall()
+            return [(row_to_article(row), row["score"]) for row in rows]
+
+    def stats(self):
+        """Get store size and ingestion counters"""
+        with self._lock:
+            return {
+                "path": self.path,
+                "articles": self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0],
+                "scopes": self._conn.execute("SELECT COUNT(*) FROM ingest_state").fetchone()[0],
+                "covered_windows": self._conn.execute("SELECT COUNT(*) FROM coverage").fetchone()[0],
+                "full_text_index": self.fts_enabled,
+                "written": self.written,
+                "skipped": self.skipped
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+# Keep the app's background work and on-disk state out of the test run
+os.environ.setdefault("NEWS_API_KEY", "test")
+os.environ.setdefault("PREFETCH_ENABLED", "false")
+os.environ.setdefault("NEWS_STORE_ENABLED", "false")
+os.environ.setdefault("SNAPSHOT_ENABLED", "false")
+os.environ.setdefault("THUMB_CACHE_DIR", tempfile.mkdtemp(prefix="test-thumbs-"))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
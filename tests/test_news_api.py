@@ -0,0 +1,204 @@
+"""/api/news against the local NewsAPI stand-in"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+import app as app_module
+import newsapi
+from newsapi_standin import start_standin
+from ratelimit import UpstreamLimiter
+from snapshots import SnapshotStore
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Stand-in NewsAPI server the app is pointed at"""
+    server, base_url = start_standin()
+    monkeypatch.setattr(newsapi, "BASE_URL", base_url)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """Fresh upstream budget: 20 calls a day, half of them for background work"""
+    limiter = UpstreamLimiter(rate_per_minute=600, burst=100, daily_quota=20, background_quota=10)
+    monkeypatch.setattr(newsapi, "upstream_limiter", limiter)
+    return limiter
+
+
+@pytest.fixture
+def snapshots(tmp_path, monkeypatch):
+    """Snapshot store in a temporary directory, with a long prefetch interval"""
+    store = SnapshotStore(str(tmp_path), max_age=72000)
+    monkeypatch.setattr(app_module, "SNAPSHOT_ENABLED", True)
+    monkeypatch.setattr(app_module, "snapshot_store", store)
+    monkeypatch.setattr(app_module, "prefetch_interval", 72000)
+    return store
+
+
+def wait_for_revalidation(timeout=2):
+    deadline = time.monotonic() + timeout
+    while newsapi._revalidating and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_fresh_response_reports_cache_state(client, upstream):
+    first = client.get("/api/news?category=health")
+    second = client.get("/api/news?category=health")
+
+    assert first.get_json()["metadata"]["cache"] == "miss"
+    assert second.get_json()["metadata"]["cache"] == "hit"
+    assert second.get_json()["metadata"]["category"] == "health"
+    assert upstream.request_count == 1
+
+
+def test_expired_response_is_marked_stale_while_upstream_fails(client, upstream, monkeypatch):
+    monkeypatch.setattr(newsapi, "get_cache_ttl", lambda endpoint, to_date=None: 0.2)
+    fresh = client.get("/api/news?category=science").get_json()
+    assert fresh["status"] == "ok"
+
+    time.sleep(0.3)
+    upstream.error_rate = 1.0
+    response = client.get("/api/news?category=science")
+
+    data = response.get_json()
+    assert data["status"] == "ok"
+    assert data["metadata"]["cache"] == "stale"
+    assert data["metadata"]["expires_in"] == 0
+    assert [a["url"] for a in data["articles"]] == [a["url"] for a in fresh["articles"]]
+
+
+def test_upstream_failure_falls_back_to_last_good_response(client, upstream, monkeypatch):
+    fresh = client.get("/api/news?q=harvest").get_json()
+    assert fresh["metadata"]["cache"] == "miss"
+
+    # Go upstream even though the entry is cached, as a refresh would
+    monkeypatch.setattr(newsapi, "get_cached_news", lambda news_request: None)
+    upstream.error_rate = 1.0
+    data = client.get("/api/news?q=harvest").get_json()
+
+    assert upstream.error_count >= 1
+    assert data["status"] == "ok"
+    assert data["metadata"]["cache"] == "stale"
+    assert data["metadata"]["fallback_reason"]
+    assert data["metadata"]["total_results"] == len(fresh["articles"])
+
+
+def test_stale_refresh_is_charged_to_the_background_share(client, upstream, limiter, monkeypatch):
+    monkeypatch.setattr(newsapi, "get_cache_ttl", lambda endpoint, to_date=None: 0.2)
+    client.get("/api/news?q=museum")
+    time.sleep(0.3)
+
+    assert client.get("/api/news?q=museum").get_json()["metadata"]["cache"] == "stale"
+    wait_for_revalidation()
+
+    assert upstream.request_count == 2
+    assert limiter.stats()["used_today"] == 2
+    assert limiter.stats()["background_used_today"] == 1
+
+
+def test_stale_refresh_is_skipped_once_the_background_share_is_used(client, upstream, limiter, monkeypatch):
+    monkeypatch.setattr(newsapi, "get_cache_ttl", lambda endpoint, to_date=None: 0.2)
+    client.get("/api/news?q=festival")
+    for _ in range(limiter.background_quota):
+        limiter.acquire(background=True)
+    time.sleep(0.3)
+
+    assert client.get("/api/news?q=festival").get_json()["metadata"]["cache"] == "stale"
+    wait_for_revalidation()
+
+    assert upstream.request_count == 1
+
+
+def test_prefetched_keys_are_left_to_the_scheduler(client, upstream, limiter, monkeypatch):
+    monkeypatch.setattr(newsapi, "get_cache_ttl", lambda endpoint, to_date=None: 0.2)
+    monkeypatch.setattr(newsapi, "_prefetched_keys", set())
+    newsapi.set_prefetched_queries([{"category": "technology", "language": "en"}])
+    client.get("/api/news?category=technology")
+    time.sleep(0.3)
+
+    assert client.get("/api/news?category=technology").get_json()["metadata"]["cache"] == "stale"
+    wait_for_revalidation()
+
+    assert upstream.request_count == 1
+
+
+def test_snapshot_max_age_is_capped_at_the_headlines_ttl(client, upstream, snapshots):
+    app_module.write_snapshot("sports", {"category": "sports", "language": "en"},
+                              newsapi.fetch_news("sports", "", "en"))
+
+    response = client.get("/api/news?category=sports")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == f"public, max-age={newsapi.CACHE_TTLS['top-headlines']}"
+    again = client.get("/api/news?category=sports", headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_batch_serves_categories_from_snapshots(client, upstream, snapshots):
+    fresh = newsapi.fetch_news("business", "", "en")
+    app_module.write_snapshot("business", {"category": "business", "language": "en"}, fresh)
+    upstream.error_rate = 1.0
+
+    data = client.get("/api/news/batch?categories=business&thumb=400").get_json()
+
+    result = data["results"]["business"]
+    assert data["status"] == "ok"
+    assert snapshots.stats()["hits"] == 1
+    assert upstream.request_count == 1
+    assert [a["url"] for a in result["articles"]] == [a["url"] for a in fresh["articles"]]
+    assert all(a["urlToImage"].startswith("/api/thumb?") for a in result["articles"] if a["urlToImage"])
+
+
+def test_async_fetch_keeps_blocking_calls_off_the_event_loop(upstream, monkeypatch):
+    calls = []
+    get_stored_news = newsapi.get_stored_news
+
+    def record_thread(news_request):
+        calls.append(threading.get_ident())
+        return get_stored_news(news_request)
+
+    monkeypatch.setattr(newsapi, "get_stored_news", record_thread)
+
+    async def fetch():
+        try:
+            return threading.get_ident(), await newsapi.async_fetch_news("", "lighthouse", "en")
+        finally:
+            await newsapi.close_async_client()
+
+    loop_thread, result = asyncio.run(fetch())
+
+    assert result["status"] == "ok"
+    assert result["articles"]
+    assert calls and loop_thread not in calls
+
+
+def test_cursor_pages_through_results(client, upstream):
+    first = client.get("/api/news?category=health&page_size=5").get_json()
+    assert first["next_cursor"]
+
+    second = client.get(f"/api/news?cursor={first['next_cursor']}").get_json()
+
+    assert second["status"] == "ok"
+    assert second["metadata"]["page"] == 2
+    assert second["metadata"]["category"] == "health"
+
+
+@pytest.mark.parametrize("category, language", [("weather", "en"), ("health", "english"), (["health"], "en")])
+def test_cursor_with_invalid_parameters_is_rejected(client, upstream, category, language):
+    cursor = app_module.encode_cursor(category, "", language, None, None, 2, 5)
+
+    response = client.get(f"/api/news?cursor={cursor}")
+
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "validation_error"
+    assert upstream.request_count == 0
@@ -0,0 +1,155 @@
+"""RedisCache against an in-process Redis (fakeredis) and an unreachable one"""
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+redis = pytest.importorskip("redis")
+
+from cache import RedisCache
+
+
+@pytest.fixture
+def cache():
+    return RedisCache(client=fakeredis.FakeRedis(), stale_ttl=60)
+
+
+class DownClient:
+    """Client whose every command fails like an unreachable server"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def _fail(self, *args, **kwargs):
+        self.calls += 1
+        raise redis.exceptions.ConnectionError("Connection refused")
+
+    get = set = pipeline = scan_iter = _fail
+
+
+def test_get_set_roundtrip(cache):
+    value = {"status": "ok", "articles": [{"title": "Héadline", "url": "https://example.com/1"}]}
+    cache.set(("top-headlines", "us", "business"), value, 30)
+
+    assert cache.get(("top-headlines", "us", "business")) == value
+    assert 29 < cache.ttl_remaining(("top-headlines", "us", "business")) <= 30
+    assert cache.get(("top-headlines", "us", "sports")) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entry_is_served_stale(cache, monkeypatch):
+    cache.set("key", {"status": "ok"}, 10)
+    later = time.time() + 11
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    assert cache.get("key") is None
+    assert cache.get_stale("key") == {"status": "ok"}
+    assert cache.ttl_remaining("key") == 0.0
+
+
+def test_entry_expires_from_server_after_stale_window(cache):
+    cache.set("key", {"status": "ok"}, 10)
+
+    ttl_ms = cache.client.pttl(cache._key("key"))
+    assert 69000 < ttl_ms <= 70000
+
+
+def test_non_positive_ttl_is_not_stored(cache):
+    cache.set("key", {"status": "ok"}, 0)
+
+    assert cache.get_stale("key") is None
+    assert len(cache) == 0
+
+
+def test_lock_excludes_other_workers_until_released(cache):
+    other = RedisCache(client=cache.client)
+    token = cache.acquire_lock("key", 5)
+
+    assert token is not None
+    assert other.acquire_lock("key", 5) is None
+
+    other.release_lock("key", "not-the-token")
+    assert other.acquire_lock("key", 5) is None
+
+    cache.release_lock("key", token)
+    assert other.acquire_lock("key", 5) is not None
+
+
+def test_waiter_sees_value_stored_by_lock_holder(cache):
+    other = RedisCache(client=cache.client)
+    token = cache.acquire_lock("key", 5)
+    assert other.acquire_lock("key", 5) is None
+    assert other.get("key") is None
+
+    cache.set("key", {"status": "ok"}, 30)
+    cache.release_lock("key", token)
+
+    assert other.get("key") == {"status": "ok"}
+
+
+def test_lock_expires_on_its_own(cache):
+    assert cache.acquire_lock("key", 0.05) is not None
+    time.sleep(0.1)
+
+    assert cache.acquire_lock("key", 5) is not None
+
+
+def test_clear_only_removes_own_prefix(cache):
+    cache.client.set("unrelated", b"1")
+    cache.set("a", 1, 30)
+    cache.set("b", 2, 30)
+    assert len(cache) == 2
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.client.get("unrelated") == b"1"
+
+
+def test_unreachable_server_is_skipped_after_an_error():
+    client = DownClient()
+    cache = RedisCache(client=client, backoff=60)
+
+    for _ in range(5):
+        assert cache.get("key") is None
+        cache.set("key", {"status": "ok"}, 30)
+        assert cache.acquire_lock("key", 5) is not None  # never blocks the refresh
+
+    assert client.calls == 1
+    assert cache.stats()["errors"] == 1
+    assert cache.stats()["skipped"] == 14
+    assert cache.stats()["backing_off_for"] > 0
+
+
+def test_backoff_doubles_while_server_stays_down(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    client = DownClient()
+    cache = RedisCache(client=client, backoff=1, max_backoff=4)
+
+    delays = []
+    for _ in range(4):
+        cache.get("key")
+        delays.append(cache._down_until - now[0])
+        now[0] = cache._down_until
+
+    assert delays == [1, 2, 4, 4]
+    assert client.calls == 4
+
+
+def test_recovers_when_server_comes_back(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    server = fakeredis.FakeRedis()
+    cache = RedisCache(client=DownClient(), backoff=1)
+    cache.get("key")
+
+    cache.client = server
+    cache.set("key", {"status": "ok"}, 30)
+    assert server.get(cache._key("key")) is None  # still backing off
+
+    now[0] += 1
+    cache.set("key", {"status": "ok"}, 30)
+    assert cache.get("key") == {"status": "ok"}
+    assert cache.stats()["backing_off_for"] == 0
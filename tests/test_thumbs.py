@@ -0,0 +1,165 @@
+"""/api/thumb and the thumbnail service against a local image server"""
+import io
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+import app as app_module
+import thumbs
+from thumbs import ThumbnailService, ThumbnailStore, thumbnail_url
+
+
+class ImageHandler(SimpleHTTPRequestHandler):
+    """Static files; paths under /nolength/ are sent without a Content-Length"""
+
+    def do_GET(self):
+        if not self.path.startswith("/nolength/"):
+            return super().do_GET()
+        with open(self.translate_path(self.path[len("/nolength"):]), "rb") as f:
+            data = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_jpeg(width=1600, height=900, color=(200, 40, 40)):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(output, "JPEG", quality=90)
+    return output.getvalue()
+
+
+@pytest.fixture(scope="module")
+def images(tmp_path_factory):
+    """Base URL of a local server with a few images (and non-images)"""
+    directory = tmp_path_factory.mktemp("images")
+    (directory / "photo.jpg").write_bytes(make_jpeg())
+    (directory / "other.jpg").write_bytes(make_jpeg(color=(40, 40, 200)))
+    (directory / "third.jpg").write_bytes(make_jpeg(color=(40, 200, 40)))
+    (directory / "logo.svg").write_text('<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script></svg>')
+    (directory / "page.jpg").write_text("<!doctype html><title>Not an image</title>")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(ImageHandler, directory=str(directory)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def service(tmp_path):
+    return ThumbnailService(ThumbnailStore(str(tmp_path / "cache"), max_bytes=10 * 1024 * 1024), workers=2)
+
+
+@pytest.fixture
+def client(service, monkeypatch):
+    monkeypatch.setattr(app_module, "thumbnails", service)
+    return app_module.app.test_client()
+
+
+def test_thumbnail_is_resized_and_cached(client, service, images):
+    url = thumbnail_url(f"{images}/photo.jpg", 400)
+
+    response = client.get(url, headers={"Accept": "image/webp,image/*"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "image/webp"
+    assert Image.open(io.BytesIO(response.data)).size == (400, 225)
+    assert "immutable" in response.headers["Cache-Control"]
+
+    again = client.get(url, headers={"Accept": "image/webp,image/*", "If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+    assert service.fetches == 1
+
+
+def test_unsigned_or_tampered_url_is_rejected(client, service, images):
+    signed = thumbnail_url(f"{images}/photo.jpg", 400)
+    tampered = signed.replace("photo.jpg", "other.jpg")
+
+    for url in (f"/api/thumb?url={images}/photo.jpg&w=400", signed.replace("sig=", "sig=0"), tampered):
+        response = client.get(url)
+        assert response.status_code == 403
+        assert response.get_json()["status"] == "validation_error"
+    assert service.fetches == 0
+
+
+@pytest.mark.parametrize("name", ["logo.svg", "page.jpg"])
+def test_non_raster_source_is_rejected(client, service, images, name):
+    response = client.get(thumbnail_url(f"{images}/{name}", 400))
+
+    assert response.status_code == 502
+    assert "not a supported image" in response.get_json()["error"]
+    assert service.store.stats()["files"] == 0
+
+
+def test_failed_source_is_not_fetched_again_right_away(service, images):
+    assert service.get(f"{images}/logo.svg")["status"] == "fetch_failed"
+    assert service.get(f"{images}/logo.svg")["status"] == "fetch_failed"
+
+    assert service.fetches == 1
+
+
+@pytest.mark.parametrize("prefix", ["", "/nolength"])
+def test_source_over_size_cap_is_rejected(service, images, monkeypatch, prefix):
+    monkeypatch.setattr(thumbs, "THUMB_MAX_SOURCE_BYTES", 1000)
+
+    result = service.get(f"{images}{prefix}/photo.jpg")
+
+    assert result["status"] == "fetch_failed"
+    assert "image too large" in result["error"]
+    assert service.store.stats()["files"] == 0
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    store = ThumbnailStore(str(tmp_path), max_bytes=250)
+    store.write("aa-first", b"1" * 100)
+    store.write("bb-second", b"2" * 100)
+    assert store.read("aa-first") == b"1" * 100  # now the most recently used
+
+    store.write("cc-third", b"3" * 100)
+
+    assert store.read("bb-second") is None
+    assert not os.path.exists(tmp_path / "bb" / "bb-second")
+    assert store.read("aa-first") == b"1" * 100
+    assert store.read("cc-third") == b"3" * 100
+    assert store.stats()["bytes"] == 200
+    assert store.stats()["evictions"] == 1
+
+
+def test_store_keeps_recency_across_restarts(tmp_path):
+    store = ThumbnailStore(str(tmp_path), max_bytes=250)
+    store.write("aa-first", b"1" * 100)
+    store.write("bb-second", b"2" * 100)
+    os.utime(tmp_path / "aa" / "aa-first", (1, 1))
+    os.utime(tmp_path / "bb" / "bb-second", (2, 2))
+
+    reopened = ThumbnailStore(str(tmp_path), max_bytes=250)
+    reopened.write("cc-third", b"3" * 100)
+
+    assert reopened.read("aa-first") is None
+    assert reopened.read("bb-second") == b"2" * 100
+
+
+def test_evicted_image_is_fetched_again(service, images):
+    first = service.get(f"{images}/photo.jpg", 200)
+    assert first["status"] == "ok"
+    # Room for about two more images, so the first one is evicted
+    service.store.max_bytes = int(service.store.stats()["bytes"] * 2.5)
+
+    for name in ("other.jpg", "third.jpg"):
+        assert service.get(f"{images}/{name}", 800)["status"] == "ok"
+    assert service.store.stats()["evictions"] > 0
+    assert service.store.stats()["bytes"] <= service.store.max_bytes
+
+    again = service.get(f"{images}/photo.jpg", 200)
+    assert again["status"] == "ok"
+    assert again["data"] == first["data"]
+    assert service.fetches == 4
@@ -0,0 +1,420 @@
+import hashlib
+import hmac
+import io
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from urllib.parse import urlencode, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # images are cached and served at their original size
+    Image = None
+
+# Standard thumbnail widths (?w= is rounded up to one of these); the master
+# copy kept of each source image is the largest
+THUMB_WIDTHS = (200, 400, 800)
+THUMB_DEFAULT_WIDTH = 400
+THUMB_QUALITY = int(os.getenv("THUMB_QUALITY", "80"))
+THUMB_MAX_AGE = 31536000  # thumbnail URLs never change what they point to
+
+THUMB_CACHE_DIR = os.getenv(
+    "THUMB_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "thumbs")
+)
+THUMB_CACHE_MAX_BYTES = int(os.getenv("THUMB_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Source image downloads
+THUMB_FETCH_WORKERS = int(os.getenv("THUMB_FETCH_WORKERS", "4"))
+THUMB_MAX_PENDING = int(os.getenv("THUMB_MAX_PENDING", "64"))
+THUMB_FETCH_TIMEOUT = float(os.getenv("THUMB_FETCH_TIMEOUT", "10"))
+THUMB_MAX_SOURCE_BYTES = int(os.getenv("THUMB_MAX_SOURCE_BYTES", str(15 * 1024 * 1024)))
+THUMB_FAILURE_TTL = 600  # seconds before a failed source URL is tried again
+
+# Raster formats accepted from publishers (never SVG, which can carry script)
+IMAGE_SIGNATURES = ((b"\xff\xd8\xff", "jpeg"), (b"\x89PNG\r\n\x1a\n", "png"), (b"GIF87a", "gif"),
+                    (b"GIF89a", "gif"))
+CONTENT_TYPES = {"jpeg": "image/jpeg", "png": "image/png", "gif": "image/gif", "webp": "image/webp"}
+
+_secret = None
+
+
+def get_secret():
+    """Key for signing thumbnail URLs (THUMB_SECRET, else derived from the NewsAPI key)"""
+    global _secret
+    if _secret is None:
+        secret = os.getenv("THUMB_SECRET") or os.getenv("NEWS_API_KEY")
+        # Without either, URLs are only valid in this process
+        _secret = hashlib.sha256(b"thumb:" + secret.encode("utf-8")).digest() if secret else secrets.token_bytes(32)
+    return _secret
+
+
+def sign_url(url):
+    return hmac.new(get_secret(), url.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+def verify_url(url, signature):
+    """Check that a thumbnail URL was issued by this app (so /api/thumb isn't an open proxy)"""
+    return bool(url and signature) and hmac.compare_digest(sign_url(url), signature)
+
+
+def snap_width(width):
+    """Round a requested width up to a standard one"""
+    for standard in THUMB_WIDTHS:
+        if width <= standard:
+            return standard
+    return THUMB_WIDTHS[-1]
+
+
+def thumbnail_url(url, width=THUMB_DEFAULT_WIDTH):
+    """/api/thumb URL for an image URL (other values are returned unchanged)"""
+    if not isinstance(url, str) or urlparse(url).scheme not in ("http", "https"):
+        return url
+    return "/api/thumb?" + urlencode({"url": url, "w": snap_width(width), "sig": sign_url(url)})
+
+
+def rewrite_image(article, width):
+    """Copy of an article with urlToImage pointing at its thumbnail"""
+    if not article.get("urlToImage"):
+        return article
+    article = dict(article)
+    article["urlToImage"] = thumbnail_url(article["urlToImage"], width)
+    return article
+
+
+def sniff_format(data):
+    """Image format from the first bytes (None if not an accepted raster format)"""
+    for signature, image_format in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return image_format
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+class ThumbnailStore:
+    """
+    Size-capped on-disk LRU of thumbnail files
+
+    Files are named by content hash and spread over subdirectories by their
+    first two characters. Recency is the file mtime (touched on every hit),
+    so the order survives restarts; files written by other workers are
+    picked up the first time they are asked for.
+    """
+
+    def __init__(self, directory=THUMB_CACHE_DIR, max_bytes=THUMB_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._files = OrderedDict()  # name -> size, least recently used first
+        self._bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, name):
+        return os.path.join(self.directory, name[:2], name)
+
+    def _load(self):
+        """Index the files already on disk, oldest first (lock held)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        found = []
+        if os.path.isdir(self.directory):
+            for shard in os.scandir(self.directory):
+                if shard.is_dir():
+                    for entry in os.scandir(shard.path):
+                        if entry.is_file() and not entry.name.endswith(".tmp"):
+                            stat = entry.stat()
+                            found.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(found):
+            self._files[name] = size
+            self._bytes += size
+        self._evict()
+
+    def _forget(self, name):
+        self._bytes -= self._files.pop(name, 0)
+
+    def _evict(self):
+        """Delete least recently used files until under the size cap (lock held)"""
+        while self._bytes > self.max_bytes and self._files:
+            name, size = self._files.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+
+    def read(self, name):
+        """Contents of a cached file, or None"""
+        path = self._path(name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(name)  # evicted, maybe by another worker
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self._load()
+            self.hits += 1
+            if name not in self._files:
+                self._bytes += len(data)  # written by another worker
+            self._files[name] = len(data)
+            self._files.move_to_end(name)
+            self._evict()
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def write(self, name, data):
+        """Store a file (atomically, so readers never see a partial one)"""
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._load()
+            self._forget(name)
+            self._files[name] = len(data)
+            self._bytes += len(data)
+            self._evict()
+
+    def delete(self, name):
+        with self._lock:
+            self._forget(name)
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "files": len(self._files),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+class ThumbnailService:
+    """
+    Fetches publisher images once and serves resized copies from disk
+
+    A source image is downloaded on a small worker pool (concurrent requests
+    for the same URL share one download), reduced to a master copy no wider
+    than the largest standard width and stored under the hash of the
+    original bytes, so the same picture at several URLs is kept once. Each
+    width/format is rendered from the master on first request. Without
+    Pillow the original image is stored and served as is.
+    """
+
+    def __init__(self, store=None, workers=THUMB_FETCH_WORKERS, max_pending=THUMB_MAX_PENDING):
+        self.store = store or ThumbnailStore()
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._session = None
+        self._pending = {}  # source URL -> Future of its master file name
+        self._failed = {}   # source URL -> time it may be tried again
+        self._lock = threading.Lock()
+
+        # Counters
+        self.fetches = 0
+        self.fetch_failures = 0
+        self.renders = 0
+
+    def _get_executor(self):
+        """Create the download pool and session on first use (lock held)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumb-fetch")
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": "FetchPress/1.0 (thumbnails)", "Accept": "image/*"})
+            self._session = session
+        return self._executor
+
+    def _download(self, url):
+        """Download a source image (size-capped); returns its bytes"""
+        with self._session.get(url, stream=True, timeout=(3.05, THUMB_FETCH_TIMEOUT)) as response:
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            length = response.headers.get("Content-Length")
+            if length and length.isdigit() and int(length) > THUMB_MAX_SOURCE_BYTES:
+                raise ValueError("image too large")
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(65536):
+                size += len(chunk)
+                if size > THUMB_MAX_SOURCE_BYTES:
+                    raise ValueError("image too large")
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    def _fetch_master(self, url):
+        """Download, store the master copy and the URL's reference to it; returns the master name"""
+        data = self._download(url)
+        image_format = sniff_format(data)
+        if image_format is None:
+            raise ValueError("not a supported image")
+        digest = hashlib.sha256(data).hexdigest()
+
+        if Image is not None:
+            image = Image.open(io.BytesIO(data))
+            if image_format == "jpeg":
+                image.draft("RGB", (THUMB_WIDTHS[-1], THUMB_WIDTHS[-1]))  # decode at a reduced scale
+            image = ImageOps.exif_transpose(image)
+            if image.width > THUMB_WIDTHS[-1]:
+                height = max(1, round(image.height * THUMB_WIDTHS[-1] / image.width))
+                image = image.resize((THUMB_WIDTHS[-1], height), Image.LANCZOS)
+            output = io.BytesIO()
+            if image.mode in ("RGBA", "LA", "P"):
+                image_format = "png"
+                image.save(output, "PNG", optimize=True)
+            else:
+                image_format = "jpeg"
+                image.convert("RGB").save(output, "JPEG", quality=95)
+            data = output.getvalue()
+
+        master = f"{digest}-master.{image_format}"
+        self.store.write(master, data)
+        self.store.write(self._ref_name(url), master.encode("ascii"))
+        return master
+
+    def _ref_name(self, url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest() + ".ref"
+
+    def _get_master(self, url):
+        """Name of the URL's master file, downloading it if needed; returns (name, error result)"""
+        ref = self.store.read(self._ref_name(url))
+        if ref is not None:
+            return ref.decode("ascii"), None
+
+        with self._lock:
+            retry_at = self._failed.get(url)
+            if retry_at is not None:
+                if retry_at > time.time():
+                    return None, {"status": "fetch_failed", "error": "Image could not be fetched recently"}
+                del self._failed[url]
+            future = self._pending.get(url)
+            if future is None:
+                if len(self._pending) >= self.max_pending:
+                    return None, {"status": "busy", "error": "Too many images being fetched"}
+                future = self._pending[url] = self._get_executor().submit(self._fetch_master, url)
+                future.add_done_callback(lambda done: self._finish_fetch(url, done))
+                self.fetches += 1
+
+        try:
+            return future.result(timeout=THUMB_FETCH_TIMEOUT * 2), None
+        except FutureTimeoutError:
+            return None, {"status": "timeout", "error": "Image fetch timed out"}
+        except Exception as e:
+            return None, {"status": "fetch_failed", "error": f"Image could not be fetched: {str(e)}"}
+
+    def _finish_fetch(self, url, future):
+        with self._lock:
+            self._pending.pop(url, None)
+            if future.exception() is not None:
+                self.fetch_failures += 1
+                self._failed[url] = time.time() + THUMB_FAILURE_TTL
+                if len(self._failed) > 10000:
+                    now = time.time()
+                    self._failed = {key: until for key, until in self._failed.items() if until > now}
+
+    def _render(self, master_data, width, image_format):
+        """Resize a master copy to a width and encode it"""
+        image = Image.open(io.BytesIO(master_data))
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+        output = io.BytesIO()
+        if image_format == "webp":
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() or image.mode == "P" else "RGB")
+            image.save(output, "WEBP", quality=THUMB_QUALITY, method=4)
+        else:
+            if image.mode != "RGB":
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            image.save(output, "JPEG", quality=THUMB_QUALITY, optimize=True, progressive=True)
+        return output.getvalue()
+
+    def get(self, url, width=THUMB_DEFAULT_WIDTH, accept_webp=False):
+        """
+        Get a thumbnail of an image URL
+
+        Returns {"status": "ok", "data", "content_type", "etag"} or an error
+        result ("fetch_failed", "timeout" or "busy").
+        """
+        width = snap_width(width)
+        for _ in range(2):
+            master, error = self._get_master(url)
+            if error:
+                return error
+
+            digest, _, master_format = master.partition("-master.")
+            if Image is None:
+                image_format, name = master_format, master
+            else:
+                image_format = "webp" if accept_webp and features.check("webp") else "jpeg"
+                name = f"{digest}-{width}.{image_format}"
+
+            data = self.store.read(name)
+            if data is not None:
+                break
+            master_data = self.store.read(master)
+            if master_data is not None:
+                break
+            # The master was evicted after the URL's reference was read: fetch it again
+            self.store.delete(self._ref_name(url))
+        else:
+            return {"status": "fetch_failed", "error": "Image is no longer cached"}
+
+        if data is None:
+            data = self._render(master_data, width, image_format)
+            self.store.write(name, data)
+            with self._lock:
+                self.renders += 1
+
+        return {"status": "ok", "data": data, "content_type": CONTENT_TYPES[image_format], "etag": name}
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                "engine": "pillow" if Image is not None else "passthrough",
+                "fetches": self.fetches,
+                "fetch_failures": self.fetch_failures,
+                "renders": self.renders,
+                "pending": len(self._pending)
+            }
+        stats["cache"] = self.store.stats()
+        return stats
+
+
+# Shared service used by /api/thumb
+thumbnails = ThumbnailService()